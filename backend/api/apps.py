@@ -5,3 +5,14 @@ class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
 
+    def ready(self):
+        # Connect spec index, search index, count cache and response cache
+        # signal receivers. The spec index goes first so the response cache
+        # version is bumped only after it is rewritten.
+        from .services import spec_index  # noqa: F401
+        from . import response_cache, search  # noqa: F401
+        from .services import count_cache  # noqa: F401
+
+        # Time queries on every connection, including the worker-thread
+        # connections the async views open
+        from . import metrics  # noqa: F401
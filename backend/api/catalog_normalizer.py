@@ -0,0 +1,173 @@
+"""
+Normalization of scraped catalog records into Product field values.
+
+Shared by the live scraper and `manage.py import_catalog`. Everything here
+is plain Python with no Django imports, so it can run in worker processes
+that never set Django up.
+"""
+import json
+import re
+from decimal import Decimal
+
+
+EMOJI_RE = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"  # emoticons
+    "\U0001F300-\U0001F5FF"  # symbols & pictographs
+    "\U0001F680-\U0001F6FF"  # transport & map symbols
+    "\U0001F1E0-\U0001F1FF"  # flags
+    "\U00002702-\U000027B0"
+    "\U000024C2-\U0001F251"
+    "\U0001F900-\U0001F9FF"  # supplemental symbols
+    "]+",
+    flags=re.UNICODE,
+)
+
+
+def parse_price(price_str):
+    """Convert price string like 'Rs. 330.00' to Decimal"""
+    if not price_str:
+        return None
+
+    # Remove common currency symbols and text
+    price_str = str(price_str).strip()
+
+    # Remove currency symbols (Rs., ₹, $, etc.)
+    price_str = re.sub(r'[Rr][Ss]\.?\s*', '', price_str)
+    price_str = re.sub(r'₹\s*', '', price_str)
+    price_str = re.sub(r'\$\s*', '', price_str)
+    price_str = re.sub(r'[A-Za-z:]+', '', price_str)  # Remove any remaining text
+
+    # Remove commas and whitespace
+    price_str = price_str.replace(',', '').strip()
+
+    # Extract numeric value (including decimal)
+    # Match: digits, optional decimal point, optional more digits
+    match = re.search(r'(\d+\.?\d*)', price_str)
+    if match:
+        try:
+            return Decimal(match.group(1))
+        except (ValueError, TypeError):
+            return None
+
+    return None
+
+
+def map_availability(availability_str):
+    """Map availability string to model choices"""
+    if not availability_str:
+        return 'in_stock'
+    availability_lower = availability_str.lower()
+    if 'out of stock' in availability_lower or 'unavailable' in availability_lower:
+        return 'out_of_stock'
+    elif 'limited' in availability_lower:
+        return 'limited'
+    else:
+        return 'in_stock'
+
+
+def clean_description(description_text):
+    """Strip emojis and problematic characters and collapse whitespace"""
+    if not description_text:
+        return description_text
+    description_text = EMOJI_RE.sub('', description_text)
+    description_text = description_text.encode('utf-8', errors='ignore').decode('utf-8')
+    return ' '.join(description_text.split())
+
+
+def normalize_product(product_data, category_id):
+    """
+    Product field values for a scraped product record
+    (None if it has no valid price)
+    """
+    product_details = product_data.get('product_details') or {}
+    price = parse_price(product_data.get('price'))
+    if not price:
+        return None
+
+    return {
+        'product_id': product_details.get('product_id'),
+        'title': product_data.get('product_title'),
+        'category_id': category_id,
+        'url': product_data.get('product_url'),
+        'image_url': product_data.get('image_url'),
+        'price': price,
+        'price_display': product_data.get('price'),
+        'availability': map_availability(product_details.get('availability')),
+        'variant_id': product_details.get('variant_id'),
+        'description_text': clean_description(product_details.get('description_text', '')),
+        'images': product_details.get('images', []),
+        'specifications': product_details.get('specifications', {}),
+        'is_active': True,
+    }
+
+
+def normalize_records(records):
+    """
+    Normalize a list of (category name, product record) pairs for a process pool.
+    Returns (field dicts tagged with `category_name` instead of a category_id,
+    records skipped for having no valid price, malformed records).
+    """
+    rows = []
+    skipped = 0
+    for category_name, product_data in records:
+        fields = normalize_product(product_data, None)
+        if fields is None:
+            skipped += 1
+            continue
+        del fields['category_id']
+        fields['category_name'] = category_name
+        rows.append(fields)
+    return rows, skipped, 0
+
+
+def normalize_ndjson_lines(lines):
+    """normalize_records() over raw snapshot lines, parsing them in the worker"""
+    records = []
+    invalid = 0
+    for line in lines:
+        try:
+            product_data = json.loads(line)
+            records.append((product_data.pop('category_name'), product_data))
+        except (ValueError, KeyError, AttributeError):
+            invalid += 1
+    rows, skipped, _ = normalize_records(records)
+    return rows, skipped, invalid
+
+
+# Column sizes of ProductSpec.key / ProductSpec.value
+SPEC_KEY_MAX_LENGTH = 100
+SPEC_VALUE_MAX_LENGTH = 255
+
+
+def normalize_spec_text(text):
+    """Lowercase and collapse whitespace, so 'Colour ' and 'colour' match"""
+    return ' '.join(str(text).split()).strip(' :').lower()
+
+
+def spec_entries(specifications):
+    """
+    Indexable (key, value, key label, value label) tuples of a specifications
+    dict. Non-scalar, empty or over-long values are skipped, and the first of
+    several keys that normalize alike wins.
+    """
+    entries = {}
+    if not isinstance(specifications, dict):
+        return []
+    for label, raw_value in specifications.items():
+        if isinstance(raw_value, bool) or not isinstance(raw_value, (str, int, float)):
+            continue
+        key = normalize_spec_text(label)
+        value = normalize_spec_text(raw_value)
+        if (
+            not key or not value or key in entries
+            or len(key) > SPEC_KEY_MAX_LENGTH or len(value) > SPEC_VALUE_MAX_LENGTH
+        ):
+            continue
+        entries[key] = (
+            key,
+            value,
+            ' '.join(str(label).split())[:SPEC_KEY_MAX_LENGTH],
+            ' '.join(str(raw_value).split())[:SPEC_VALUE_MAX_LENGTH],
+        )
+    return list(entries.values())
@@ -0,0 +1,121 @@
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+
+from api.models import Product
+from api.pagination import CURSOR_ORDERING
+from api.services.spec_index import SpecIndex
+
+
+# Orderings offered by `sort`; each one, alone or behind a category and/or
+# availability filter, has a matching composite index on Product
+SORT_ORDERINGS = {
+    'newest': CURSOR_ORDERING,
+    'price': ('price', 'id'),
+    '-price': ('-price', '-id'),
+}
+DEFAULT_SORT = 'newest'
+
+AVAILABILITY_VALUES = tuple(value for value, _ in Product.AVAILABILITY_CHOICES)
+
+
+@dataclass
+class ProductFilters:
+    """Optional product list filters parsed from query parameters"""
+    min_price: Decimal = None
+    max_price: Decimal = None
+    availability: str = None
+    specs: dict = field(default_factory=dict)
+
+    def __bool__(self):
+        return any((
+            self.min_price is not None,
+            self.max_price is not None,
+            self.availability,
+            self.specs,
+        ))
+
+    @classmethod
+    def from_query_params(cls, params):
+        """
+        Read min_price, max_price, availability and `spec` filters.
+        Raises ValueError for an invalid value.
+        """
+        filters = cls(
+            min_price=cls._parse_price(params, 'min_price'),
+            max_price=cls._parse_price(params, 'max_price'),
+            availability=params.get('availability') or None,
+            specs=SpecIndex.parse_filters(params.getlist('spec')),
+        )
+        if filters.availability and filters.availability not in AVAILABILITY_VALUES:
+            raise ValueError(f"availability must be one of {', '.join(AVAILABILITY_VALUES)}")
+        if (
+            filters.min_price is not None and filters.max_price is not None
+            and filters.min_price > filters.max_price
+        ):
+            raise ValueError('min_price must not exceed max_price')
+        return filters
+
+    @staticmethod
+    def _parse_price(params, name):
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            price = Decimal(value)
+        except InvalidOperation:
+            raise ValueError(f'{name} must be a number')
+        if not price.is_finite() or price < 0:
+            raise ValueError(f'{name} must be a non-negative number')
+        return price
+
+    def apply(self, queryset):
+        """Narrow a Product queryset to the rows matching every filter"""
+        if self.availability:
+            queryset = queryset.filter(availability=self.availability)
+        if self.min_price is not None:
+            queryset = queryset.filter(price__gte=self.min_price)
+        if self.max_price is not None:
+            queryset = queryset.filter(price__lte=self.max_price)
+        if self.specs:
+            queryset = SpecIndex.filter_products(queryset, self.specs)
+        return queryset
+
+
+def parse_sort(params):
+    """The `sort` query parameter; raises ValueError for an unknown value"""
+    sort = params.get('sort') or DEFAULT_SORT
+    if sort not in SORT_ORDERINGS:
+        raise ValueError(f"sort must be one of {', '.join(SORT_ORDERINGS)}")
+    return sort
+
+
+@dataclass
+class ProductListParams:
+    """Query parameters of the product list endpoint"""
+    category_id: str = None
+    search: str = ''
+    page: int = 1
+    page_size: int = 20
+    # None for page-numbered listings; '' asks for the first keyset page
+    cursor: str = None
+    filters: ProductFilters = field(default_factory=ProductFilters)
+    sort: str = DEFAULT_SORT
+
+    @classmethod
+    def from_query_params(cls, params):
+        """Parse and validate list parameters; raises ValueError when invalid"""
+        listing = cls(
+            category_id=params.get('category_id') or None,
+            search=params.get('search', '').strip(),
+            page=int(params.get('page', 1)),
+            # Validate page_size (max 100)
+            page_size=min(int(params.get('page_size', 20)), 100),
+            cursor=params.get('cursor'),
+            filters=ProductFilters.from_query_params(params),
+            sort=parse_sort(params),
+        )
+        if listing.search and (listing.filters or listing.sort != DEFAULT_SORT):
+            raise ValueError('filters and sort cannot be combined with search')
+        if listing.cursor is not None and listing.sort != DEFAULT_SORT:
+            raise ValueError(f'cursor pagination only supports sort={DEFAULT_SORT}')
+        return listing
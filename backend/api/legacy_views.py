@@ -1,6 +1,15 @@
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
+from api.metrics import registry
+from api.response_cache import get_cache_stats
 
 
 @api_view(['GET'])
@@ -14,19 +23,84 @@ def api_root(request):
         'endpoints': {
             'health': '/api/health/',
             'categories': '/api/categories/',
+            'category_facets': '/api/categories/{id}/facets/',
             'products': '/api/products/',
             'product_detail': '/api/products/{id}/',
+            'product_batch_detail': '/api/products/batch/?ids={id},{id}',
+            'product_export': '/api/products/export/',
+            'cache_stats': '/api/cache/stats/',
+            'metrics': '/api/metrics/',
+            'async_categories': '/api/async/categories/',
+            'async_products': '/api/async/products/',
+            'async_product_detail': '/api/async/products/{id}/',
         }
     })
 
 
+def _probe(check):
+    """Run one health probe, timing it and catching its failure"""
+    started = time.perf_counter()
+    try:
+        check()
+    except Exception as e:
+        return {'ok': False, 'error': str(e)}
+    return {'ok': True, 'latency_ms': round((time.perf_counter() - started) * 1000, 2)}
+
+
+def _ping_database():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+
+
+def _ping_cache():
+    # A key per probe, so concurrent probes on a shared cache cannot
+    # overwrite each other's value
+    nonce = uuid.uuid4().hex
+    key = f'health_check:{nonce}'
+    try:
+        cache.set(key, nonce, timeout=10)
+        if cache.get(key) != nonce:
+            raise RuntimeError('cache did not return the value just written')
+    finally:
+        cache.delete(key)
+
+
 @api_view(['GET'])
 def health_check(request):
     """
     Health check endpoint.
+    Round-trips the database and the cache; 503 if either fails.
+    """
+    checks = {
+        'database': _probe(_ping_database),
+        'cache': _probe(_ping_cache),
+    }
+    healthy = all(check['ok'] for check in checks.values())
+    return Response({
+        'status': 'healthy' if healthy else 'unhealthy',
+        'message': 'API is running' if healthy else 'A dependency check failed',
+        'checks': checks,
+    }, status=status.HTTP_200_OK if healthy else status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+@api_view(['GET'])
+def cache_stats(request):
+    """
+    Response cache hit/miss/304 counters per view.
     """
     return Response({
-        'status': 'healthy',
-        'message': 'API is running'
+        'success': True,
+        'results': get_cache_stats()
     }, status=status.HTTP_200_OK)
 
+
+@require_GET
+def metrics(request):
+    """
+    Request metrics per URL name in Prometheus text format.
+    """
+    return HttpResponse(
+        registry.render(cache_stats=get_cache_stats()),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -0,0 +1,42 @@
+"""Helpers shared by the bench_* management commands"""
+import random
+import statistics
+
+from api.models import Product
+from api.search import tokenize
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize(timings_ms):
+    """p50/p95/p99/mean/max of a list of millisecond timings"""
+    timings = sorted(timings_ms)
+    return {
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'max_ms': round(timings[-1], 3),
+    }
+
+
+def sample_search_queries(count, seed):
+    """Build search-as-you-type style queries from random product titles"""
+    titles = list(Product.objects.filter(is_active=True).values_list('title', flat=True)[:5000])
+    rng = random.Random(seed)
+    queries = []
+    for title in rng.sample(titles, min(count, len(titles))):
+        terms = [term for term in tokenize(title) if len(term) > 2]
+        if not terms:
+            continue
+        words = terms[:rng.randint(1, 2)]
+        # Half the queries end mid-word, as the frontend searches on keystrokes
+        if rng.random() < 0.5 and len(words[-1]) > 3:
+            words[-1] = words[-1][:rng.randint(3, len(words[-1]) - 1)]
+        queries.append(' '.join(words))
+    return queries
@@ -0,0 +1,245 @@
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import django
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max, Min
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from api.models import Category, Product
+from api.pagination import encode_cursor
+from ._bench import sample_search_queries, summarize
+
+
+ENDPOINTS = ['categories', 'products', 'products_category', 'products_cursor', 'search', 'detail']
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-benchmark the read API endpoints on the current database and write '
+        'p50/p95/p99 latency, throughput and query counts per endpoint to a JSON file'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed requests per endpoint')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--endpoints', nargs='+', default=ENDPOINTS, choices=ENDPOINTS)
+        parser.add_argument(
+            '--cached', action='store_true',
+            help='Let the response cache serve repeated URLs (default: every request misses it)'
+        )
+        parser.add_argument(
+            '--base-url',
+            help='Drive a running server (e.g. http://127.0.0.1:8000) instead of the in-process '
+                 'test client; query counts are then not recorded'
+        )
+        parser.add_argument('--concurrency', type=int, default=1, help='Parallel clients with --base-url')
+        parser.add_argument(
+            '--output',
+            help='Results file (default: bench_results/api-<timestamp>.json)'
+        )
+        parser.add_argument('--baseline', help='Earlier results file to compare p95 latency against')
+        parser.add_argument(
+            '--max-regression', type=float, default=20.0,
+            help='Fail when an endpoint p95 is this many percent slower than the baseline'
+        )
+
+    def handle(self, *args, **options):
+        if options['concurrency'] > 1 and not options['base_url']:
+            raise CommandError('--concurrency needs --base-url; the test client runs requests serially.')
+        if not Product.objects.filter(is_active=True).exists():
+            raise CommandError('No active products; load a catalog or run generate_catalog first.')
+
+        rng = random.Random(options['seed'])
+        total = options['requests'] + options['warmup']
+        send = self.http_sender(options) if options['base_url'] else self.client_sender()
+
+        results = {}
+        self.stdout.write(
+            f"{'endpoint':<20}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'queries':>9}{'errors':>8}"
+        )
+        for name in options['endpoints']:
+            urls = getattr(self, f'{name}_urls')(rng, total, options['page_size'])
+            if not options['cached']:
+                # A unique parameter gives every URL its own response cache key
+                urls = [f"{url}{'&' if '?' in url else '?'}_bench={i}" for i, url in enumerate(urls)]
+            results[name] = self.run(send, urls, options)
+            self.print_row(name, results[name])
+
+        report = {'meta': self.meta(options), 'endpoints': results}
+        output = options['output'] or os.path.join(
+            'bench_results', f"api-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        )
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {output}'))
+
+        if options['baseline']:
+            self.compare(options['baseline'], results, options['max_regression'])
+
+    # URL samplers, seeded so repeated runs request the same URLs
+
+    def categories_urls(self, rng, count, page_size):
+        return ['/api/categories/'] * count
+
+    def products_urls(self, rng, count, page_size):
+        pages = max(1, -(-Product.objects.filter(is_active=True).count() // page_size))
+        return [f'/api/products/?page={rng.randint(1, pages)}&page_size={page_size}' for _ in range(count)]
+
+    def products_category_urls(self, rng, count, page_size):
+        category_ids = list(Category.objects.filter(is_active=True).values_list('id', flat=True))
+        return [
+            f'/api/products/?category_id={rng.choice(category_ids)}&page_size={page_size}'
+            for _ in range(count)
+        ]
+
+    def products_cursor_urls(self, rng, count, page_size):
+        # Cursors positioned at random products reach random depths in one request
+        return [
+            f'/api/products/?cursor={encode_cursor(created_at, pk)}&page_size={page_size}'
+            for pk, created_at in self.sample_products(rng, count)
+        ]
+
+    def search_urls(self, rng, count, page_size):
+        queries = sample_search_queries(min(count, 100), rng.randrange(2 ** 32))
+        return [
+            f"/api/products/?search={requests.utils.quote(rng.choice(queries))}&page_size={page_size}"
+            for _ in range(count)
+        ]
+
+    def detail_urls(self, rng, count, page_size):
+        return [f'/api/products/{pk}/' for pk, _ in self.sample_products(rng, count)]
+
+    @staticmethod
+    def sample_products(rng, count):
+        """(id, created_at) of `count` random active products, without ORDER BY RANDOM()"""
+        bounds = Product.objects.aggregate(low=Min('id'), high=Max('id'))
+        found = {}
+        for _ in range(20):
+            candidates = {rng.randint(bounds['low'], bounds['high']) for _ in range(count * 2)}
+            found.update(
+                Product.objects.filter(pk__in=candidates, is_active=True).values_list('id', 'created_at')
+            )
+            if len(found) >= count:
+                break
+        rows = sorted(found.items())
+        return [rng.choice(rows) for _ in range(count)]
+
+    # Request senders: each returns (status code, elapsed ms, query count or None)
+
+    def client_sender(self):
+        client = Client(HTTP_ACCEPT='application/json')
+        if '*' not in settings.ALLOWED_HOSTS and 'testserver' not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+
+        def send(url):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = client.get(url)
+                elapsed = (time.perf_counter() - started) * 1000
+            return response.status_code, elapsed, len(queries)
+        return send
+
+    def http_sender(self, options):
+        base_url = options['base_url'].rstrip('/')
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=options['concurrency'])
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        def send(url):
+            started = time.perf_counter()
+            response = session.get(base_url + url, headers={'Accept': 'application/json'})
+            elapsed = (time.perf_counter() - started) * 1000
+            return response.status_code, elapsed, None
+        return send
+
+    def run(self, send, urls, options):
+        warmup, timed = urls[:options['warmup']], urls[options['warmup']:]
+        for url in warmup:
+            send(url)
+
+        started = time.perf_counter()
+        if options['concurrency'] > 1:
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                samples = list(pool.map(send, timed))
+        else:
+            samples = [send(url) for url in timed]
+        wall = time.perf_counter() - started
+
+        statuses = [status for status, _, _ in samples]
+        result = {
+            'requests': len(samples),
+            'errors': sum(1 for status in statuses if status >= 400),
+            **summarize([elapsed for _, elapsed, _ in samples]),
+            'throughput_rps': round(len(samples) / wall, 1),
+        }
+        query_counts = [queries for _, _, queries in samples if queries is not None]
+        if query_counts:
+            result['queries_mean'] = round(sum(query_counts) / len(query_counts), 2)
+            result['queries_max'] = max(query_counts)
+        return result
+
+    def print_row(self, name, result):
+        queries = result.get('queries_mean', '-')
+        self.stdout.write(
+            f"{name:<20}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+            f"{result['throughput_rps']:>9.0f}{queries:>9}{result['errors']:>8}"
+        )
+
+    def meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_commit': commit,
+            'mode': 'http' if options['base_url'] else 'client',
+            'base_url': options['base_url'],
+            'concurrency': options['concurrency'],
+            'cached': options['cached'],
+            'requests_per_endpoint': options['requests'],
+            'page_size': options['page_size'],
+            'seed': options['seed'],
+            'database': connection.vendor,
+            'products': Product.objects.count(),
+            'active_products': Product.objects.filter(is_active=True).count(),
+            'categories': Category.objects.count(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        }
+
+    def compare(self, baseline_path, results, max_regression):
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)['endpoints']
+
+        self.stdout.write(f"\n{'endpoint':<20}{'base p95':>10}{'p95':>10}{'change':>10}")
+        regressed = []
+        for name, result in results.items():
+            if name not in baseline:
+                continue
+            before, after = baseline[name]['p95_ms'], result['p95_ms']
+            change = (after - before) / before * 100 if before else 0.0
+            self.stdout.write(f"{name:<20}{before:>10.2f}{after:>10.2f}{change:>+9.1f}%")
+            if change > max_regression:
+                regressed.append(name)
+
+        if regressed:
+            raise CommandError(
+                f"p95 regressed more than {max_regression:.0f}% on: {', '.join(regressed)}"
+            )
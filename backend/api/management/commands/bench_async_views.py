@@ -0,0 +1,183 @@
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from api.models import Product
+from .bench_api import Command as BenchApiCommand
+from ._bench import summarize
+
+
+ENDPOINTS = ['categories', 'products', 'products_category', 'products_cursor', 'search', 'detail']
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the sync API views with their /api/async/ versions under concurrent load, '
+        'driving the ASGI application in process, and report p50/p95/p99 latency and throughput'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Timed requests per endpoint and mode')
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed requests per endpoint and mode')
+        parser.add_argument('--concurrency', type=int, default=16, help='Requests in flight at once')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--endpoints', nargs='+', default=ENDPOINTS, choices=ENDPOINTS)
+        parser.add_argument(
+            '--db-latency-ms', type=float, default=0,
+            help='Add this much latency to every query, to emulate a database across the network'
+        )
+        parser.add_argument('--output', help='Results file (default: bench_results/async-<timestamp>.json)')
+
+    def handle(self, *args, **options):
+        if not Product.objects.filter(is_active=True).exists():
+            raise CommandError('No active products; load a catalog or run generate_catalog first.')
+        if options['db_latency_ms'] > 0:
+            self.add_query_latency(options['db_latency_ms'] / 1000)
+
+        from config.asgi import application
+        host = self.allowed_host()
+        samplers = BenchApiCommand()
+        rng = random.Random(options['seed'])
+        total = options['requests'] + options['warmup']
+
+        results = {}
+        self.stdout.write(
+            f"{'endpoint':<20}{'mode':<7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'errors':>8}"
+        )
+        for name in options['endpoints']:
+            urls = getattr(samplers, f'{name}_urls')(rng, total, options['page_size'])
+            # A unique parameter gives every URL its own response cache key
+            urls = [f"{url}{'&' if '?' in url else '?'}_bench={i}" for i, url in enumerate(urls)]
+            results[name] = {}
+            for mode, mode_urls in (
+                ('sync', urls),
+                ('async', [url.replace('/api/', '/api/async/', 1) for url in urls]),
+            ):
+                result = asyncio.run(self.run(application, host, mode_urls, options))
+                results[name][mode] = result
+                self.print_row(name, mode, result)
+
+        report = {
+            'meta': {
+                'database': connections['default'].vendor,
+                'concurrency': options['concurrency'],
+                'requests': options['requests'],
+                'db_latency_ms': options['db_latency_ms'],
+                'cpu_count': os.cpu_count(),
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+            },
+            'endpoints': results,
+        }
+        output = options['output'] or os.path.join(
+            'bench_results', f"async-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        )
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {output}'))
+
+    @staticmethod
+    def add_query_latency(seconds):
+        """Sleep before every query on every connection, including ones opened later"""
+        def delay(execute, sql, params, many, context):
+            time.sleep(seconds)
+            return execute(sql, params, many, context)
+
+        def install(sender, connection, **kwargs):
+            # Thread-local connections reconnect through the same wrapper object
+            if delay not in connection.execute_wrappers:
+                connection.execute_wrappers.insert(0, delay)
+
+        connection_created.connect(install, weak=False)
+        for connection in connections.all():
+            if connection.connection is not None:
+                install(None, connection)
+
+    @staticmethod
+    def allowed_host():
+        hosts = [host for host in settings.ALLOWED_HOSTS if host and host != '*' and not host.startswith('.')]
+        if hosts:
+            return hosts[0]
+        if '*' not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'localhost']
+        return 'localhost'
+
+    async def run(self, application, host, urls, options):
+        warmup, timed = urls[:options['warmup']], urls[options['warmup']:]
+        for url in warmup:
+            await asgi_get(application, host, url)
+
+        queue = asyncio.Queue()
+        for url in timed:
+            queue.put_nowait(url)
+        samples = []
+
+        async def client():
+            while not queue.empty():
+                url = queue.get_nowait()
+                started = time.perf_counter()
+                status = await asgi_get(application, host, url)
+                samples.append((status, (time.perf_counter() - started) * 1000))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(max(1, options['concurrency']))))
+        wall = time.perf_counter() - started
+
+        return {
+            'requests': len(samples),
+            'errors': sum(1 for status, _ in samples if status >= 400),
+            **summarize([elapsed for _, elapsed in samples]),
+            'throughput_rps': round(len(samples) / wall, 1),
+        }
+
+    def print_row(self, name, mode, result):
+        self.stdout.write(
+            f"{name:<20}{mode:<7}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+            f"{result['throughput_rps']:>9.0f}{result['errors']:>8}"
+        )
+
+
+async def asgi_get(application, host, url):
+    """Send one GET through an ASGI application and return the status code"""
+    path, _, query = url.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', host.encode()), (b'accept', b'application/json')],
+        'client': ('127.0.0.1', 0),
+        'server': (host, 80),
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+    response = {}
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+
+    await application(scope, receive, send)
+    disconnected.set()
+    return response['status']
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from api.search import BACKENDS, product_index
+from ._bench import sample_search_queries, summarize
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the product search backends against each other on the current database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'queries', nargs='*',
+            help='Queries to run (default: sampled from product titles)'
+        )
+        parser.add_argument('--samples', type=int, default=25, help='Number of sampled queries')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per query and backend')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--backends', nargs='+', default=['icontains', 'fulltext', 'inverted'],
+            choices=sorted(BACKENDS),
+        )
+
+    def handle(self, *args, **options):
+        queries = options['queries'] or sample_search_queries(options['samples'], options['seed'])
+        if not queries:
+            raise CommandError('No products to sample queries from; pass queries explicitly.')
+
+        self.stdout.write(f"{len(queries)} queries x {options['repeat']} runs\n")
+        self.stdout.write(f"{'backend':<12}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'hits':>10}")
+
+        for name in options['backends']:
+            backend = BACKENDS[name]()
+            if not backend.is_available():
+                self.stdout.write(f"{name:<12}{'unavailable on this database':>40}")
+                continue
+            if name == 'inverted':
+                started = time.perf_counter()
+                product_index.build()
+                self.stderr.write(f"inverted index built in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+            timings = []
+            hits = 0
+            for query in queries:
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    results = backend.search(query, limit=options['page_size'])
+                    timings.append((time.perf_counter() - started) * 1000)
+                hits += results.total
+
+            summary = summarize(timings)
+            self.stdout.write(
+                f"{name:<12}{summary['p50_ms']:>10.2f}{summary['p95_ms']:>10.2f}"
+                f"{summary['mean_ms']:>10.2f}{hits:>10}"
+            )
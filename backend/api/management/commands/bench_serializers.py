@@ -0,0 +1,79 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from api.renderers import FastJSONRenderer
+from api.serializers import (
+    CategoryFastSerializer,
+    CategorySerializer,
+    ProductListFastSerializer,
+    ProductListSerializer,
+)
+from api.services import CategoryService, ProductService
+
+
+class Command(BaseCommand):
+    help = (
+        'Micro-benchmark the compiled list serializers and FastJSONRenderer against '
+        'the DRF serializers and JSONRenderer, checking the output is byte-identical'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100, help='Products per list page')
+        parser.add_argument('--repeat', type=int, default=200, help='Timed runs per path')
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        repeat = options['repeat']
+
+        # Fetch once up front so only serialization and rendering are timed
+        products = list(ProductService.get_all_active_products(1, page_size))
+        product_rows = list(ProductService.get_all_active_products(
+            1, page_size, fields=ProductListFastSerializer.value_fields
+        ))
+        categories = list(CategoryService.get_active_categories_with_product_count())
+        category_rows = list(CategoryService.get_active_categories_with_product_count().values(
+            *CategoryFastSerializer.value_fields
+        ))
+        if not products:
+            raise CommandError('No active products to serialize; load a catalog first.')
+
+        self.stdout.write(f"{len(products)} products, {len(categories)} categories, {repeat} runs\n")
+        self.stdout.write(f"{'endpoint':<12}{'path':<10}{'p50 us':>10}{'mean us':>10}{'speedup':>10}")
+
+        self.compare(
+            'products',
+            lambda: JSONRenderer().render({'results': ProductListSerializer(products, many=True).data}),
+            lambda: FastJSONRenderer().render({'results': ProductListFastSerializer.serialize(product_rows)}),
+            repeat,
+        )
+        self.compare(
+            'categories',
+            lambda: JSONRenderer().render({'results': CategorySerializer(categories, many=True).data}),
+            lambda: FastJSONRenderer().render({'results': CategoryFastSerializer.serialize(category_rows)}),
+            repeat,
+        )
+
+    def compare(self, label, drf_path, fast_path, repeat):
+        if drf_path() != fast_path():
+            raise CommandError(f'{label}: compiled output differs from the DRF serializer output')
+
+        drf_timings = self.time(drf_path, repeat)
+        fast_timings = self.time(fast_path, repeat)
+        speedup = statistics.mean(drf_timings) / statistics.mean(fast_timings)
+        for path, timings in (('drf', drf_timings), ('compiled', fast_timings)):
+            self.stdout.write(
+                f"{label:<12}{path:<10}{statistics.median(timings):>10.0f}"
+                f"{statistics.mean(timings):>10.0f}"
+                f"{(f'{speedup:.1f}x' if path == 'compiled' else ''):>10}"
+            )
+
+    @staticmethod
+    def time(path, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            path()
+            timings.append((time.perf_counter() - started) * 1e6)
+        return timings
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from api.models import Product
+from api.query_plans import ACTIVE_INDEXES, EXPLAIN, PRODUCT_TABLE, listing_plans
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN every product listing query shape (category, availability, price range, sort, '
+        'cursor pages, filtered counts) on the current catalog and fail if one sorts rows, scans '
+        'the whole product table or reads it without an active-only index. The test suite runs '
+        'the same checks on a small fixture catalog; this checks the plans at production size.'
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in EXPLAIN:
+            raise CommandError(f'No plan checks for {connection.vendor}')
+        sample = Product.active.values('category_id', 'availability').first()
+        if sample is None:
+            raise CommandError('No active products; run generate_catalog first.')
+        if Product.objects.count() < 1000:
+            self.stderr.write('Fewer than 1000 products: planners may prefer scans that are fine at this size.')
+
+        failures = 0
+        checked = 0
+        for plan in listing_plans(sample):
+            checked += 1
+            issues = list(plan.issues)
+            if not plan.indexes & ACTIVE_INDEXES:
+                issues.append(f"no active-only index (used {', '.join(sorted(plan.indexes)) or 'none'})")
+            if issues:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"{plan.label}: {', '.join(issues)}"))
+                self.stdout.write(f'  {plan.sql}')
+                self.stdout.write('  ' + plan.plan.replace('\n', '\n  '))
+            elif options['verbosity'] > 1:
+                self.stdout.write(f'{plan.label}: ok')
+                self.stdout.write('  ' + plan.plan.replace('\n', '\n  '))
+
+        if failures:
+            raise CommandError(
+                f'{failures} of {checked} listing queries sort rows, scan {PRODUCT_TABLE} '
+                f'or miss the active-only indexes'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'{checked} listing queries on {connection.vendor} use active-only indexes for filtering and ordering'
+        ))
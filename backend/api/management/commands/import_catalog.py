@@ -0,0 +1,146 @@
+import gzip
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from api.catalog_normalizer import normalize_ndjson_lines, normalize_records
+from api.models import Category
+from api.services.catalog_writer import CatalogWriter
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-import a scraped catalog snapshot (the nested JSON or the NDJSON snapshot, '
+        'optionally gzipped) without touching the network'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Nested JSON (home_run_catalog_nested.json) or NDJSON snapshot')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Processes parsing and normalizing records (0 or 1 does it in this process)'
+        )
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Records per worker task')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per upsert transaction')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'{path} does not exist')
+
+        # Category name -> snapshot metadata, and -> database id once saved
+        self.categories = {}
+        self.category_ids = {}
+        self.started = time.perf_counter()
+        writer = CatalogWriter(batch_size=options['batch_size'])
+        tasks = self.read_tasks(path, options['chunk_size'])
+
+        imported = skipped = invalid = 0
+        for rows, chunk_skipped, chunk_invalid in self.run_tasks(tasks, options['workers']):
+            skipped += chunk_skipped
+            invalid += chunk_invalid
+            for fields in rows:
+                fields['category_id'] = self.category_id(fields.pop('category_name'))
+                imported += 1
+                if writer.add(fields):
+                    self.report_progress(imported, writer)
+        writer.flush()
+
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} product records in {len(self.category_ids)} categories '
+            f'in {elapsed:.1f}s ({imported / elapsed if elapsed else 0:.0f} rows/s): {writer.totals}'
+        ))
+        if skipped or invalid:
+            self.stdout.write(f'Skipped {skipped} products without a valid price, {invalid} malformed records')
+
+    def run_tasks(self, tasks, workers):
+        """Yield the result of each (function, chunk) task, in input order"""
+        if workers <= 1:
+            for function, chunk in tasks:
+                yield function(chunk)
+            return
+
+        # Spawned rather than forked: workers only need the Django-free
+        # normalizer and must not inherit this process's database connections
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            # Bounded in-flight chunks keep memory flat on large snapshots
+            pending = deque()
+            for function, chunk in tasks:
+                pending.append(pool.submit(function, chunk))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def read_tasks(self, path, chunk_size):
+        """Yield (normalizer, chunk) tasks from either snapshot format"""
+        with open(path, 'rb') as f:
+            compressed = f.read(2) == b'\x1f\x8b'
+        opener = gzip.open if compressed else open
+
+        with opener(path, 'rt', encoding='utf-8') as f:
+            first = f.read(1)
+            while first and first.isspace():
+                first = f.read(1)
+            f.seek(0)
+
+            if first == '[':
+                # Nested JSON: a list of categories, each holding its products
+                for category in json.load(f):
+                    self.categories[category['category_name']] = category
+                    products = category.get('products', [])
+                    for start in range(0, len(products), chunk_size):
+                        yield normalize_records, [
+                            (category['category_name'], product)
+                            for product in products[start:start + chunk_size]
+                        ]
+                return
+
+            # NDJSON: one product per line tagged with category_name; category
+            # URLs and images come from the snapshot index when present
+            if os.path.exists(f'{path}.index.json'):
+                with open(f'{path}.index.json', encoding='utf-8') as index_file:
+                    self.categories = json.load(index_file).get('categories', {})
+            chunk = []
+            for line in f:
+                if line.strip():
+                    chunk.append(line)
+                if len(chunk) >= chunk_size:
+                    yield normalize_ndjson_lines, chunk
+                    chunk = []
+            if chunk:
+                yield normalize_ndjson_lines, chunk
+
+    def category_id(self, name):
+        """Id of a snapshot category, created or updated once per import"""
+        if name not in self.category_ids:
+            category = self.categories.get(name, {})
+            obj, created = Category.objects.get_or_create(
+                name=name,
+                defaults={
+                    'url': category.get('category_url'),
+                    'image_url': category.get('image_url'),
+                    'is_active': True,
+                }
+            )
+            if not created:
+                changed = []
+                for field, key in (('url', 'category_url'), ('image_url', 'image_url')):
+                    value = category.get(key, getattr(obj, field))
+                    if getattr(obj, field) != value:
+                        setattr(obj, field, value)
+                        changed.append(field)
+                if changed:
+                    obj.save(update_fields=changed + ['updated_at'])
+            self.category_ids[name] = obj.pk
+        return self.category_ids[name]
+
+    def report_progress(self, imported, writer):
+        elapsed = time.perf_counter() - self.started
+        self.stderr.write(f'{imported} products ({imported / elapsed:.0f} rows/s): {writer.totals}')
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from api.response_cache import bump_catalog_version
+from api.services.spec_index import SpecIndex
+
+
+class Command(BaseCommand):
+    help = (
+        'Regenerate the specification filter/facet index from Product.specifications '
+        '(after writes that bypass signals, e.g. queryset.update())'
+    )
+
+    def handle(self, *args, **options):
+        products, entries = SpecIndex.rebuild()
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {entries} specifications of {products} products'
+        ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from api.services.count_cache import CategoryProductCounts, ProductCountCache
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the cached product counts and Category.active_product_count '
+        'from the database, correcting any drift (run periodically)'
+    )
+
+    def handle(self, *args, **options):
+        drift = ProductCountCache.reconcile()
+        for key, (cached, actual) in sorted(drift.items()):
+            self.stdout.write(f'{key}: cached {cached}, actual {actual}')
+        stored_drift = CategoryProductCounts.recompute()
+        for category_id, (stored, actual) in sorted(stored_drift.items()):
+            self.stdout.write(f'category {category_id} active_product_count: stored {stored}, actual {actual}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Product counts reconciled ({len(drift)} cached and {len(stored_drift)} stored counts drifted)'
+        ))
@@ -0,0 +1,247 @@
+import contextvars
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+logger = logging.getLogger('api.slow_requests')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Measurements of the request being handled in the current thread / task.
+# sync_to_async copies the context, so queries a request runs on worker
+# threads are attributed to it too.
+_current = contextvars.ContextVar('api_request_metrics', default=None)
+
+
+class RequestRecord:
+    """What one request spent in the database and in serializers"""
+    __slots__ = ('queries', 'db_seconds', 'serializer_seconds', '_lock')
+
+    def __init__(self):
+        self.queries = []
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add_query(self, sql, seconds):
+        # Async views run a request's queries on several threads at once
+        with self._lock:
+            self.db_seconds += seconds
+            self.queries.append((sql, seconds))
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense"""
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip((*self.bounds, '+Inf'), self.counts):
+            total += count
+            yield bound, total
+
+
+class ViewMetrics:
+    __slots__ = ('latency', 'queries', 'db_seconds', 'serializer_seconds', 'statuses')
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.statuses = {}
+
+
+class MetricsRegistry:
+    """
+    In-process request metrics keyed by URL name.
+    Each worker process keeps its own registry, so a scrape of /api/metrics/
+    reports the process that served it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, status_code, seconds, record):
+        with self._lock:
+            metrics = self._views.get(view_name)
+            if metrics is None:
+                metrics = self._views[view_name] = ViewMetrics()
+            metrics.latency.observe(seconds)
+            metrics.queries.observe(len(record.queries))
+            metrics.db_seconds += record.db_seconds
+            metrics.serializer_seconds += record.serializer_seconds
+            status_class = f'{status_code // 100}xx'
+            metrics.statuses[status_class] = metrics.statuses.get(status_class, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+
+    def render(self, cache_stats=None):
+        """Prometheus text exposition of every metric"""
+        with self._lock:
+            views = sorted(self._views.items())
+            lines = []
+
+            def header(name, kind, help_text):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+
+            def histogram(name, attribute):
+                for view, metrics in views:
+                    data = getattr(metrics, attribute)
+                    for bound, total in data.cumulative():
+                        lines.append(f'{name}_bucket{{view="{view}",le="{bound}"}} {total}')
+                    lines.append(f'{name}_sum{{view="{view}"}} {data.sum:.6f}')
+                    lines.append(f'{name}_count{{view="{view}"}} {data.count}')
+
+            header('api_request_duration_seconds', 'histogram', 'Request latency by URL name')
+            histogram('api_request_duration_seconds', 'latency')
+            header('api_request_queries', 'histogram', 'SQL queries per request by URL name')
+            histogram('api_request_queries', 'queries')
+            header('api_requests_total', 'counter', 'Requests by URL name and status class')
+            for view, metrics in views:
+                for status_class, count in sorted(metrics.statuses.items()):
+                    lines.append(f'api_requests_total{{view="{view}",status="{status_class}"}} {count}')
+            header('api_db_seconds_total', 'counter', 'Time spent executing SQL by URL name')
+            for view, metrics in views:
+                lines.append(f'api_db_seconds_total{{view="{view}"}} {metrics.db_seconds:.6f}')
+            header('api_serializer_seconds_total', 'counter', 'Time spent serializing and rendering by URL name')
+            for view, metrics in views:
+                lines.append(f'api_serializer_seconds_total{{view="{view}"}} {metrics.serializer_seconds:.6f}')
+
+        if cache_stats:
+            header('api_response_cache_events_total', 'counter', 'Response cache hits, misses and 304s by view')
+            for view, events in cache_stats.items():
+                for event, count in events.items():
+                    lines.append(f'api_response_cache_events_total{{view="{view}",event="{event}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+@contextmanager
+def serializer_timer():
+    """Attribute the enclosed block to the current request's serializer time"""
+    record = _current.get()
+    if record is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record.serializer_seconds += time.perf_counter() - started
+
+
+def _query_timer(execute, sql, params, many, context):
+    """Execute wrapper timing SQL into the current request's record, if any"""
+    record = _current.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record.add_query(sql, time.perf_counter() - started)
+
+
+def install_query_timer(connection):
+    if _query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_timer)
+
+
+@receiver(connection_created)
+def time_connection_queries(sender, connection, **kwargs):
+    # Connections are per thread; each one gets the timer when it connects
+    install_query_timer(connection)
+
+
+def _slow_threshold():
+    return getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', 500)
+
+
+class MetricsMiddleware:
+    """
+    Record latency, SQL query count, DB time and serializer time per URL name,
+    and log the SQL of requests slower than SLOW_REQUEST_THRESHOLD_MS.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        for connection in connections.all():
+            install_query_timer(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        record = RequestRecord()
+        token = _current.set(record)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, record, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        record = RequestRecord()
+        token = _current.set(record)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, record, time.perf_counter() - started)
+        return response
+
+    def finish(self, request, response, record, seconds):
+        """Record a finished request and log it if it was slow"""
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else 'unresolved'
+        registry.record(view_name, response.status_code, seconds, record)
+
+        threshold = _slow_threshold()
+        if threshold and seconds * 1000 >= threshold:
+            self.log_slow_request(request, view_name, seconds, record)
+
+    @staticmethod
+    def log_slow_request(request, view_name, seconds, record):
+        lines = [
+            f'{request.method} {request.get_full_path()} ({view_name}) took {seconds * 1000:.0f} ms: '
+            f'{len(record.queries)} queries in {record.db_seconds * 1000:.0f} ms, '
+            f'serializers {record.serializer_seconds * 1000:.0f} ms'
+        ]
+        for sql, elapsed in record.queries:
+            lines.append(f'  [{elapsed * 1000:.1f} ms] {sql}')
+        logger.warning('\n'.join(lines))
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 of the parsed product detail payload', max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='source_etag',
+            field=models.CharField(blank=True, help_text='ETag header of the source product page', max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='source_last_modified',
+            field=models.CharField(blank=True, help_text='Last-Modified header of the source product page', max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,83 @@
+from django.db import migrations
+
+
+MYSQL_FORWARD = [
+    "ALTER TABLE api_product ADD FULLTEXT INDEX api_product_title_ft (title)",
+    "ALTER TABLE api_product ADD FULLTEXT INDEX api_product_title_desc_ft (title, description_text)",
+]
+MYSQL_REVERSE = [
+    "ALTER TABLE api_product DROP INDEX api_product_title_desc_ft",
+    "ALTER TABLE api_product DROP INDEX api_product_title_ft",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE api_product_fts USING fts5(
+        title, description_text,
+        content='api_product', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER api_product_fts_ai AFTER INSERT ON api_product BEGIN
+        INSERT INTO api_product_fts(rowid, title, description_text)
+        VALUES (new.id, new.title, new.description_text);
+    END
+    """,
+    """
+    CREATE TRIGGER api_product_fts_ad AFTER DELETE ON api_product BEGIN
+        INSERT INTO api_product_fts(api_product_fts, rowid, title, description_text)
+        VALUES ('delete', old.id, old.title, old.description_text);
+    END
+    """,
+    """
+    CREATE TRIGGER api_product_fts_au AFTER UPDATE OF title, description_text ON api_product BEGIN
+        INSERT INTO api_product_fts(api_product_fts, rowid, title, description_text)
+        VALUES ('delete', old.id, old.title, old.description_text);
+        INSERT INTO api_product_fts(rowid, title, description_text)
+        VALUES (new.id, new.title, new.description_text);
+    END
+    """,
+    "INSERT INTO api_product_fts(api_product_fts) VALUES ('rebuild')",
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS api_product_fts_au",
+    "DROP TRIGGER IF EXISTS api_product_fts_ad",
+    "DROP TRIGGER IF EXISTS api_product_fts_ai",
+    "DROP TABLE IF EXISTS api_product_fts",
+]
+
+
+def sqlite_has_fts5(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return any('FTS5' in row[0] for row in cursor.fetchall())
+
+
+def run_for_vendor(mysql_sql, sqlite_sql):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        if vendor == 'mysql':
+            statements = mysql_sql
+        elif vendor == 'sqlite' and sqlite_has_fts5(schema_editor):
+            statements = sqlite_sql
+        else:
+            # No full-text index here; search falls back to the in-process index
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_product_cursor_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(MYSQL_FORWARD, SQLITE_FORWARD),
+            run_for_vendor(MYSQL_REVERSE, SQLITE_REVERSE),
+        ),
+    ]
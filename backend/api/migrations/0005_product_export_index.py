@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_product_fulltext_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['updated_at', 'id'], name='api_product_updated_97d703_idx'),
+        ),
+    ]
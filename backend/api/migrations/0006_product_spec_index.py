@@ -0,0 +1,95 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Frozen copy of api.catalog_normalizer.spec_entries() as of this migration,
+# so replaying it never depends on live app code
+SPEC_KEY_MAX_LENGTH = 100
+SPEC_VALUE_MAX_LENGTH = 255
+
+
+def normalize_spec_text(text):
+    return ' '.join(str(text).split()).strip(' :').lower()
+
+
+def spec_entries(specifications):
+    entries = {}
+    if not isinstance(specifications, dict):
+        return []
+    for label, raw_value in specifications.items():
+        if isinstance(raw_value, bool) or not isinstance(raw_value, (str, int, float)):
+            continue
+        key = normalize_spec_text(label)
+        value = normalize_spec_text(raw_value)
+        if (
+            not key or not value or key in entries
+            or len(key) > SPEC_KEY_MAX_LENGTH or len(value) > SPEC_VALUE_MAX_LENGTH
+        ):
+            continue
+        entries[key] = (
+            key,
+            value,
+            ' '.join(str(label).split())[:SPEC_KEY_MAX_LENGTH],
+            ' '.join(str(raw_value).split())[:SPEC_VALUE_MAX_LENGTH],
+        )
+    return list(entries.values())
+
+
+def build_spec_index(apps, schema_editor):
+    Product = apps.get_model('api', 'Product')
+    ProductSpec = apps.get_model('api', 'ProductSpec')
+    products = Product.objects.order_by('id').values_list(
+        'id', 'category_id', 'is_active', 'specifications'
+    )
+    last_pk = 0
+    while True:
+        batch = list(products.filter(id__gt=last_pk)[:1000])
+        if not batch:
+            return
+        ProductSpec.objects.bulk_create([
+            ProductSpec(
+                product_id=pk,
+                category_id=category_id,
+                key=key,
+                value=value,
+                key_label=key_label,
+                value_label=value_label,
+            )
+            for pk, category_id, is_active, specifications in batch if is_active
+            for key, value, key_label, value_label in spec_entries(specifications)
+        ], batch_size=1000)
+        last_pk = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_product_export_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSpec',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text="Normalized specification name (e.g., 'manufacturer')", max_length=100)),
+                ('value', models.CharField(help_text="Normalized specification value (e.g., 'finolex')", max_length=255)),
+                ('key_label', models.CharField(help_text='Specification name as scraped', max_length=100)),
+                ('value_label', models.CharField(help_text='Specification value as scraped', max_length=255)),
+                ('category', models.ForeignKey(db_index=False, help_text="Copy of the product's category", on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.category')),
+                ('product', models.ForeignKey(db_index=False, help_text='Product this specification belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='spec_entries', to='api.product')),
+            ],
+            options={
+                'verbose_name': 'Product specification',
+                'verbose_name_plural': 'Product specifications',
+                'indexes': [models.Index(fields=['category', 'key', 'value'], name='api_product_categor_de189e_idx'), models.Index(fields=['key', 'value', 'product'], name='api_product_key_6a8a03_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='productspec',
+            constraint=models.UniqueConstraint(fields=('product', 'key'), name='api_productspec_product_key'),
+        ),
+        migrations.RunPython(build_spec_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_product_spec_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_categor_5c53c5_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_availab_16d936_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_price_b6b1d7_idx',
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['availability', '-created_at', '-id'], name='api_product_availab_e2a73f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'availability', '-created_at', '-id'], name='api_product_categor_be81f7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['price', 'id'], name='api_product_price_c2511f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'price', 'id'], name='api_product_categor_2c3379_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['availability', 'price', 'id'], name='api_product_availab_6ec2ab_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'availability', 'price', 'id'], name='api_product_categor_d0e15a_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:32
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_active_products(apps, schema_editor):
+    Category = apps.get_model('api', 'Category')
+    Product = apps.get_model('api', 'Product')
+    counts = Product.objects.filter(is_active=True).values('category_id').annotate(
+        count=Count('id')
+    ).order_by()
+    for row in counts:
+        Category.objects.filter(pk=row['category_id']).update(active_product_count=row['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_product_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='active_product_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Number of active products, maintained on every product write'),
+        ),
+        migrations.RunPython(count_active_products, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:36
+
+import api.models.active
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_category_active_product_count'),
+    ]
+
+    operations = [
+        # Build the active-only indexes before dropping the ones they replace
+        migrations.AddIndex(
+            model_name='category',
+            index=api.models.active.ActiveIndex(fields=['name'], name='category_active_name'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=api.models.active.ActiveIndex(fields=['-created_at', '-id'], name='product_active_newest'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=api.models.active.ActiveIndex(fields=['category', '-created_at', '-id'], name='product_active_cat_newest'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=api.models.active.ActiveIndex(fields=['availability', '-created_at', '-id'], name='product_active_avail_newest'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=api.models.active.ActiveIndex(fields=['category', 'availability', '-created_at', '-id'], name='product_active_cat_av_newest'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=api.models.active.ActiveIndex(fields=['price', 'id'], name='product_active_price'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=api.models.active.ActiveIndex(fields=['category', 'price', 'id'], name='product_active_cat_price'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=api.models.active.ActiveIndex(fields=['availability', 'price', 'id'], name='product_active_avail_price'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=api.models.active.ActiveIndex(fields=['category', 'availability', 'price', 'id'], name='product_active_cat_av_price'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=api.models.active.ActiveIndex(fields=['updated_at', 'id'], name='product_active_updated'),
+        ),
+        migrations.RemoveIndex(
+            model_name='category',
+            name='api_categor_is_acti_5fb091_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_is_acti_b97ca3_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_created_26d669_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_categor_15ccff_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_updated_97d703_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_availab_e2a73f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_categor_be81f7_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_price_c2511f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_categor_2c3379_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_availab_6ec2ab_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='api_product_categor_d0e15a_idx',
+        ),
+    ]
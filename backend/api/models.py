@@ -1,7 +1,7 @@
 from django.db import models
 
 # Import models from the models package
-from .models import Category, Product
+from .models import Category, Product, ProductSpec
 
-__all__ = ['Category', 'Product']
+__all__ = ['Category', 'Product', 'ProductSpec']
 
@@ -1,5 +1,6 @@
 from .category import Category
 from .product import Product
+from .product_spec import ProductSpec
 
-__all__ = ['Category', 'Product']
+__all__ = ['Category', 'Product', 'ProductSpec']
 
@@ -0,0 +1,45 @@
+from django.db import models
+from django.db.models import Q
+
+
+class ActiveQuerySet(models.QuerySet):
+    """QuerySet of a model with an is_active flag"""
+
+    def active(self):
+        """Only the active rows"""
+        return self.filter(is_active=True)
+
+
+class ActiveManager(models.Manager.from_queryset(ActiveQuerySet)):
+    """
+    Manager over active rows only (`Product.active`, `Category.active`)
+
+    Never the default manager: admin, the scraper and the count caches need
+    inactive rows too, so `objects` stays unfiltered.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().active()
+
+
+class ActiveIndex(models.Index):
+    """
+    Index over the active rows only, for queries filtered on is_active=True
+
+    Created as a partial index (`... WHERE is_active`) on backends that
+    support one; elsewhere (MySQL) as a composite with is_active as the
+    leading column, so the same queries seek into the active range. The
+    name is required and is the same on every backend, which is what
+    `manage.py check_query_plans` looks for in the plans.
+    """
+
+    def __init__(self, *, fields, name, **kwargs):
+        super().__init__(fields=fields, name=name, **kwargs)
+
+    def _backend_index(self, schema_editor):
+        if schema_editor.connection.features.supports_partial_indexes:
+            return models.Index(fields=self.fields, name=self.name, condition=Q(is_active=True))
+        return models.Index(fields=['is_active', *self.fields], name=self.name)
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        return self._backend_index(schema_editor).create_sql(model, schema_editor, using, **kwargs)
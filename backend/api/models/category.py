@@ -1,6 +1,8 @@
 from django.db import models
 from django.urls import reverse
 
+from .active import ActiveIndex, ActiveManager, ActiveQuerySet
+
 
 class Category(models.Model):
     """
@@ -29,6 +31,14 @@ class Category(models.Model):
         default=True,
         help_text="Whether the category is active and visible"
     )
+    active_product_count = models.IntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of active products, maintained on every product write"
+    )
+
+    objects = ActiveQuerySet.as_manager()
+    active = ActiveManager()
 
     class Meta:
         verbose_name = "Category"
@@ -36,7 +46,8 @@ class Category(models.Model):
         ordering = ['name']
         indexes = [
             models.Index(fields=['name']),
-            models.Index(fields=['is_active']),
+            # Active categories by name (the category list)
+            ActiveIndex(fields=['name'], name='category_active_name'),
         ]
 
     def __str__(self):
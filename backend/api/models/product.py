@@ -3,6 +3,8 @@ from django.urls import reverse
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 
+from .active import ActiveIndex, ActiveManager, ActiveQuerySet
+
 
 class Product(models.Model):
     """
@@ -94,6 +96,26 @@ class Product(models.Model):
         help_text="Product specifications as key-value pairs"
     )
 
+    # Source validators for incremental re-scrapes
+    source_etag = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text="ETag header of the source product page"
+    )
+    source_last_modified = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        help_text="Last-Modified header of the source product page"
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        help_text="SHA-256 of the parsed product detail payload"
+    )
+
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -102,16 +124,34 @@ class Product(models.Model):
         help_text="Whether the product is active and visible"
     )
 
+    objects = ActiveQuerySet.as_manager()
+    active = ActiveManager()
+
     class Meta:
         verbose_name = "Product"
         verbose_name_plural = "Products"
         ordering = ['-created_at']
+        # Every list filter/sort combination (optional category, optional
+        # availability, then the sort columns) has a composite index, so no
+        # listing sorts rows or scans the table; price ranges are a range on
+        # the price columns. Listings only ever read active products, so these
+        # are ActiveIndexes: partial (WHERE is_active) where the backend has
+        # them, led by is_active elsewhere. `manage.py check_query_plans`
+        # verifies the plans use them.
         indexes = [
-            models.Index(fields=['category']),
             models.Index(fields=['product_id']),
-            models.Index(fields=['is_active']),
-            models.Index(fields=['availability']),
-            models.Index(fields=['price']),
+            # Newest first, also keyset pagination on (created_at, id)
+            ActiveIndex(fields=['-created_at', '-id'], name='product_active_newest'),
+            ActiveIndex(fields=['category', '-created_at', '-id'], name='product_active_cat_newest'),
+            ActiveIndex(fields=['availability', '-created_at', '-id'], name='product_active_avail_newest'),
+            ActiveIndex(fields=['category', 'availability', '-created_at', '-id'], name='product_active_cat_av_newest'),
+            # sort=price / sort=-price (scanned backwards)
+            ActiveIndex(fields=['price', 'id'], name='product_active_price'),
+            ActiveIndex(fields=['category', 'price', 'id'], name='product_active_cat_price'),
+            ActiveIndex(fields=['availability', 'price', 'id'], name='product_active_avail_price'),
+            ActiveIndex(fields=['category', 'availability', 'price', 'id'], name='product_active_cat_av_price'),
+            # Keyset chunks of the streaming export and its updated_since filter
+            ActiveIndex(fields=['updated_at', 'id'], name='product_active_updated'),
         ]
 
     def __str__(self):
@@ -132,6 +172,9 @@ class Product(models.Model):
         """Return main image URL or first image from images list"""
         if self.image_url:
             return self.image_url
+        # List queries project only the first image (ProductService.list_queryset)
+        if hasattr(self, 'first_image'):
+            return self.first_image
         if self.images and len(self.images) > 0:
             return self.images[0]
         return None
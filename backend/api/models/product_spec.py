@@ -0,0 +1,60 @@
+from django.db import models
+
+
+class ProductSpec(models.Model):
+    """
+    One normalized specification of an active product, indexed for filtering
+    and facets.
+
+    Derived from Product.specifications at write time and rebuilt by
+    `manage.py rebuild_spec_index`; never edit rows directly. Inactive
+    products have no rows, and the product's category is copied onto each
+    row, so facet counts for a category are answered from one index range
+    without joining products.
+    """
+    product = models.ForeignKey(
+        'Product',
+        on_delete=models.CASCADE,
+        related_name='spec_entries',
+        db_index=False,  # covered by the (product, key) unique constraint
+        help_text="Product this specification belongs to"
+    )
+    category = models.ForeignKey(
+        'Category',
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False,
+        help_text="Copy of the product's category"
+    )
+    key = models.CharField(
+        max_length=100,
+        help_text="Normalized specification name (e.g., 'manufacturer')"
+    )
+    value = models.CharField(
+        max_length=255,
+        help_text="Normalized specification value (e.g., 'finolex')"
+    )
+    key_label = models.CharField(
+        max_length=100,
+        help_text="Specification name as scraped"
+    )
+    value_label = models.CharField(
+        max_length=255,
+        help_text="Specification value as scraped"
+    )
+
+    class Meta:
+        verbose_name = "Product specification"
+        verbose_name_plural = "Product specifications"
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'key'], name='api_productspec_product_key'),
+        ]
+        indexes = [
+            # Facet counts: value counts per key for a category
+            models.Index(fields=['category', 'key', 'value']),
+            # Filters: products having a key/value pair
+            models.Index(fields=['key', 'value', 'product']),
+        ]
+
+    def __str__(self):
+        return f"{self.key_label}: {self.value_label}"
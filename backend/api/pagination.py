@@ -0,0 +1,101 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.db.models import Q
+
+
+# Keyset ordering shared by every cursor-paginated product query; must match
+# the composite (created_at, id) indexes on Product
+CURSOR_ORDERING = ('-created_at', '-id')
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded"""
+
+
+@dataclass
+class CursorPage:
+    """One page of a keyset-paginated queryset"""
+    items: list
+    next_cursor: str = None
+    prev_cursor: str = None
+
+
+def encode_cursor(created_at, pk, reverse=False):
+    """Build an opaque cursor pointing at the row (created_at, pk)"""
+    payload = {'c': created_at.isoformat(), 'i': pk}
+    if reverse:
+        payload['r'] = 1
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Return (created_at, pk, reverse) for a cursor built by encode_cursor()"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        return datetime.fromisoformat(payload['c']), int(payload['i']), bool(payload.get('r'))
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor('cursor') from e
+
+
+def _position(row):
+    """(created_at, pk) of a model instance or values() row"""
+    if isinstance(row, dict):
+        return row['created_at'], row['id']
+    return row.created_at, row.pk
+
+
+def paginate_by_cursor(queryset, cursor=None, page_size=20):
+    """
+    Keyset-paginate a queryset newest first on (created_at, id).
+    Each page is a single indexed range scan, however deep it is.
+    """
+    if not cursor:
+        rows = list(queryset.order_by(*CURSOR_ORDERING)[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        return CursorPage(
+            items=rows,
+            next_cursor=encode_cursor(*_position(rows[-1])) if has_more else None,
+        )
+
+    created_at, pk, reverse = decode_cursor(cursor)
+
+    if not reverse:
+        rows = list(
+            queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            ).order_by(*CURSOR_ORDERING)[:page_size + 1]
+        )
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        return CursorPage(
+            items=rows,
+            next_cursor=encode_cursor(*_position(rows[-1])) if has_more else None,
+            # We arrived by moving forward, so there is always a page before this one
+            prev_cursor=(
+                encode_cursor(*_position(rows[0]), reverse=True)
+                if rows else encode_cursor(created_at, pk, reverse=True)
+            ),
+        )
+
+    # Walking backwards: scan the newer rows in ascending order, then flip them
+    rows = list(
+        queryset.filter(
+            Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+        ).order_by('created_at', 'id')[:page_size + 1]
+    )
+    has_more = len(rows) > page_size
+    rows = rows[:page_size][::-1]
+    return CursorPage(
+        items=rows,
+        next_cursor=(
+            encode_cursor(*_position(rows[-1]))
+            if rows else encode_cursor(created_at, pk)
+        ),
+        prev_cursor=encode_cursor(*_position(rows[0]), reverse=True) if has_more else None,
+    )
@@ -0,0 +1,190 @@
+import json
+import re
+from decimal import Decimal
+from itertools import product as combinations
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.filters import SORT_ORDERINGS, ProductFilters
+from api.models import Product
+from api.models.active import ActiveIndex
+from api.serializers.compiled import ProductListFastSerializer
+from api.services.product_service import ProductService
+
+
+PRODUCT_TABLE = Product._meta.db_table
+# Listings read active products only, so they must go through one of these
+ACTIVE_INDEXES = {index.name for index in Product._meta.indexes if isinstance(index, ActiveIndex)}
+SQLITE_INDEX_USE = re.compile(rf'^(?:SEARCH|SCAN) {PRODUCT_TABLE} USING (?:COVERING )?INDEX (\w+)')
+
+
+class ListingPlan:
+    """The EXPLAINed plan of one product SELECT issued by a listing shape"""
+
+    def __init__(self, label, sql, plan, issues, indexes):
+        self.label = label
+        self.sql = sql
+        self.plan = plan
+        self.issues = issues  # 'sorts rows' / 'full table scan'
+        self.indexes = indexes  # product indexes the plan reads
+
+    def __str__(self):
+        return f'{self.label}\n  {self.sql}\n  ' + self.plan.replace('\n', '\n  ')
+
+
+def listing_plans(sample):
+    """
+    Run every product listing query shape and EXPLAIN each product SELECT
+    Yields ListingPlan; `sample` is a {'category_id', 'availability'} row
+    to filter on.
+    """
+    for label, call, allow_sort in listing_calls(sample):
+        with CaptureQueriesContext(connection) as queries:
+            call()
+        for query in queries.captured_queries:
+            sql = query['sql']
+            if PRODUCT_TABLE not in sql or not sql.lstrip().upper().startswith('SELECT'):
+                continue
+            plan, issues, indexes = explain(sql)
+            if allow_sort:
+                issues = [issue for issue in issues if issue != 'sorts rows']
+            yield ListingPlan(label, sql, plan, issues, indexes)
+
+
+def listing_calls(sample):
+    """(label, callable, sort allowed) for each query shape ProductListView can issue"""
+    fields = ProductListFastSerializer.value_fields
+    price_range = (Decimal('100'), Decimal('1000'))
+
+    for category_id, availability, prices, sort in combinations(
+        (None, sample['category_id']),
+        (None, sample['availability']),
+        (None, price_range),
+        SORT_ORDERINGS,
+    ):
+        filters = ProductFilters(
+            min_price=prices and prices[0],
+            max_price=prices and prices[1],
+            availability=availability,
+        )
+        # A price range ordered newest first cannot both seek and be read
+        # in order from one index; the planner picks between sorting the
+        # rows in the range and scanning the created_at index with price as
+        # a residual filter, so a sort is accepted for these shapes only
+        allow_sort = bool(prices) and sort == 'newest'
+        label = ' '.join(filter(None, (
+            f'sort={sort}',
+            category_id and 'category',
+            availability and 'availability',
+            prices and 'price-range',
+        )))
+        if category_id:
+            yield label, lambda c=category_id, f=filters, s=sort: list(
+                ProductService.get_products_by_category(c, 3, 20, fields=fields, filters=f, sort=s)
+            ), allow_sort
+        else:
+            yield label, lambda f=filters, s=sort: list(
+                ProductService.get_all_active_products(3, 20, fields=fields, filters=f, sort=s)
+            ), allow_sort
+
+        if filters:
+            if category_id:
+                yield f'{label} count', lambda c=category_id, f=filters: (
+                    ProductService.get_product_count_by_category(c, f)
+                ), False
+            else:
+                yield f'{label} count', lambda f=filters: ProductService.get_total_product_count(f), False
+
+        if sort == 'newest':
+            yield f'{label} cursor', lambda c=category_id, f=filters: walk_cursor(c, f), allow_sort
+
+
+def walk_cursor(category_id, filters):
+    """First page, next page and back again"""
+    page = ProductService.get_products_page_by_cursor(None, 20, category_id, filters=filters)
+    if page.next_cursor:
+        page = ProductService.get_products_page_by_cursor(page.next_cursor, 20, category_id, filters=filters)
+        if page.prev_cursor:
+            ProductService.get_products_page_by_cursor(page.prev_cursor, 20, category_id, filters=filters)
+
+
+def explain(sql):
+    """Return (plan text, [issues], {product indexes used}) for a SELECT on the current database"""
+    explain_vendor = EXPLAIN.get(connection.vendor)
+    if explain_vendor is None:
+        raise NotImplementedError(f'No plan checks for {connection.vendor}')
+    return explain_vendor(sql)
+
+
+def explain_sqlite(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        details = [row[3] for row in cursor.fetchall()]
+    issues = []
+    used = set()
+    for detail in details:
+        if detail.startswith('USE TEMP B-TREE FOR') and 'ORDER BY' in detail:
+            issues.append('sorts rows')
+        if detail == f'SCAN {PRODUCT_TABLE}':
+            issues.append('full table scan')
+        match = SQLITE_INDEX_USE.match(detail)
+        if match:
+            used.add(match.group(1))
+    return '\n'.join(details), issues, used
+
+
+def explain_mysql(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN FORMAT=JSON {sql}')
+        plan = json.loads(cursor.fetchone()[0])
+    issues = []
+    used = set()
+    for node in _walk(plan):
+        if node.get('using_filesort'):
+            issues.append('sorts rows')  # filesort
+        if node.get('table_name') == PRODUCT_TABLE:
+            if node.get('access_type') == 'ALL':
+                issues.append('full table scan')
+            if node.get('key'):
+                used.add(node['key'])
+    return json.dumps(plan, indent=2), issues, used
+
+
+def explain_postgresql(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    issues = []
+    used = set()
+    for node in _walk(plan):
+        if node.get('Node Type') in ('Sort', 'Incremental Sort'):
+            issues.append('sorts rows')
+        if node.get('Relation Name') == PRODUCT_TABLE:
+            if node.get('Node Type') == 'Seq Scan':
+                issues.append('full table scan')
+            if node.get('Index Name'):
+                used.add(node['Index Name'])
+    return json.dumps(plan, indent=2), issues, used
+
+
+EXPLAIN = {
+    'sqlite': explain_sqlite,
+    'mysql': explain_mysql,
+    'postgresql': explain_postgresql,
+}
+
+
+def _walk(node):
+    """Every dict nested anywhere in a JSON plan"""
+    if isinstance(node, dict):
+        yield node
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return
+    for child in children:
+        yield from _walk(child)
@@ -0,0 +1,88 @@
+import math
+
+from rest_framework.renderers import JSONRenderer
+from api.metrics import serializer_timer
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+# Values a payload walk can skip: everything but floats and containers
+SCALAR_TYPES = frozenset((str, int, bool, type(None)))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    Output is byte-identical to JSONRenderer's compact UTF-8 form: datetimes,
+    Decimals and other non-native types go through the same encoder_class,
+    and \\u2028/\\u2029 are escaped the same way. Indented (browsable or
+    `; indent=` requested) output and anything orjson rejects fall back to
+    JSONRenderer, as does data holding a float orjson writes differently:
+    exponent forms (1e16 for 1e+16) and NaN/Infinity, which orjson turns
+    into null where JSONRenderer raises.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with serializer_timer():
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        if data is None:
+            return b''
+        if (
+            orjson is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if _has_divergent_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encode = self.encoder_class().default
+
+        def default(obj):
+            # Values the encoder substitutes are checked like the rest
+            value = encode(obj)
+            if _has_divergent_float(value):
+                raise TypeError('float that orjson formats differently')
+            return value
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except (TypeError, orjson.JSONEncodeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+def _divergent(value):
+    """A float json.dumps writes in exponent form, or refuses (NaN, Infinity)"""
+    return not math.isfinite(value) or 'e' in repr(value)
+
+
+def _has_divergent_float(data):
+    """Whether a divergent float appears anywhere in nested dicts/lists/tuples"""
+    if isinstance(data, float):
+        return _divergent(data)
+    if not isinstance(data, (dict, list, tuple)):
+        return False
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        for item in value.values() if isinstance(value, dict) else value:
+            if type(item) in SCALAR_TYPES:
+                continue
+            if isinstance(item, float):
+                if _divergent(item):
+                    return True
+            elif isinstance(item, (dict, list, tuple)):
+                stack.append(item)
+    return False
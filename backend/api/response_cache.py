@@ -0,0 +1,177 @@
+import functools
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from api.models import Category, Product
+from api.signals import products_bulk_changed
+
+
+VERSION_KEY = 'catalog_version'
+STATS_KEY_PREFIX = 'response_cache:stats'
+STATS_EVENTS = ('hits', 'misses', 'not_modified')
+
+# Names of the views wrapped by cache_response, for get_cache_stats()
+_cached_views = set()
+
+
+def _timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def get_catalog_version():
+    """
+    Current catalog version. Minted from the clock when missing and expiring
+    with the cached responses, so staleness is bounded even if a writer in
+    another process could not reach this cache.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = int(time.time() * 1000)
+        if not cache.add(VERSION_KEY, version, timeout=_timeout()):
+            version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def bump_catalog_version():
+    """Invalidate every cached response and ETag"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Nothing cached yet; a fresh version is minted on the next read
+        pass
+
+
+def _count(view_name, event):
+    key = f'{STATS_KEY_PREFIX}:{view_name}:{event}'
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+def get_cache_stats():
+    """Hit/miss/304 counters per cached view"""
+    keys = {
+        (view_name, event): f'{STATS_KEY_PREFIX}:{view_name}:{event}'
+        for view_name in _cached_views
+        for event in STATS_EVENTS
+    }
+    values = cache.get_many(list(keys.values()))
+    stats = {}
+    for (view_name, event), key in sorted(keys.items()):
+        stats.setdefault(view_name, {})[event] = values.get(key, 0)
+    return stats
+
+
+# Returned by _lookup() when the client's ETag is current
+NOT_MODIFIED = object()
+
+
+def _lookup(view_name, media_type, path, query_lists, if_none_match):
+    """
+    Return (etag, cache key, cached value) for a request, or NOT_MODIFIED as
+    the value when If-None-Match already names the current ETag.
+    """
+    query = urlencode(sorted(query_lists), doseq=True)
+    key_source = f'{get_catalog_version()}:{media_type}:{path}?{query}'
+    digest = hashlib.sha256(key_source.encode('utf-8')).hexdigest()[:32]
+    etag = f'"{digest}"'
+    cache_key = f'response:{digest}'
+
+    etags = parse_etags(if_none_match)
+    if etag in etags or '*' in etags:
+        _count(view_name, 'not_modified')
+        return etag, cache_key, NOT_MODIFIED
+
+    value = cache.get(cache_key)
+    _count(view_name, 'misses' if value is None else 'hits')
+    return etag, cache_key, value
+
+
+async def _run_cache_call(function, *args):
+    # In-process caches answer without I/O, so they are used from the event
+    # loop directly; network caches are called from a worker thread
+    if isinstance(caches['default'], LocMemCache):
+        return function(*args)
+    return await sync_to_async(function, thread_sensitive=False)(*args)
+
+
+def cache_response(view_method):
+    """
+    Cache a read-only view method's 200 responses under the catalog version.
+
+    Every response carries a strong ETag derived from the catalog version and
+    the normalized request URL. A matching If-None-Match is answered with a
+    304 before the view runs, so it never touches the database.
+
+    Wraps APIView methods (caching response.data) and async Django view
+    methods returning JSON HttpResponses (caching the rendered body).
+    """
+    view_name = view_method.__qualname__.split('.')[0]
+    _cached_views.add(view_name)
+    if iscoroutinefunction(view_method):
+        return _cache_async_response(view_method, view_name)
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        etag, cache_key, data = _lookup(
+            view_name, request.accepted_media_type, request.path,
+            request.query_params.lists(), request.META.get('HTTP_IF_NONE_MATCH', '')
+        )
+        if data is NOT_MODIFIED:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        elif data is not None:
+            response = Response(data, status=status.HTTP_200_OK)
+        else:
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            cache.set(cache_key, response.data, timeout=_timeout())
+
+        response['ETag'] = etag
+        return response
+
+    return wrapper
+
+
+def _cache_async_response(view_method, view_name):
+    @functools.wraps(view_method)
+    async def wrapper(self, request, *args, **kwargs):
+        etag, cache_key, body = await _run_cache_call(
+            _lookup, view_name, 'application/json', request.path,
+            list(request.GET.lists()), request.META.get('HTTP_IF_NONE_MATCH', '')
+        )
+        if body is NOT_MODIFIED:
+            response = HttpResponseNotModified()
+        elif body is not None:
+            response = HttpResponse(body, content_type='application/json')
+        else:
+            response = await view_method(self, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            await _run_cache_call(cache.set, cache_key, response.content, _timeout())
+
+        response['ETag'] = etag
+        return response
+
+    return wrapper
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Product)
+@receiver(products_bulk_changed)
+def bump_on_catalog_change(sender, **kwargs):
+    transaction.on_commit(bump_catalog_version)
@@ -0,0 +1,40 @@
+from django.conf import settings
+from .base import SearchBackend, SearchResults, tokenize
+from .icontains import IContainsBackend
+from .fulltext import FullTextBackend
+from .inverted import InvertedIndexBackend, product_index
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (FullTextBackend, InvertedIndexBackend, IContainsBackend)
+}
+
+_backend = None
+
+
+def get_search_backend():
+    """
+    Return the configured search backend (settings.SEARCH_BACKEND).
+    The full-text backend falls back to the in-process inverted index on
+    databases without a full-text index.
+    """
+    global _backend
+    if _backend is None:
+        backend = BACKENDS[getattr(settings, 'SEARCH_BACKEND', 'fulltext')]()
+        if not backend.is_available():
+            backend = InvertedIndexBackend()
+        _backend = backend
+    return _backend
+
+
+__all__ = [
+    'SearchBackend',
+    'SearchResults',
+    'tokenize',
+    'IContainsBackend',
+    'FullTextBackend',
+    'InvertedIndexBackend',
+    'product_index',
+    'BACKENDS',
+    'get_search_backend',
+]
@@ -0,0 +1,41 @@
+import re
+from dataclasses import dataclass
+
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Ranking knobs shared by every backend
+TITLE_BOOST = 3.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text):
+    """Lowercased word tokens of a text"""
+    if not text:
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+
+@dataclass
+class SearchResults:
+    """Product ids of one result page, best match first, plus the total match count"""
+    ids: list
+    total: int
+
+
+class SearchBackend:
+    """
+    Base class for product search backends.
+    Every backend matches active products containing all query terms (the
+    last term as a prefix, for search-as-you-type) and ranks them.
+    """
+    name = None
+
+    def is_available(self):
+        """Whether the backend can serve queries on the current database"""
+        return True
+
+    def search(self, query, offset=0, limit=20, category_id=None):
+        """Return SearchResults for one page of matches"""
+        raise NotImplementedError
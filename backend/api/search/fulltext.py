@@ -0,0 +1,140 @@
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from .base import SearchBackend, SearchResults, TITLE_BOOST, tokenize
+
+
+# SQLite (dev): external-content FTS5 table over api_product, kept in sync by triggers
+FTS_TABLE = 'api_product_fts'
+
+SQLITE_FTS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON api_product BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description_text)
+        VALUES (new.id, new.title, new.description_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON api_product BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description_text)
+        VALUES ('delete', old.id, old.title, old.description_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description_text ON api_product BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description_text)
+        VALUES ('delete', old.id, old.title, old.description_text);
+        INSERT INTO {FTS_TABLE}(rowid, title, description_text)
+        VALUES (new.id, new.title, new.description_text);
+    END
+    """,
+]
+
+
+def sqlite_fts_exists(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+@receiver(connection_created)
+def ensure_sqlite_fts_triggers(sender, connection, **kwargs):
+    """
+    SQLite drops triggers whenever a migration rebuilds api_product,
+    so re-create any missing sync triggers on every new connection.
+    """
+    if connection.vendor != 'sqlite' or not sqlite_fts_exists(connection):
+        return
+    with connection.cursor() as cursor:
+        for sql in SQLITE_FTS_TRIGGERS:
+            cursor.execute(sql)
+
+
+def _mysql_boolean_query(terms):
+    # Every term required, the last one as a prefix
+    return ' '.join(f'+{term}' for term in terms[:-1]) + f' +{terms[-1]}*'
+
+
+def _fts5_query(terms):
+    # Quoted tokens are implicitly ANDed; the last one is a prefix query
+    return ' '.join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*'
+
+
+class FullTextBackend(SearchBackend):
+    """
+    Database full-text index search.
+    MySQL uses the FULLTEXT indexes on (title) and (title, description_text),
+    adding the title score again with TITLE_BOOST. SQLite uses the FTS5 table
+    ranked by its built-in bm25() with the title column weighted by TITLE_BOOST.
+    """
+    name = 'fulltext'
+
+    def is_available(self):
+        if connection.vendor == 'mysql':
+            return True
+        if connection.vendor == 'sqlite':
+            return sqlite_fts_exists(connection)
+        return False
+
+    def search(self, query, offset=0, limit=20, category_id=None):
+        terms = tokenize(query)
+        if not terms:
+            return SearchResults(ids=[], total=0)
+
+        if connection.vendor == 'mysql':
+            count_sql, page_sql, params = self._mysql_sql(terms, category_id)
+        else:
+            count_sql, page_sql, params = self._sqlite_sql(terms, category_id)
+
+        with connection.cursor() as cursor:
+            cursor.execute(count_sql, params['count'])
+            total = cursor.fetchone()[0]
+            if not total or offset >= total:
+                return SearchResults(ids=[], total=total)
+            cursor.execute(page_sql, params['page'] + [limit, offset])
+            ids = [row[0] for row in cursor.fetchall()]
+        return SearchResults(ids=ids, total=total)
+
+    def _mysql_sql(self, terms, category_id):
+        match = _mysql_boolean_query(terms)
+        where = (
+            "MATCH(title, description_text) AGAINST (%s IN BOOLEAN MODE) "
+            "AND is_active = 1"
+        )
+        where_params = [match]
+        if category_id:
+            where += " AND category_id = %s"
+            where_params.append(category_id)
+
+        count_sql = f"SELECT COUNT(*) FROM api_product WHERE {where}"
+        page_sql = (
+            "SELECT id, "
+            "%s * MATCH(title) AGAINST (%s IN BOOLEAN MODE) "
+            "+ MATCH(title, description_text) AGAINST (%s IN BOOLEAN MODE) AS score "
+            f"FROM api_product WHERE {where} "
+            "ORDER BY score DESC, id DESC LIMIT %s OFFSET %s"
+        )
+        return count_sql, page_sql, {
+            'count': where_params,
+            'page': [TITLE_BOOST, match, match] + where_params,
+        }
+
+    def _sqlite_sql(self, terms, category_id):
+        where = f"{FTS_TABLE} MATCH %s AND p.is_active = 1"
+        where_params = [_fts5_query(terms)]
+        if category_id:
+            where += " AND p.category_id = %s"
+            where_params.append(category_id)
+
+        # CROSS JOIN pins the FTS match as the outer loop; otherwise SQLite may
+        # walk api_product and probe the FTS table once per row
+        joined = f"FROM {FTS_TABLE} CROSS JOIN api_product p ON p.id = {FTS_TABLE}.rowid WHERE {where}"
+        count_sql = f"SELECT COUNT(*) {joined}"
+        # bm25() is lower-is-better; column weights are (title, description_text)
+        page_sql = (
+            f"SELECT p.id, bm25({FTS_TABLE}, {TITLE_BOOST}, 1.0) AS score {joined} "
+            "ORDER BY score, p.id DESC LIMIT %s OFFSET %s"
+        )
+        return count_sql, page_sql, {'count': where_params, 'page': where_params}
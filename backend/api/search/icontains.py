@@ -0,0 +1,24 @@
+from django.db.models import Q
+from api.models import Product
+from api.pagination import CURSOR_ORDERING
+from .base import SearchBackend, SearchResults
+
+
+class IContainsBackend(SearchBackend):
+    """
+    Legacy substring search over title and description, newest first.
+    Needs a full table scan per query; kept as the benchmark baseline.
+    """
+    name = 'icontains'
+
+    def search(self, query, offset=0, limit=20, category_id=None):
+        queryset = Product.active.filter(
+            Q(title__icontains=query) | Q(description_text__icontains=query)
+        )
+        if category_id:
+            queryset = queryset.filter(category_id=category_id)
+
+        ids = list(
+            queryset.order_by(*CURSOR_ORDERING).values_list('id', flat=True)[offset:offset + limit]
+        )
+        return SearchResults(ids=ids, total=queryset.count())
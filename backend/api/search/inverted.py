@@ -0,0 +1,202 @@
+import math
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from api.models import Product
+from api.signals import changed_products, products_bulk_changed
+from .base import BM25_B, BM25_K1, TITLE_BOOST, SearchBackend, SearchResults, tokenize
+
+
+class InvertedIndex:
+    """
+    In-process inverted index over active products.
+    Postings map each term to {product id: (title tf, description tf)} and
+    are scored with BM25F, the title field weighted by TITLE_BOOST.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._postings = defaultdict(dict)
+        self._docs = {}  # product id -> (title length, description length, category id, terms)
+        self._title_total = 0
+        self._body_total = 0
+        self._vocabulary = []
+        self._vocabulary_dirty = True
+
+    @property
+    def built(self):
+        return self._built
+
+    def build(self):
+        """(Re)build the whole index from the database"""
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            self._title_total = self._body_total = 0
+            rows = Product.active.values_list(
+                'id', 'title', 'description_text', 'category_id'
+            )
+            for row in rows.iterator(chunk_size=2000):
+                self._add(*row)
+            self._vocabulary_dirty = True
+            self._built = True
+
+    def ensure_built(self):
+        if not self._built:
+            self.build()
+
+    def update(self, product_id, title, description_text, category_id, is_active=True):
+        """Index (or unindex) a single product; no-op until the index is built"""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(product_id)
+            if is_active:
+                self._add(product_id, title, description_text, category_id)
+            self._vocabulary_dirty = True
+
+    def remove(self, product_id):
+        with self._lock:
+            if self._built:
+                self._remove(product_id)
+
+    def _add(self, product_id, title, description_text, category_id):
+        title_tf = Counter(tokenize(title))
+        body_tf = Counter(tokenize(description_text))
+        terms = set(title_tf) | set(body_tf)
+        for term in terms:
+            self._postings[term][product_id] = (title_tf.get(term, 0), body_tf.get(term, 0))
+        title_len = sum(title_tf.values())
+        body_len = sum(body_tf.values())
+        self._docs[product_id] = (title_len, body_len, category_id, terms)
+        self._title_total += title_len
+        self._body_total += body_len
+
+    def _remove(self, product_id):
+        doc = self._docs.pop(product_id, None)
+        if doc is None:
+            return
+        title_len, body_len, _, terms = doc
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(product_id, None)
+            if not postings:
+                del self._postings[term]
+        self._title_total -= title_len
+        self._body_total -= body_len
+
+    def _expand_prefix(self, prefix):
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect_left(self._vocabulary, prefix)
+        expansions = []
+        for term in self._vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            expansions.append(term)
+        return expansions
+
+    def score(self, query, category_id=None):
+        """Return [(product id, score)] for products matching every query term, best first"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        category_id = int(category_id) if category_id else None
+
+        with self._lock:
+            doc_count = len(self._docs)
+            if not doc_count:
+                return []
+            avg_title = (self._title_total / doc_count) or 1
+            avg_body = (self._body_total / doc_count) or 1
+
+            # One group per query term; the last term also matches as a prefix
+            groups = [[term] for term in terms[:-1]] + [self._expand_prefix(terms[-1])]
+            scores = None
+            for group in groups:
+                group_scores = {}
+                for term in group:
+                    postings = self._postings.get(term, {})
+                    df = len(postings)
+                    if not df:
+                        continue
+                    idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+                    for product_id, (title_tf, body_tf) in postings.items():
+                        title_len, body_len, doc_category, _ = self._docs[product_id]
+                        if category_id and doc_category != category_id:
+                            continue
+                        tf = (
+                            TITLE_BOOST * title_tf / (1 - BM25_B + BM25_B * title_len / avg_title)
+                            + body_tf / (1 - BM25_B + BM25_B * body_len / avg_body)
+                        )
+                        term_score = idf * tf * (BM25_K1 + 1) / (BM25_K1 + tf)
+                        # Prefix expansions of one query term count once, at their best
+                        if term_score > group_scores.get(product_id, 0):
+                            group_scores[product_id] = term_score
+
+                if scores is None:
+                    scores = group_scores
+                else:
+                    scores = {
+                        product_id: score + group_scores[product_id]
+                        for product_id, score in scores.items()
+                        if product_id in group_scores
+                    }
+                if not scores:
+                    return []
+
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+
+
+class InvertedIndexBackend(SearchBackend):
+    """Search served from the process-wide InvertedIndex, built on first use"""
+    name = 'inverted'
+
+    def search(self, query, offset=0, limit=20, category_id=None):
+        product_index.ensure_built()
+        ranked = product_index.score(query, category_id)
+        return SearchResults(
+            ids=[product_id for product_id, _ in ranked[offset:offset + limit]],
+            total=len(ranked),
+        )
+
+
+product_index = InvertedIndex()
+
+
+# The index is shared by every request in the process, so it only takes
+# committed writes; a rolled-back save never becomes searchable
+
+@receiver(post_save, sender=Product)
+def index_saved_product(sender, instance, **kwargs):
+    row = (
+        instance.pk, instance.title, instance.description_text,
+        instance.category_id, instance.is_active
+    )
+    transaction.on_commit(lambda: product_index.update(*row))
+
+
+@receiver(post_delete, sender=Product)
+def unindex_deleted_product(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: product_index.remove(pk))
+
+
+@receiver(products_bulk_changed)
+def index_bulk_changed_products(sender, product_ids=(), pks=(), **kwargs):
+    def update():
+        if not product_index.built:
+            return
+        rows = changed_products(product_ids, pks).values_list(
+            'id', 'title', 'description_text', 'category_id', 'is_active'
+        )
+        for row in rows:
+            product_index.update(*row)
+
+    transaction.on_commit(update)
@@ -1,5 +1,13 @@
 from .category_serializer import CategorySerializer
 from .product_serializer import ProductListSerializer, ProductDetailSerializer
+from .compiled import CompiledSerializer, ProductListFastSerializer, CategoryFastSerializer
 
-__all__ = ['CategorySerializer', 'ProductListSerializer', 'ProductDetailSerializer']
+__all__ = [
+    'CategorySerializer',
+    'ProductListSerializer',
+    'ProductDetailSerializer',
+    'CompiledSerializer',
+    'ProductListFastSerializer',
+    'CategoryFastSerializer',
+]
 
@@ -0,0 +1,138 @@
+import decimal
+from operator import itemgetter
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from api.metrics import serializer_timer
+from .category_serializer import CategorySerializer
+from .product_serializer import ProductListSerializer
+
+
+# Fields whose DB values already are their JSON representation
+PASSTHROUGH_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.ChoiceField,
+    serializers.JSONField,
+    serializers.ReadOnlyField,
+)
+
+
+class CompiledSerializer:
+    """
+    Fast read-only serializer for hot list endpoints.
+
+    The field plan is compiled once from a DRF serializer class: each output
+    key gets a getter over a `values()` row, so serializing skips DRF's
+    per-field get_attribute/to_representation dispatch while producing the
+    same dicts. Nested serializers are flattened onto `<source>__<field>`
+    columns; SerializerMethodFields must be given in `computed` as
+    `{name: (columns needed, function of the row)}`.
+    """
+
+    def __init__(self, serializer_class, computed=None):
+        self.serializer_class = serializer_class
+        self.value_fields = []
+        self._plan = self._compile(serializer_class(), '', computed or {})
+
+    def _compile(self, serializer, prefix, computed):
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            key = prefix + field.source.replace('.', '__')
+
+            if name in computed:
+                columns, function = computed[name]
+                self._add_value_fields(prefix + column for column in columns)
+                plan.append((name, function))
+            elif isinstance(field, serializers.SerializerMethodField):
+                raise ImproperlyConfigured(
+                    f'{type(serializer).__name__}.{name} is a SerializerMethodField; '
+                    f'pass it to CompiledSerializer in `computed`.'
+                )
+            elif isinstance(field, serializers.BaseSerializer):
+                nested_plan = self._compile(field, key + '__', {})
+                self._add_value_fields([key + '__id'])
+                plan.append((name, self._nested_getter(key + '__id', nested_plan)))
+            elif isinstance(field, PASSTHROUGH_FIELDS):
+                self._add_value_fields([key])
+                plan.append((name, itemgetter(key)))
+            elif isinstance(field, serializers.DecimalField) and self._is_plain_decimal(field):
+                self._add_value_fields([key])
+                plan.append((name, self._decimal_getter(key, field)))
+            else:
+                self._add_value_fields([key])
+                plan.append((name, self._converting_getter(key, field.to_representation)))
+        return plan
+
+    def _add_value_fields(self, columns):
+        for column in columns:
+            if column not in self.value_fields:
+                self.value_fields.append(column)
+
+    @staticmethod
+    def _is_plain_decimal(field):
+        coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+        return coerce_to_string and not field.localize and field.decimal_places is not None
+
+    @staticmethod
+    def _decimal_getter(key, field):
+        # DecimalField.to_representation with its quantize context built once
+        exponent = decimal.Decimal('.1') ** field.decimal_places
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+        rounding = field.rounding
+
+        def getter(row):
+            value = row[key]
+            if value is None:
+                return None
+            if not isinstance(value, decimal.Decimal):
+                value = decimal.Decimal(str(value).strip())
+            return '{:f}'.format(value.quantize(exponent, rounding=rounding, context=context))
+        return getter
+
+    @staticmethod
+    def _converting_getter(key, to_representation):
+        # DRF skips to_representation for None, and so do we
+        def getter(row):
+            value = row[key]
+            return None if value is None else to_representation(value)
+        return getter
+
+    @staticmethod
+    def _nested_getter(pk_key, plan):
+        def getter(row):
+            if row[pk_key] is None:
+                return None
+            return {name: field_getter(row) for name, field_getter in plan}
+        return getter
+
+    def to_representation(self, row):
+        return {name: getter(row) for name, getter in self._plan}
+
+    def serialize(self, rows):
+        """Serialize an iterable of `values(*self.value_fields)` rows"""
+        plan = self._plan
+        # Evaluate querysets first so their SQL is not counted as serializer time
+        rows = list(rows)
+        with serializer_timer():
+            return [{name: getter(row) for name, getter in plan} for row in rows]
+
+
+def _main_image(row):
+    # Mirrors Product.main_image on a list row (first_image is projected by
+    # ProductService.list_queryset)
+    return row['image_url'] or row['first_image']
+
+
+ProductListFastSerializer = CompiledSerializer(
+    ProductListSerializer,
+    computed={'main_image': (('image_url', 'first_image'), _main_image)},
+)
+
+CategoryFastSerializer = CompiledSerializer(CategorySerializer)
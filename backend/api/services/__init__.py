@@ -1,5 +1,9 @@
 from .category_service import CategoryService
 from .product_service import ProductService
+from .catalog_writer import CatalogWriter, FlushStats
+from .count_cache import CategoryProductCounts, ProductCountCache
 
-__all__ = ['CategoryService', 'ProductService']
-
+__all__ = [
+    'CategoryService', 'ProductService', 'CatalogWriter', 'FlushStats',
+    'CategoryProductCounts', 'ProductCountCache',
+]
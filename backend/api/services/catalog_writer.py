@@ -0,0 +1,257 @@
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+from django.db import connection, transaction
+from django.utils import timezone
+from api.models import Product
+from api.services.count_cache import CategoryProductCounts
+from api.signals import products_bulk_changed
+
+
+@dataclass
+class FlushStats:
+    """Row counts for a single writer flush"""
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def __add__(self, other):
+        return FlushStats(
+            self.inserted + other.inserted,
+            self.updated + other.updated,
+            self.unchanged + other.unchanged,
+        )
+
+    def __str__(self):
+        return f"{self.inserted} inserted, {self.updated} updated, {self.unchanged} unchanged"
+
+
+class CatalogWriter:
+    """
+    Buffered bulk-upsert writer for scraped products.
+
+    Rows are plain dicts of Product field values (with `category_id`).
+    They are collected until `flush()` is called or `batch_size` rows are
+    buffered, then written with one `bulk_create(update_conflicts=True)`
+    inside a single transaction. Rows identical to what is already stored
+    are skipped entirely; `refresh_validators()` buffers validator-only
+    updates for rows whose content did not change.
+    """
+
+    # Fields compared against the stored row and rewritten on conflict
+    UPSERT_FIELDS = [
+        'title',
+        'category_id',
+        'url',
+        'image_url',
+        'price',
+        'price_display',
+        'availability',
+        'variant_id',
+        'description_text',
+        'images',
+        'specifications',
+        'is_active',
+        'source_etag',
+        'source_last_modified',
+        'content_hash',
+    ]
+    # Only the scraper knows these; rows that leave them out (import_catalog,
+    # the nested JSON) keep the stored values instead of resetting them
+    VALIDATOR_FIELDS = ('source_etag', 'source_last_modified', 'content_hash')
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+        self.totals = FlushStats()
+        self._buffer = {}
+        self._fallback = {}
+        self._validators = {}
+
+    def __len__(self):
+        return len(self._buffer) + len(self._fallback) + len(self._validators)
+
+    def add(self, fields):
+        """
+        Buffer one product row; flushes automatically when the batch is full.
+        Returns the FlushStats of that automatic flush, or None.
+        """
+        product_id = fields.get('product_id')
+        if product_id:
+            self._buffer[product_id] = fields
+        else:
+            # No external ID: match by title and category, as the scraper always has
+            self._fallback[(fields['title'], fields['category_id'])] = fields
+
+        if len(self) >= self.batch_size:
+            return self.flush()
+        return None
+
+    def refresh_validators(self, pk, validators):
+        """
+        Buffer new source validators for a stored product whose content is
+        unchanged (a 200 with the same content hash but a rotated ETag or
+        Last-Modified). Only the validator columns are written and the row
+        counts as unchanged. Returns the FlushStats of an automatic flush,
+        or None.
+        """
+        self._validators[pk] = validators
+        if len(self) >= self.batch_size:
+            return self.flush()
+        return None
+
+    def flush(self):
+        """Write all buffered rows in one transaction and return the FlushStats"""
+        stats = FlushStats()
+        if not len(self):
+            return stats
+
+        changed = {'product_ids': [], 'pks': [], 'count_deltas': Counter()}
+        try:
+            with transaction.atomic():
+                stats += self._flush_by_product_id(list(self._buffer.values()), changed)
+                stats += self._flush_fallback(list(self._fallback.values()), changed)
+                stats += self._flush_validators(self._validators)
+                CategoryProductCounts.apply_deltas(changed['count_deltas'])
+        finally:
+            # A failed batch is dropped rather than retried on every later flush
+            self._buffer.clear()
+            self._fallback.clear()
+            self._validators.clear()
+        self.totals += stats
+
+        # bulk_create/bulk_update bypass post_save; tell listeners what changed
+        if changed['product_ids'] or changed['pks']:
+            products_bulk_changed.send(
+                sender=Product,
+                product_ids=changed['product_ids'],
+                pks=changed['pks'],
+                count_deltas=dict(changed['count_deltas']),
+            )
+        return stats
+
+    @staticmethod
+    def _track_count_delta(deltas, stored, fields):
+        """Record how a row moves the per-category active product counts"""
+        if stored and stored['is_active']:
+            deltas[stored['category_id']] -= 1
+        if fields.get('is_active'):
+            deltas[fields['category_id']] += 1
+
+    @classmethod
+    def _update_fields(cls, fields):
+        """The UPSERT_FIELDS a row sets: all but the validators it does not carry"""
+        return tuple(
+            name for name in cls.UPSERT_FIELDS
+            if name in fields or name not in cls.VALIDATOR_FIELDS
+        )
+
+    @classmethod
+    def _is_unchanged(cls, existing, fields):
+        return all(existing[name] == fields.get(name) for name in cls._update_fields(fields))
+
+    def _flush_by_product_id(self, rows, changed):
+        stats = FlushStats()
+        if not rows:
+            return stats
+
+        existing = {
+            row['product_id']: row
+            for row in Product.objects.filter(
+                product_id__in=[fields['product_id'] for fields in rows]
+            ).values('product_id', *self.UPSERT_FIELDS)
+        }
+
+        # Rows grouped by the fields they set, one upsert per group
+        pending = defaultdict(list)
+        for fields in rows:
+            stored = existing.get(fields['product_id'])
+            if stored is None:
+                stats.inserted += 1
+            elif self._is_unchanged(stored, fields):
+                stats.unchanged += 1
+                continue
+            else:
+                stats.updated += 1
+            self._track_count_delta(changed['count_deltas'], stored, fields)
+            pending[self._update_fields(fields)].append(Product(**fields))
+            changed['product_ids'].append(fields['product_id'])
+
+        # MySQL upserts on any unique key and rejects an explicit conflict target
+        unique_fields = (
+            ['product_id']
+            if connection.features.supports_update_conflicts_with_target
+            else None
+        )
+        for update_fields, products in pending.items():
+            Product.objects.bulk_create(
+                products,
+                batch_size=self.batch_size,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=[*update_fields, 'updated_at'],
+            )
+        return stats
+
+    def _flush_fallback(self, rows, changed):
+        stats = FlushStats()
+        if not rows:
+            return stats
+
+        existing = {}
+        for product in Product.objects.filter(
+            title__in=[fields['title'] for fields in rows],
+            category_id__in={fields['category_id'] for fields in rows},
+        ):
+            existing[(product.title, product.category_id)] = product
+
+        now = timezone.now()
+        to_create = []
+        to_update = defaultdict(list)
+        for fields in rows:
+            product = existing.get((fields['title'], fields['category_id']))
+            if product is None:
+                stats.inserted += 1
+                self._track_count_delta(changed['count_deltas'], None, fields)
+                to_create.append(Product(**fields))
+                continue
+            update_fields = self._update_fields(fields)
+            if all(getattr(product, name) == fields.get(name) for name in update_fields):
+                stats.unchanged += 1
+                continue
+            stats.updated += 1
+            self._track_count_delta(
+                changed['count_deltas'],
+                {'category_id': product.category_id, 'is_active': product.is_active},
+                fields,
+            )
+            for name in update_fields:
+                setattr(product, name, fields.get(name))
+            # bulk_update() skips auto_now, so stamp the row ourselves
+            product.updated_at = now
+            to_update[update_fields].append(product)
+
+        if to_create:
+            Product.objects.bulk_create(to_create, batch_size=self.batch_size)
+            # Primary keys come back from bulk_create except on MySQL
+            changed['pks'].extend(product.pk for product in to_create if product.pk)
+        for update_fields, products in to_update.items():
+            changed['pks'].extend(product.pk for product in products)
+            Product.objects.bulk_update(
+                products,
+                [*update_fields, 'updated_at'],
+                batch_size=self.batch_size,
+            )
+        return stats
+
+    def _flush_validators(self, validators):
+        # The API never renders validators: no count deltas, no change signal
+        stats = FlushStats(unchanged=len(validators))
+        if not validators:
+            return stats
+        products = []
+        for product in Product.objects.filter(pk__in=validators).only('pk', *self.VALIDATOR_FIELDS):
+            for name, value in validators[product.pk].items():
+                setattr(product, name, value)
+            products.append(product)
+        Product.objects.bulk_update(products, self.VALIDATOR_FIELDS, batch_size=self.batch_size)
+        return stats
@@ -1,4 +1,4 @@
-from django.db.models import Count, Q
+from django.db.models import F
 from api.models import Category
 
 
@@ -8,21 +8,18 @@ class CategoryService:
     @staticmethod
     def get_active_categories_with_product_count():
         """
-        Get all active categories with product count using optimized query
-        Uses select_related and prefetch_related for optimization
+        Get all active categories with product count
+        Reads the stored active_product_count, so no products are joined
         """
-        return Category.objects.filter(
-            is_active=True
-        ).annotate(
-            product_count=Count('products', filter=Q(products__is_active=True))
+        return Category.active.annotate(
+            product_count=F('active_product_count')
         ).order_by('name')
     
     @staticmethod
     def get_category_by_id(category_id):
         """Get category by ID with optimized query"""
-        return Category.objects.filter(
-            id=category_id,
-            is_active=True
+        return Category.active.filter(
+            id=category_id
         ).first()
     
     @staticmethod
@@ -31,14 +28,12 @@ class CategoryService:
         try:
             # Try as ID first
             category_id = int(identifier)
-            return Category.objects.filter(
-                id=category_id,
-                is_active=True
+            return Category.active.filter(
+                id=category_id
             ).first()
         except (ValueError, TypeError):
             # If not a number, treat as slug/name
-            return Category.objects.filter(
-                name__iexact=identifier,
-                is_active=True
+            return Category.active.filter(
+                name__iexact=identifier
             ).first()
 
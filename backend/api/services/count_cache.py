@@ -0,0 +1,176 @@
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from api.models import Category, Product
+from api.signals import products_bulk_changed
+
+
+class ProductCountCache:
+    """
+    Cached active-product counts, globally and per category.
+
+    Counts are computed once on a miss and then kept current by delta
+    updates from the Product signal receivers and bulk write paths;
+    `reconcile()` recomputes everything to correct any drift.
+    """
+
+    KEY_PREFIX = 'product_count'
+    TOTAL_KEY = f'{KEY_PREFIX}:total'
+
+    @classmethod
+    def category_key(cls, category_id):
+        return f'{cls.KEY_PREFIX}:category:{int(category_id)}'
+
+    @classmethod
+    def get_total(cls):
+        """Total active products"""
+        count = cache.get(cls.TOTAL_KEY)
+        if count is None:
+            count = Product.active.count()
+            cache.add(cls.TOTAL_KEY, count, timeout=None)
+        return count
+
+    @classmethod
+    def get_for_category(cls, category_id):
+        """Active products in a category"""
+        key = cls.category_key(category_id)
+        count = cache.get(key)
+        if count is None:
+            count = Product.active.filter(category_id=category_id).count()
+            cache.add(key, count, timeout=None)
+        return count
+
+    @classmethod
+    def apply_deltas(cls, deltas):
+        """
+        Apply {category_id: change in active products} to the cached counts.
+        Counts not cached yet are left alone; they are computed on next read.
+        """
+        total = 0
+        for category_id, delta in deltas.items():
+            if not delta:
+                continue
+            total += delta
+            cls._incr(cls.category_key(category_id), delta)
+        if total:
+            cls._incr(cls.TOTAL_KEY, total)
+
+    @staticmethod
+    def _incr(key, delta):
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            pass
+
+    @classmethod
+    def reconcile(cls):
+        """
+        Recompute every count from the database in one grouped query.
+        Returns {key: (cached, actual)} for each count that had drifted.
+        """
+        actual = {
+            cls.category_key(row['category_id']): row['count']
+            for row in Product.active.values(
+                'category_id'
+            ).annotate(count=Count('id')).order_by()
+        }
+        actual[cls.TOTAL_KEY] = sum(actual.values())
+
+        # Categories without active products drop out of the GROUP BY
+        for category_id in Category.objects.values_list('id', flat=True):
+            actual.setdefault(cls.category_key(category_id), 0)
+
+        cached = cache.get_many(list(actual))
+        drift = {
+            key: (cached[key], count)
+            for key, count in actual.items()
+            if key in cached and cached[key] != count
+        }
+        cache.set_many(actual, timeout=None)
+        return drift
+
+
+class CategoryProductCounts:
+    """
+    Category.active_product_count, the stored active-product count per category.
+
+    Deltas are applied with `UPDATE ... SET active_product_count =
+    active_product_count + n` in the writing transaction, so a count commits
+    or rolls back together with the product rows it counts. `recompute()`
+    corrects drift from writes that bypass the write paths (queryset.update()).
+    """
+
+    @staticmethod
+    def apply_deltas(deltas):
+        """Apply {category_id: change in active products} to the stored counts"""
+        # Sorted, so concurrent writers lock category rows in the same order
+        for category_id, delta in sorted(deltas.items()):
+            if delta:
+                Category.objects.filter(pk=category_id).update(
+                    active_product_count=F('active_product_count') + delta
+                )
+
+    @staticmethod
+    def recompute():
+        """
+        Recompute every stored count with one correlated UPDATE.
+        Returns {category_id: (stored, actual)} for each count that had drifted.
+        """
+        actual = Coalesce(Subquery(
+            Product.active.filter(
+                category=OuterRef('pk')
+            ).order_by().values('category').annotate(count=Count('id')).values('count')
+        ), 0)
+        with transaction.atomic():
+            drift = {
+                row['pk']: (row['active_product_count'], row['actual'])
+                for row in Category.objects.annotate(actual=actual).exclude(
+                    active_product_count=F('actual')
+                ).values('pk', 'active_product_count', 'actual')
+            }
+            if drift:
+                Category.objects.filter(pk__in=list(drift)).update(active_product_count=actual)
+        return drift
+
+
+@receiver(pre_save, sender=Product)
+def remember_counted_state(sender, instance, **kwargs):
+    """Capture the stored (category, is_active) so post_save can compute a delta"""
+    instance._counted_state = None
+    if instance.pk and not instance._state.adding:
+        instance._counted_state = Product.objects.filter(
+            pk=instance.pk
+        ).values_list('category_id', 'is_active').first()
+
+
+@receiver(post_save, sender=Product)
+def count_saved_product(sender, instance, **kwargs):
+    deltas = Counter()
+    previous = getattr(instance, '_counted_state', None)
+    if previous and previous[1]:
+        deltas[previous[0]] -= 1
+    if instance.is_active:
+        deltas[instance.category_id] += 1
+    CategoryProductCounts.apply_deltas(deltas)
+    transaction.on_commit(lambda: ProductCountCache.apply_deltas(deltas))
+
+
+@receiver(post_delete, sender=Product)
+def count_deleted_product(sender, instance, **kwargs):
+    if instance.is_active:
+        deltas = {instance.category_id: -1}
+        CategoryProductCounts.apply_deltas(deltas)
+        transaction.on_commit(lambda: ProductCountCache.apply_deltas(deltas))
+
+
+@receiver(products_bulk_changed)
+def count_bulk_changed_products(sender, count_deltas=None, **kwargs):
+    # The bulk writers update Category.active_product_count in their own
+    # transaction; only the cache is left to adjust
+    if count_deltas:
+        transaction.on_commit(lambda: ProductCountCache.apply_deltas(count_deltas))
@@ -0,0 +1,135 @@
+import csv
+import json
+import zlib
+
+from django.db.models import Q
+from api.models import Product
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def _dumps(value):
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class _LineBuffer:
+    """File-like object whose write() just returns the line, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+class ProductExportService:
+    """
+    Streams the active catalog as NDJSON or CSV with bounded memory.
+
+    Rows are read in fixed-size keyset chunks ordered by (updated_at, id),
+    so every chunk is one indexed range query with no OFFSET and no
+    long-lived cursor or transaction, and `updated_since` syncs read only
+    the changed tail. A product updated while an export is running moves
+    behind the scan position and may be emitted twice; consumers should
+    keep the last copy of each id.
+    """
+
+    CHUNK_SIZE = 1000
+
+    FIELDS = (
+        'id',
+        'product_id',
+        'title',
+        'category_id',
+        'category__name',
+        'url',
+        'image_url',
+        'images',
+        'price',
+        'price_display',
+        'availability',
+        'variant_id',
+        'description_text',
+        'specifications',
+        'created_at',
+        'updated_at',
+    )
+
+    # Output column names; category__name is exported as category_name
+    COLUMNS = tuple(field.replace('__', '_') for field in FIELDS)
+
+    FORMATS = {
+        'ndjson': ('application/x-ndjson; charset=utf-8', 'ndjson'),
+        'csv': ('text/csv; charset=utf-8', 'csv'),
+    }
+
+    @classmethod
+    def iter_chunks(cls, updated_since=None, chunk_size=None):
+        """Yield lists of export rows (values() dicts), chunk_size at a time"""
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        queryset = Product.active.order_by('updated_at', 'id')
+        if updated_since is not None:
+            queryset = queryset.filter(updated_at__gte=updated_since)
+
+        position = None
+        while True:
+            chunk = queryset
+            if position is not None:
+                updated_at, pk = position
+                chunk = chunk.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk))
+            rows = list(chunk.values(*cls.FIELDS)[:chunk_size])
+            if not rows:
+                return
+            yield rows
+            if len(rows) < chunk_size:
+                return
+            position = rows[-1]['updated_at'], rows[-1]['id']
+
+    @classmethod
+    def stream(cls, export_format, updated_since=None, chunk_size=None):
+        """Yield the encoded export one chunk of rows at a time"""
+        encode = cls._encode_csv if export_format == 'csv' else cls._encode_ndjson
+        if export_format == 'csv':
+            yield csv.writer(_LineBuffer()).writerow(cls.COLUMNS).encode('utf-8')
+        for rows in cls.iter_chunks(updated_since, chunk_size):
+            yield encode(rows)
+
+    @staticmethod
+    def gzip(chunks):
+        """Gzip a stream of encoded chunks incrementally"""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    @staticmethod
+    def _prepare(row):
+        # Same text for both formats: decimal strings, full-precision ISO 8601
+        if row['price'] is not None:
+            row['price'] = str(row['price'])
+        row['created_at'] = row['created_at'].isoformat()
+        row['updated_at'] = row['updated_at'].isoformat()
+        return row
+
+    @classmethod
+    def _encode_ndjson(cls, rows):
+        lines = [
+            _dumps(dict(zip(cls.COLUMNS, cls._prepare(row).values())))
+            for row in rows
+        ]
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+    @classmethod
+    def _encode_csv(cls, rows):
+        writer = csv.writer(_LineBuffer())
+        lines = []
+        for row in rows:
+            row = cls._prepare(row)
+            row['images'] = _dumps(row['images'])
+            row['specifications'] = _dumps(row['specifications'])
+            lines.append(writer.writerow(row.values()))
+        return ''.join(lines).encode('utf-8')
@@ -1,25 +1,68 @@
 from django.db.models import Q, Prefetch
+from django.db.models.fields.json import KT
 from api.models import Product, Category
+from api.pagination import paginate_by_cursor
+from api.filters import DEFAULT_SORT, SORT_ORDERINGS
+from api.search import get_search_backend
 
 
 class ProductService:
     """Service layer for Product operations with optimized queries"""
     
-    @staticmethod
-    def get_products_by_category(category_id, page=1, page_size=20):
+    # Columns loaded by list queries: what ProductListSerializer renders plus
+    # created_at for keyset cursors. The heavy description_text, images and
+    # specifications columns stay unloaded; main_image comes from a projected
+    # first image instead of the whole images array.
+    LIST_FIELDS = (
+        'id',
+        'title',
+        'category__id',
+        'category__name',
+        'category__image_url',
+        'price',
+        'price_display',
+        'image_url',
+        'availability',
+        'url',
+        'is_active',
+        'created_at',
+    )
+    
+    @classmethod
+    def list_queryset(cls, fields=None):
+        """
+        Base queryset for product list pages, projected to LIST_FIELDS
+        Not filtered on is_active; callers chain .active()
+        With `fields` it yields values() rows of just those columns instead
+        (for the compiled serializers)
+        """
+        queryset = Product.objects.select_related(
+            'category'
+        ).only(
+            *cls.LIST_FIELDS
+        ).annotate(
+            first_image=KT('images__0')
+        )
+        if fields:
+            queryset = queryset.values(*fields)
+        return queryset
+    
+    @classmethod
+    def get_products_by_category(cls, category_id, page=1, page_size=20, fields=None,
+                                 filters=None, sort=DEFAULT_SORT):
         """
         Get products by category with optimized query
         Uses select_related for category to avoid N+1 queries
         """
         offset = (page - 1) * page_size
         
-        return Product.objects.filter(
-            category_id=category_id,
-            is_active=True
-        ).select_related(
-            'category'
-        ).order_by(
-            '-created_at'
+        queryset = cls.list_queryset(fields).active().filter(
+            category_id=category_id
+        )
+        if filters:
+            queryset = filters.apply(queryset)
+        return queryset.order_by(
+            *SORT_ORDERINGS[sort]
         )[offset:offset + page_size]
     
     @staticmethod
@@ -28,54 +71,87 @@ class ProductService:
         Get product by ID with optimized query
         Uses select_related for category
         """
-        return Product.objects.filter(
-            id=product_id,
-            is_active=True
+        return Product.active.filter(
+            id=product_id
         ).select_related(
             'category'
         ).first()
     
     @staticmethod
-    def get_all_active_products(page=1, page_size=20):
+    def get_products_by_ids(product_ids):
+        """
+        Get active products by ID in one query
+        Returns {id: product} for the ids that exist
+        """
+        return Product.active.select_related(
+            'category'
+        ).in_bulk(product_ids)
+    
+    @classmethod
+    def get_all_active_products(cls, page=1, page_size=20, fields=None,
+                                filters=None, sort=DEFAULT_SORT):
         """
         Get all active products with optimized query
         """
         offset = (page - 1) * page_size
         
-        return Product.objects.filter(
-            is_active=True
-        ).select_related(
-            'category'
-        ).order_by(
-            '-created_at'
+        queryset = cls.list_queryset(fields).active()
+        if filters:
+            queryset = filters.apply(queryset)
+        return queryset.order_by(
+            *SORT_ORDERINGS[sort]
         )[offset:offset + page_size]
     
     @staticmethod
-    def get_total_product_count():
+    def get_total_product_count(filters=None):
         """Get total count of active products"""
-        return Product.objects.filter(is_active=True).count()
+        queryset = Product.active.all()
+        if filters:
+            queryset = filters.apply(queryset)
+        return queryset.count()
     
-    @staticmethod
-    def search_products(query, page=1, page_size=20):
+    @classmethod
+    def search_products(cls, query, page=1, page_size=20, category_id=None, fields=None):
         """
-        Search products by title with optimized query
+        Search active products through the configured search backend
+        Returns (products ranked by relevance, total match count)
         """
         offset = (page - 1) * page_size
+        results = get_search_backend().search(
+            query, offset=offset, limit=page_size, category_id=category_id
+        )
         
-        return Product.objects.filter(
-            Q(title__icontains=query) | Q(description_text__icontains=query),
-            is_active=True
-        ).select_related(
-            'category'
-        ).order_by(
-            '-created_at'
-        )[offset:offset + page_size]
+        if fields:
+            rows = cls.list_queryset(fields).filter(id__in=results.ids)
+            products = {row['id']: row for row in rows}
+        else:
+            products = cls.list_queryset().in_bulk(results.ids)
+        return [products[pk] for pk in results.ids if pk in products], results.total
     
     @staticmethod
-    def get_product_count_by_category(category_id):
+    def get_product_count_by_category(category_id, filters=None):
         """Get product count for a category"""
-        return Product.objects.filter(
-            category_id=category_id,
-            is_active=True
-        ).count()
-
+        queryset = Product.active.filter(
+            category_id=category_id
+        )
+        if filters:
+            queryset = filters.apply(queryset)
+        return queryset.count()
+    
+    @classmethod
+    def get_products_page_by_cursor(cls, cursor=None, page_size=20, category_id=None, fields=None,
+                                    filters=None):
+        """
+        Get a keyset-paginated page of active products, optionally by category
+        Seeks on the (created_at, id) index instead of scanning past an OFFSET
+        """
+        if fields:
+            # Cursors are built from each row's (created_at, id)
+            fields = list(fields) + [f for f in ('id', 'created_at') if f not in fields]
+        queryset = cls.list_queryset(fields).active()
+        if category_id:
+            queryset = queryset.filter(category_id=category_id)
+        if filters:
+            queryset = filters.apply(queryset)
+        
+        return paginate_by_cursor(queryset, cursor, page_size)
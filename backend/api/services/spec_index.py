@@ -0,0 +1,197 @@
+from collections import defaultdict
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Count, Min
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from api.catalog_normalizer import normalize_spec_text, spec_entries
+from api.models import Product, ProductSpec
+from api.signals import changed_products, products_bulk_changed
+
+
+class SpecIndex:
+    """
+    Normalized key/value index of active products' specifications
+    (ProductSpec rows).
+
+    Rows are rewritten for every saved or bulk-written product, so spec
+    filters and facet counts are plain indexed lookups instead of decoding
+    the specifications JSON of every product. `rebuild()` regenerates the
+    whole index, e.g. after rows were changed with queryset.update().
+    """
+
+    BATCH_SIZE = 1000
+    DEFAULT_FACET_LIMIT = 10
+    DEFAULT_VALUE_LIMIT = 20
+
+    # Product fields the index is derived from
+    SOURCE_FIELDS = ('id', 'category_id', 'is_active', 'specifications')
+
+    @classmethod
+    def sync(cls, rows):
+        """
+        Replace the index rows of products given as
+        (id, category_id, is_active, specifications) tuples
+        (inactive products just lose theirs).
+        Returns the number of index rows written.
+        """
+        written = 0
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, cls.BATCH_SIZE))
+            if not batch:
+                return written
+            entries = [
+                ProductSpec(
+                    product_id=pk,
+                    category_id=category_id,
+                    key=key,
+                    value=value,
+                    key_label=key_label,
+                    value_label=value_label,
+                )
+                for pk, category_id, is_active, specifications in batch if is_active
+                for key, value, key_label, value_label in spec_entries(specifications)
+            ]
+            with transaction.atomic():
+                ProductSpec.objects.filter(product_id__in=[row[0] for row in batch]).delete()
+                ProductSpec.objects.bulk_create(entries, batch_size=cls.BATCH_SIZE)
+            written += len(entries)
+
+    @classmethod
+    def rebuild(cls):
+        """Regenerate the index for every product; returns (products, index rows)"""
+        ProductSpec.objects.all().delete()
+        products = Product.objects.order_by('id').values_list(*cls.SOURCE_FIELDS)
+        count = written = 0
+        last_pk = 0
+        while True:
+            # Keyset batches rather than a cursor held open while writing
+            batch = list(products.filter(id__gt=last_pk)[:cls.BATCH_SIZE])
+            if not batch:
+                return count, written
+            written += cls.sync(batch)
+            count += len(batch)
+            last_pk = batch[-1][0]
+
+    @staticmethod
+    def parse_filters(values):
+        """
+        Parse `spec` query parameters ('key:value') into {key: {values}}.
+        Raises ValueError for a malformed filter.
+        """
+        filters = defaultdict(set)
+        for raw in values:
+            key, separator, value = raw.partition(':')
+            key, value = normalize_spec_text(key), normalize_spec_text(value)
+            if not separator or not key or not value:
+                raise ValueError(f"spec filter '{raw}' must look like key:value")
+            filters[key].add(value)
+        return dict(filters)
+
+    @staticmethod
+    def filter_products(queryset, spec_filters):
+        """
+        Narrow a Product queryset to products matching every filtered key,
+        any of the values given for the same key
+        """
+        for key, values in spec_filters.items():
+            queryset = queryset.filter(id__in=ProductSpec.objects.filter(
+                key=key, value__in=values
+            ).values('product_id'))
+        return queryset
+
+    @classmethod
+    def facet_counts(cls, category_id, spec_filters=None, keys=None,
+                     limit=DEFAULT_FACET_LIMIT, value_limit=DEFAULT_VALUE_LIMIT):
+        """
+        Value counts per specification key for a category's active products
+        (those matching `spec_filters`, if given). A filtered key is counted
+        without its own filter, so its other values stay selectable next to
+        the chosen ones. Without `keys`, the `limit` keys present on the most
+        products are returned, most common first.
+        """
+        spec_filters = spec_filters or {}
+        entries = cls._entries(category_id, spec_filters)
+
+        if keys is None:
+            keys = list(entries.values('key').annotate(
+                products=Count('id')
+            ).order_by('-products', 'key').values_list('key', flat=True)[:limit])
+        else:
+            keys = [normalize_spec_text(key) for key in keys]
+        if not keys:
+            return []
+
+        # Counts come from the covering (category, key, value) index alone;
+        # labels are then read from one sample row per value returned
+        facets = {key: None for key in keys}
+        rows = list(cls._value_counts(entries, [key for key in keys if key not in spec_filters]))
+        for key in keys:
+            if key in spec_filters:
+                others = {other: values for other, values in spec_filters.items() if other != key}
+                rows.extend(cls._value_counts(cls._entries(category_id, others), [key]))
+        for row in rows:
+            facet = facets[row['key']]
+            if facet is None:
+                facet = facets[row['key']] = {'key': row['key'], 'products': 0, 'values': []}
+            facet['products'] += row['count']
+            if len(facet['values']) < value_limit:
+                facet['values'].append(row)
+
+        samples = [row['sample_id'] for facet in facets.values() if facet for row in facet['values']]
+        labels = {
+            pk: (key_label, value_label)
+            for pk, key_label, value_label in ProductSpec.objects.filter(
+                id__in=samples
+            ).values_list('id', 'key_label', 'value_label')
+        }
+        return [
+            {
+                'key': facet['key'],
+                'label': labels[facet['values'][0]['sample_id']][0],
+                'products': facet['products'],
+                'values': [
+                    {'value': row['value'], 'label': labels[row['sample_id']][1], 'count': row['count']}
+                    for row in facet['values']
+                ],
+            }
+            for facet in facets.values() if facet is not None
+        ]
+
+    @classmethod
+    def _entries(cls, category_id, spec_filters):
+        """Index rows of a category's active products matching `spec_filters`"""
+        entries = ProductSpec.objects.filter(category_id=category_id)
+        if spec_filters:
+            matching = cls.filter_products(
+                Product.active.filter(category_id=category_id),
+                spec_filters
+            )
+            entries = entries.filter(product_id__in=matching.values('id'))
+        return entries
+
+    @staticmethod
+    def _value_counts(entries, keys):
+        """(key, value, count, sample_id) rows of `keys`, most common values first"""
+        if not keys:
+            return []
+        return entries.filter(key__in=keys).values('key', 'value').annotate(
+            count=Count('id'),
+            sample_id=Min('id'),
+        ).order_by('key', '-count', 'value')
+
+@receiver(post_save, sender=Product)
+def index_saved_product_specs(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not {'specifications', 'category', 'is_active'} & set(update_fields):
+        return
+    SpecIndex.sync([
+        (instance.pk, instance.category_id, instance.is_active, instance.specifications)
+    ])
+
+
+@receiver(products_bulk_changed)
+def index_bulk_changed_product_specs(sender, product_ids=(), pks=(), **kwargs):
+    rows = changed_products(product_ids, pks).values_list(*SpecIndex.SOURCE_FIELDS)
+    SpecIndex.sync(list(rows))
@@ -0,0 +1,15 @@
+from django.db.models import Q
+from django.dispatch import Signal
+
+
+# Sent by bulk write paths, which bypass post_save, after products were
+# inserted or updated. Receivers get `product_ids` (external IDs), `pks`, and
+# `count_deltas` ({category_id: change in active product count}), which the
+# sender has already applied to Category.active_product_count.
+products_bulk_changed = Signal()
+
+
+def changed_products(product_ids=(), pks=()):
+    """Queryset of the products named by a products_bulk_changed signal"""
+    from api.models import Product
+    return Product.objects.filter(Q(product_id__in=list(product_ids)) | Q(pk__in=list(pks)))
@@ -0,0 +1,116 @@
+import random
+from decimal import Decimal
+
+from api.models import Category, Product
+
+
+# Every synthetic row points at this host, so generated catalogs can be told
+# apart from scraped ones and removed without touching real data
+SYNTHETIC_HOST = 'https://synthetic.invalid'
+
+MATERIALS = [
+    ('Cement', ['UltraTech', 'ACC', 'Ambuja', 'Dalmia', 'Ramco'], ['OPC 53 Grade', 'PPC', 'PSC', 'White Cement']),
+    ('Steel', ['TATA Tiscon', 'JSW Neosteel', 'SAIL', 'Kamdhenu'], ['TMT Bar', 'Binding Wire', 'MS Angle', 'Ring']),
+    ('Paints', ['Asian Paints', 'Berger', 'Nerolac', 'Dulux'], ['Emulsion', 'Enamel', 'Primer', 'Putty']),
+    ('Plumbing', ['Ashirvad', 'Astral', 'Supreme', 'Finolex'], ['CPVC Pipe', 'Elbow', 'Coupler', 'Ball Valve']),
+    ('Electrical', ['Havells', 'Polycab', 'Anchor', 'Legrand'], ['Wire', 'Switch', 'MCB', 'Conduit Pipe']),
+    ('Hardware', ['Ebco', 'Hettich', 'Godrej', 'Dorset'], ['Drawer Channel', 'Hinge', 'Door Lock', 'Handle']),
+    ('Adhesives', ['Fevicol', 'Pidilite', 'Araldite', 'MYK Laticrete'], ['Wood Adhesive', 'Tile Adhesive', 'Epoxy', 'Sealant']),
+    ('Tiles', ['Kajaria', 'Somany', 'Johnson', 'Nitco'], ['Floor Tile', 'Wall Tile', 'Vitrified Tile', 'Grout']),
+]
+
+SPEC_VALUES = {
+    'Material': ['Zinc', 'Stainless Steel', 'Chlorinated Polyvinyl Chloride', 'Copper', 'Aluminium'],
+    'Finish': ['Matte', 'Glossy', 'Satin', 'Brushed', 'Powder Coated'],
+    'Usage': ['Interior', 'Exterior', 'Hot & Cold Water plumbing', 'Residential', 'Commercial'],
+    'Standard': ['IS 17546', 'IS 1786', 'IS 269', 'IS 694', 'ISO 9001'],
+    'Warranty': ['1 Year', '2 Years', '5 Years', '10 Years'],
+    'Colour': ['Base White', 'Grey', 'Black', 'Ivory', 'Silver'],
+}
+
+SIZES = ['15mm', '20mm', '25mm', '1L', '4L', '10L', '20L', '50kg', '8mm', '12mm', '200mm', '450mm']
+
+
+class SyntheticCatalog:
+    """
+    Seeded generator of realistic catalog rows for benchmarks.
+
+    Titles, prices, images and specifications follow the shape of the
+    scraped home-run.co data, and the same seed always yields the same
+    catalog. Products are produced lazily so very large catalogs can be
+    written in batches without holding them in memory.
+    """
+
+    def __init__(self, seed=42):
+        self.seed = seed
+
+    def category_fields(self, count):
+        """Field dicts for `count` categories"""
+        fields = []
+        for index in range(count):
+            group, _, kinds = MATERIALS[index % len(MATERIALS)]
+            kind = kinds[(index // len(MATERIALS)) % len(kinds)]
+            slug = f'{group}-{kind}-{index}'.lower().replace(' ', '-')
+            fields.append({
+                'name': f'{group} {kind} {index + 1}',
+                'url': f'{SYNTHETIC_HOST}/collections/{slug}',
+                'image_url': f'{SYNTHETIC_HOST}/cdn/collections/{slug}.webp',
+            })
+        return fields
+
+    def product_fields(self, count, category_ids):
+        """Yield field dicts for `count` products spread over category_ids"""
+        rng = random.Random(self.seed)
+        for index in range(count):
+            group, brands, kinds = MATERIALS[rng.randrange(len(MATERIALS))]
+            brand = rng.choice(brands)
+            kind = rng.choice(kinds)
+            size = rng.choice(SIZES)
+            title = f'{brand} {kind} {size} {group} #{index}'
+            slug = title.lower().replace(' ', '-').replace('#', '')
+            price = Decimal(rng.randint(500, 2_500_000)) / 100
+
+            specifications = {'Manufacturer': brand, 'Size': size}
+            for key in rng.sample(sorted(SPEC_VALUES), rng.randint(2, len(SPEC_VALUES))):
+                specifications[key] = rng.choice(SPEC_VALUES[key])
+
+            images = [
+                f'{SYNTHETIC_HOST}/cdn/files/{slug}-{image}.webp?width=1946'
+                for image in range(rng.randint(1, 5))
+            ]
+            highlights = '\n'.join(f'{key}:\n{value}' for key, value in specifications.items())
+
+            yield {
+                'title': title,
+                'category_id': category_ids[index % len(category_ids)],
+                'url': f'{SYNTHETIC_HOST}/products/{slug}',
+                'image_url': images[0].replace('width=1946', 'width=533'),
+                'price': price,
+                'price_display': f'From Rs. {price:.2f}',
+                'availability': rng.choices(
+                    ['in_stock', 'out_of_stock', 'limited'], weights=[85, 10, 5]
+                )[0],
+                'product_id': f'synthetic-{self.seed}-{index}',
+                'variant_id': str(40_000_000_000_000 + index),
+                'description_text': (
+                    f'Product Highlights\n{highlights}\nProduct Description\n'
+                    f'{brand} {kind} for {specifications.get("Usage", "general").lower()} use, '
+                    f'supplied in {size} packs.'
+                ),
+                'images': images,
+                'specifications': specifications,
+                'is_active': rng.random() >= 0.03,
+            }
+
+    @staticmethod
+    def clear(batch_size=5000):
+        """Delete every synthetic category and product; returns the row count"""
+        deleted = 0
+        products = Product.objects.filter(category__url__startswith=SYNTHETIC_HOST)
+        # Chunked, so the delete collector never loads a huge catalog at once
+        while True:
+            pks = list(products.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            deleted += Product.objects.filter(pk__in=pks).delete()[0]
+        return deleted + Category.objects.filter(url__startswith=SYNTHETIC_HOST).delete()[0]
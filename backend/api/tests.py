@@ -0,0 +1,697 @@
+import base64
+import datetime
+import re
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Category, Product
+from api.pagination import encode_cursor
+from api.query_plans import ACTIVE_INDEXES, listing_plans
+from api.renderers import FastJSONRenderer
+from api.search import FullTextBackend, IContainsBackend, InvertedIndexBackend, product_index
+from api.services.catalog_writer import CatalogWriter
+from api.services.count_cache import CategoryProductCounts, ProductCountCache
+from api.services.product_service import ProductService
+from api.services.spec_index import SpecIndex
+from api.synthetic import SyntheticCatalog
+
+
+# Columns that must never be loaded by product list queries
+HEAVY_PRODUCT_FIELDS = ('description_text', 'images', 'specifications')
+
+
+def selected_columns(sql):
+    """
+    Columns selected whole by a query (not those only passed to an
+    expression, such as the first_image JSON extraction)
+    """
+    select_list = sql.split(' FROM ', 1)[0]
+    return {
+        match.group(1)
+        for match in re.finditer(r'(?:SELECT |, )(\S+?)(?=,| AS |$)', select_list)
+    }
+
+
+class ListQueryProjectionTests(TestCase):
+    """Product list queries load only the columns the list serializers render"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Cement')
+        for i in range(3):
+            Product.objects.create(
+                title=f'Cement bag {i}',
+                category=cls.category,
+                price=Decimal('330.00') + i,
+                product_id=f'cement-{i}',
+                description_text='Portland pozzolana cement ' * 200,
+                images=[f'https://example.com/cement-{i}-{n}.jpg' for n in range(10)],
+                specifications={'Manufacturer': 'UltraTech', 'Weight': '50 kg'},
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def assertNoHeavyColumns(self, queries):
+        product_columns = [
+            f'{connection.ops.quote_name(Product._meta.db_table)}.{connection.ops.quote_name(field)}'
+            for field in HEAVY_PRODUCT_FIELDS
+        ]
+        selects = [query['sql'] for query in queries if Product._meta.db_table in query['sql']]
+        self.assertTrue(selects, 'no product query was captured')
+        for sql in selects:
+            for column in product_columns:
+                self.assertNotIn(column, selected_columns(sql))
+
+    def test_list_queryset(self):
+        with CaptureQueriesContext(connection) as queries:
+            products = list(ProductService.list_queryset().active())
+        self.assertEqual(len(products), 3)
+        self.assertNoHeavyColumns(queries.captured_queries)
+        self.assertIn(
+            f'{connection.ops.quote_name(Product._meta.db_table)}.{connection.ops.quote_name("title")}',
+            selected_columns(queries.captured_queries[0]['sql'])
+        )
+        # main_image comes from the projected first image, not the images column
+        self.assertEqual(products[0].main_image, products[0].first_image)
+
+    def test_list_queryset_values(self):
+        with CaptureQueriesContext(connection) as queries:
+            list(ProductService.list_queryset(['id', 'title', 'first_image']))
+        self.assertNoHeavyColumns(queries.captured_queries)
+
+    def test_listing_views(self):
+        urls = (
+            '/api/products/',
+            f'/api/products/?category_id={self.category.pk}',
+            '/api/products/?sort=price&availability=in_stock',
+            '/api/products/?cursor=',
+            '/api/products/?search=cement',
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()['results']), 3)
+                self.assertNoHeavyColumns(queries.captured_queries)
+
+
+class ListingQueryPlanTests(TestCase):
+    """
+    Every listing filter/sort shape is answered from an active-only index
+    (see Product.Meta.indexes): no sorting and no full scan of the product
+    table
+
+    `manage.py check_query_plans` runs the same checks on a full-size
+    catalog.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        catalog = SyntheticCatalog(seed=7)
+        categories = Category.objects.bulk_create(
+            Category(**fields) for fields in catalog.category_fields(8)
+        )
+        Product.objects.bulk_create(
+            Product(**fields) for fields in catalog.product_fields(2000, [c.pk for c in categories])
+        )
+        cls.sample = Product.active.values('category_id', 'availability').first()
+
+    def plans(self):
+        plans = list(listing_plans(self.sample))
+        labels = {plan.label for plan in plans}
+        # At least the category, price-range and cursor shapes were checked
+        for label in ('sort=newest category', 'sort=price price-range', 'sort=newest category cursor'):
+            self.assertIn(label, labels)
+        return plans
+
+    def test_listings_do_not_sort_or_scan(self):
+        for plan in self.plans():
+            with self.subTest(plan.label):
+                self.assertEqual(plan.issues, [], str(plan))
+
+    def test_listings_use_active_indexes(self):
+        for plan in self.plans():
+            with self.subTest(plan.label):
+                self.assertTrue(plan.indexes & ACTIVE_INDEXES, str(plan))
+
+
+class CatalogWriterValidatorTests(TestCase):
+    """Rows without source validators (imports) keep the ones a scrape stored"""
+
+    VALIDATORS = {'source_etag': '"v1"', 'source_last_modified': 'Sun, 18 Oct 2026 10:00:00 GMT',
+                  'content_hash': 'a' * 64}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Steel')
+
+    def row(self, **fields):
+        return {
+            'title': 'TMT Bar 8mm',
+            'category_id': self.category.pk,
+            'url': None,
+            'image_url': None,
+            'price': Decimal('640.00'),
+            'price_display': 'Rs. 640.00',
+            'availability': 'in_stock',
+            'product_id': 'tmt-8',
+            'variant_id': None,
+            'description_text': 'Fe 500D',
+            'images': [],
+            'specifications': {},
+            'is_active': True,
+            **fields,
+        }
+
+    def write(self, fields):
+        writer = CatalogWriter()
+        writer.add(fields)
+        return writer.flush()
+
+    def assertValidators(self, **expected):
+        stored = Product.objects.values(*self.VALIDATORS).get()
+        self.assertEqual(stored, {**self.VALIDATORS, **expected})
+
+    def test_import_keeps_validators(self):
+        for product_id in ('tmt-8', None):
+            with self.subTest(product_id=product_id):
+                Product.objects.all().delete()
+                self.write(self.row(product_id=product_id, **self.VALIDATORS))
+
+                # The same row re-imported without validators is unchanged
+                self.assertEqual(self.write(self.row(product_id=product_id)).unchanged, 1)
+                self.assertValidators()
+
+                # A changed row is updated, validators still untouched
+                self.assertEqual(self.write(self.row(product_id=product_id, price=Decimal('650.00'))).updated, 1)
+                self.assertValidators()
+
+    def test_scrape_can_clear_validators(self):
+        self.write(self.row(**self.VALIDATORS))
+        self.assertEqual(self.write(self.row(**{**self.VALIDATORS, 'source_etag': None})).updated, 1)
+        self.assertValidators(source_etag=None)
+
+    def test_refresh_validators(self):
+        self.write(self.row(**self.VALIDATORS))
+        product = Product.objects.get()
+        writer = CatalogWriter()
+        writer.refresh_validators(product.pk, {'source_etag': '"v2"', 'source_last_modified': None})
+        stats = writer.flush()
+        self.assertEqual((stats.updated, stats.unchanged), (0, 1))
+        self.assertValidators(source_etag='"v2"', source_last_modified=None)
+        # Only the validator columns were written
+        self.assertEqual(Product.objects.get().updated_at, product.updated_at)
+
+
+class ProductCountTests(TestCase):
+    """Stored and cached active-product counts follow every write path without drift"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cement, cls.steel = (Category.objects.create(name=name) for name in ('Cement', 'Steel'))
+
+    def setUp(self):
+        cache.clear()
+
+    def create(self, title, category, **fields):
+        return Product.objects.create(title=title, category=category, price=Decimal('100.00'), **fields)
+
+    def row(self, product_id, category, **fields):
+        return {
+            'title': f'Bulk {product_id}', 'category_id': category.pk, 'url': None, 'image_url': None,
+            'price': Decimal('100.00'), 'price_display': 'Rs. 100.00', 'availability': 'in_stock',
+            'product_id': product_id, 'variant_id': None, 'description_text': '', 'images': [],
+            'specifications': {}, 'is_active': True, **fields,
+        }
+
+    def assertNoDrift(self):
+        for category in (self.cement, self.steel):
+            actual = Product.active.filter(category=category).count()
+            category.refresh_from_db()
+            self.assertEqual(category.active_product_count, actual, category.name)
+            self.assertEqual(ProductCountCache.get_for_category(category.pk), actual, category.name)
+        self.assertEqual(ProductCountCache.get_total(), Product.active.count())
+        self.assertEqual(CategoryProductCounts.recompute(), {})
+        self.assertEqual(ProductCountCache.reconcile(), {})
+
+    def test_write_paths(self):
+        # Prime the cache: deltas only adjust counts that are cached
+        self.assertNoDrift()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bag = self.create('Cement bag', self.cement)
+            rod = self.create('TMT rod', self.steel)
+            self.create('Old stock', self.cement, is_active=False)
+        self.assertNoDrift()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bag.is_active = False
+            bag.save()
+        self.assertNoDrift()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rod.category = self.cement
+            rod.save()
+        self.assertNoDrift()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bag.is_active = True
+            bag.category = self.steel
+            bag.save()
+        self.assertNoDrift()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rod.delete()
+        self.assertNoDrift()
+
+        writer = CatalogWriter()
+        for i in range(4):
+            writer.add(self.row(f'bulk-{i}', self.cement))
+        writer.add(self.row(None, self.steel))
+        with self.captureOnCommitCallbacks(execute=True):
+            writer.flush()
+        self.assertNoDrift()
+
+        # Deactivate, move and re-add rows in one bulk flush, by product_id
+        # and by title for rows without one
+        writer.add(self.row('bulk-0', self.cement, is_active=False))
+        writer.add(self.row('bulk-1', self.steel))
+        writer.add(self.row('bulk-2', self.cement, price=Decimal('90.00')))
+        writer.add(self.row(None, self.steel, is_active=False))
+        writer.add(self.row('bulk-4', self.steel))
+        with self.captureOnCommitCallbacks(execute=True):
+            writer.flush()
+        self.assertNoDrift()
+
+
+class ProductBatchDetailTests(TestCase):
+    """GET /api/products/batch/"""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Tiles')
+        cls.products = [
+            Product.objects.create(title=f'Tile {i}', category=category, price=Decimal('99.00'))
+            for i in range(2)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_repeated_ids_are_answered_once(self):
+        first, second = (product.pk for product in self.products)
+        response = self.client.get(f'/api/products/batch/?ids={second},{second},999999,{first}&ids={second}')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([result['id'] for result in body['results']], [second, 999999, first])
+        self.assertEqual(body['count'], sum(result['found'] for result in body['results']))
+
+
+class CursorPaginationTests(TestCase):
+    """GET /api/products/?cursor= walks (created_at, id) keyset pages"""
+
+    @classmethod
+    def setUpTestData(cls):
+        category = Category.objects.create(name='Pipes')
+        Product.objects.bulk_create(
+            Product(title=f'Pipe {i}', category=category, price=Decimal('120.00')) for i in range(11)
+        )
+        # Most rows share one timestamp, so only the id orders them
+        now = datetime.datetime(2026, 10, 18, 10, 0, tzinfo=datetime.timezone.utc)
+        pks = list(Product.objects.order_by('pk').values_list('pk', flat=True))
+        Product.objects.filter(pk__in=pks[:8]).update(created_at=now)
+        for offset, pk in enumerate(pks[8:], 1):
+            Product.objects.filter(pk=pk).update(created_at=now + datetime.timedelta(seconds=offset))
+        cls.newest_first = list(
+            Product.objects.order_by('-created_at', '-id').values_list('pk', flat=True)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def page(self, cursor, **params):
+        response = self.client.get('/api/products/', {'cursor': cursor, 'page_size': 3, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        return [product['id'] for product in body['results']], body
+
+    def test_forward_and_back(self):
+        pages = []
+        cursor = ''
+        while cursor is not None:
+            ids, body = self.page(cursor)
+            pages.append((ids, body))
+            cursor = body['next_cursor']
+        self.assertEqual([pk for ids, _ in pages for pk in ids], self.newest_first)
+        self.assertEqual([len(ids) for ids, _ in pages], [3, 3, 3, 2])
+        self.assertIsNone(pages[0][1]['prev_cursor'])
+        self.assertFalse(pages[-1][1]['has_next'])
+
+        # prev_cursor leads back through the same pages
+        cursor = pages[-1][1]['prev_cursor']
+        for ids, _ in reversed(pages[:-1]):
+            back, body = self.page(cursor)
+            self.assertEqual(back, ids)
+            cursor = body['prev_cursor']
+        self.assertIsNone(cursor)
+
+    def test_last_page_exactly_full(self):
+        ids, body = self.page(encode_cursor(*Product.objects.values_list('created_at', 'pk').get(
+            pk=self.newest_first[7]
+        )))
+        self.assertEqual(ids, self.newest_first[8:])
+        self.assertIsNone(body['next_cursor'])
+        self.assertFalse(body['has_next'])
+
+    def test_invalid_cursor(self):
+        def token(raw):
+            return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+        cursors = (
+            'not a cursor',
+            'é',
+            token(b'\xff\xfe'),
+            token(b'[1, 2]'),
+            token(b'{"c": "yesterday", "i": 1}'),
+            token(b'{"c": "2026-10-18T10:00:00+00:00", "i": "one"}'),
+            token(b'{"c": 20261018, "i": 1}'),
+            token(b'{"i": 1}'),
+            encode_cursor(datetime.datetime(2026, 10, 18, tzinfo=datetime.timezone.utc), 1)[:-2],
+        )
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get('/api/products/', {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+
+    def test_cursor_needs_newest_sort(self):
+        for sort in ('price', '-price'):
+            with self.subTest(sort=sort):
+                response = self.client.get('/api/products/', {'cursor': '', 'sort': sort})
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.page('', sort='newest')[0], self.newest_first[:3])
+
+
+class SpecIndexTests(TestCase):
+    """Spec filters and facet counts read from the ProductSpec index"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.paint = Category.objects.create(name='Paint')
+        other = Category.objects.create(name='Primer')
+        specs = {
+            'a-white-matt': ({'Brand': 'Asian', 'Colour': 'White', 'Finish': 'Matt'}, True),
+            'a-blue-gloss': ({'Brand': 'Asian', 'Colour': ' Blue', 'Finish': 'Gloss'}, True),
+            'b-white-matt': ({'Brand': 'Berger', 'Colour': 'WHITE', 'Finish': 'Matt'}, True),
+            'b-white': ({'Brand': 'Berger', 'Colour': 'White'}, True),
+            'c-red-inactive': ({'Brand': 'Capco', 'Colour': 'Red'}, False),
+        }
+        cls.products = {
+            title: Product.objects.create(
+                title=title, category=cls.paint, price=Decimal('500.00'),
+                specifications=specifications, is_active=is_active,
+            )
+            for title, (specifications, is_active) in specs.items()
+        }
+        Product.objects.create(
+            title='primer', category=other, price=Decimal('300.00'),
+            specifications={'Brand': 'Asian', 'Colour': 'White'},
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def titles(self, specs):
+        products = SpecIndex.filter_products(Product.active.filter(category=self.paint), specs)
+        return set(products.values_list('title', flat=True))
+
+    def facets(self, specs=None, keys=None):
+        return {
+            facet['key']: {value['value']: value['count'] for value in facet['values']}
+            for facet in SpecIndex.facet_counts(self.paint.pk, specs, keys=keys)
+        }
+
+    def test_filters(self):
+        self.assertEqual(self.titles({'brand': {'asian'}}), {'a-white-matt', 'a-blue-gloss'})
+        # Keys are ANDed, values of one key ORed
+        self.assertEqual(self.titles({'brand': {'asian'}, 'colour': {'white'}}), {'a-white-matt'})
+        self.assertEqual(
+            self.titles({'brand': {'asian', 'berger'}, 'colour': {'white'}, 'finish': {'matt'}}),
+            {'a-white-matt', 'b-white-matt'},
+        )
+        self.assertEqual(self.titles({'brand': {'capco'}}), set())
+        self.assertEqual(self.titles({'brand': {'nerolac'}}), set())
+        self.assertEqual(self.titles({'sheen': {'matt'}}), set())
+
+    def test_list_endpoint_filters(self):
+        response = self.client.get('/api/products/', {
+            'category_id': self.paint.pk, 'spec': ['Brand: asian', 'colour:White'],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([product['title'] for product in response.json()['results']], ['a-white-matt'])
+        self.assertEqual(response.json()['count'], 1)
+
+        response = self.client.get('/api/products/', {'category_id': self.paint.pk, 'spec': 'colour'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_facet_counts(self):
+        self.assertEqual(self.facets(), {
+            'brand': {'asian': 2, 'berger': 2},
+            'colour': {'white': 3, 'blue': 1},
+            'finish': {'matt': 2, 'gloss': 1},
+        })
+        facet = SpecIndex.facet_counts(self.paint.pk, keys=['Colour'])[0]
+        self.assertEqual(facet['products'], 4)
+        self.assertEqual(facet['label'], 'Colour')
+        self.assertEqual([value['label'] for value in facet['values']], ['White', 'Blue'])
+        # Unknown keys are left out
+        self.assertEqual(self.facets(keys=['Finish', 'Sheen']), {'finish': {'matt': 2, 'gloss': 1}})
+
+    def test_facets_keep_their_own_values(self):
+        # Each key is counted under the other keys' filters only
+        self.assertEqual(self.facets({'brand': {'asian'}}), {
+            'brand': {'asian': 2, 'berger': 2},
+            'colour': {'white': 1, 'blue': 1},
+            'finish': {'matt': 1, 'gloss': 1},
+        })
+        self.assertEqual(self.facets({'brand': {'asian'}, 'colour': {'white'}}), {
+            'brand': {'asian': 1, 'berger': 2},
+            'colour': {'white': 1, 'blue': 1},
+            'finish': {'matt': 1},
+        })
+        # A value nothing has still shows the alternatives for its own key
+        self.assertEqual(self.facets({'brand': {'nerolac'}}, keys=['brand', 'colour']), {
+            'brand': {'asian': 2, 'berger': 2},
+        })
+
+    def test_facet_endpoint(self):
+        response = self.client.get(
+            f'/api/categories/{self.paint.pk}/facets/', {'keys': 'brand,finish', 'spec': 'finish:gloss'}
+        )
+        self.assertEqual(response.status_code, 200)
+        results = {
+            facet['key']: {value['value']: value['count'] for value in facet['values']}
+            for facet in response.json()['results']
+        }
+        self.assertEqual(results, {'brand': {'asian': 1}, 'finish': {'matt': 2, 'gloss': 1}})
+
+
+class SearchTests(TestCase):
+    """Search backends: what they match, how they rank, when the in-process index changes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Adhesives')
+        products = (
+            ('Tile adhesive 20kg', 'Polymer modified adhesive for floor and wall tiles'),
+            ('Wall putty 40kg', 'White cement based putty; apply before the tile grout sets'),
+            ('Epoxy grout 1kg', 'Stain resistant grout for tile joints'),
+            ('Cement primer', 'Primer for walls'),
+            ('Grout float', 'Rubber float'),
+        )
+        for title, description in products:
+            Product.objects.create(
+                title=title, description_text=description, category=cls.category, price=Decimal('250.00')
+            )
+        cls.ids = dict(Product.objects.values_list('title', 'id'))
+
+    def setUp(self):
+        product_index.build()
+
+    def search(self, backend, query):
+        return backend.search(query, limit=100).ids
+
+    def test_fulltext_matches_icontains(self):
+        fulltext = FullTextBackend()
+        if not fulltext.is_available():
+            self.skipTest(f'no full-text index on {connection.vendor}')
+        for query in ('tile', 'grout', 'cement', 'putty', 'primer', 'tile grout', 'grout tile', 'nothing'):
+            with self.subTest(query=query):
+                ranked = fulltext.search(query, limit=100)
+                baseline = IContainsBackend().search(query, limit=100)
+                if ' ' in query:
+                    # Every word is required, in any order: a superset of the phrase matches
+                    self.assertLessEqual(set(baseline.ids), set(ranked.ids))
+                else:
+                    # A single whole word matches the same products as the substring scan
+                    self.assertEqual(set(ranked.ids), set(baseline.ids))
+                    self.assertEqual(ranked.total, baseline.total)
+
+    def test_title_matches_rank_first(self):
+        fulltext = FullTextBackend()
+        if not fulltext.is_available():
+            self.skipTest(f'no full-text index on {connection.vendor}')
+        for backend in (fulltext, InvertedIndexBackend()):
+            with self.subTest(backend=backend.name):
+                ranked = self.search(backend, 'grout')
+                self.assertEqual(
+                    set(ranked[:2]), {self.ids['Epoxy grout 1kg'], self.ids['Grout float']}
+                )
+                self.assertEqual(ranked[2], self.ids['Wall putty 40kg'])
+        # The baseline only orders newest first
+        self.assertEqual(
+            self.search(IContainsBackend(), 'grout'),
+            [self.ids['Grout float'], self.ids['Epoxy grout 1kg'], self.ids['Wall putty 40kg']],
+        )
+
+    def test_inverted_index_follows_commits(self):
+        backend = InvertedIndexBackend()
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.captureOnCommitCallbacks(execute=False):
+                product = Product.objects.create(
+                    title='Grout sealer', category=self.category, price=Decimal('400.00')
+                )
+            # Not searchable before the transaction commits
+            self.assertNotIn(product.pk, self.search(backend, 'sealer'))
+        self.assertEqual(self.search(backend, 'sealer'), [product.pk])
+
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                product.title = 'Grout remover'
+                product.save()
+                raise RuntimeError('rolled back')
+        self.assertEqual(self.search(backend, 'remover'), [])
+        self.assertEqual(self.search(backend, 'sealer'), [product.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product.delete()
+        self.assertEqual(self.search(backend, 'sealer'), [])
+
+
+class ResponseCacheTests(TestCase):
+    """Listing responses are cached and ETagged under the catalog version"""
+
+    URL = '/api/products/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Paint')
+        cls.product = Product.objects.create(
+            title='Emulsion 10L', category=cls.category, price=Decimal('2400.00'), product_id='emulsion-10'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url=URL, **headers):
+        return self.client.get(url, headers=headers)
+
+    def titles(self, response):
+        return [product['title'] for product in response.json()['results']]
+
+    def test_hit_skips_the_database(self):
+        miss = self.get()
+        with self.assertNumQueries(0):
+            hit = self.get()
+        self.assertEqual(hit.status_code, 200)
+        self.assertEqual(hit.json(), miss.json())
+        self.assertEqual(hit['ETag'], miss['ETag'])
+
+    def test_if_none_match(self):
+        etag = self.get()['ETag']
+        with self.assertNumQueries(0):
+            response = self.get(If_None_Match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.get(If_None_Match='"stale"').status_code, 200)
+
+    def test_query_string_is_part_of_the_key(self):
+        etags = {
+            self.get(url)['ETag']
+            for url in (self.URL, f'{self.URL}?sort=price', f'{self.URL}?category_id={self.category.pk}')
+        }
+        self.assertEqual(len(etags), 3)
+        # Parameter order does not matter
+        self.assertEqual(
+            self.get(f'{self.URL}?sort=price&page_size=5')['ETag'],
+            self.get(f'{self.URL}?page_size=5&sort=price')['ETag'],
+        )
+
+    def test_writer_flush_invalidates(self):
+        etag = self.get()['ETag']
+        writer = CatalogWriter()
+        writer.add({
+            'title': 'Primer 4L', 'category_id': self.category.pk, 'url': None, 'image_url': None,
+            'price': Decimal('900.00'), 'price_display': 'Rs. 900.00', 'availability': 'in_stock',
+            'product_id': 'primer-4', 'variant_id': None, 'description_text': '', 'images': [],
+            'specifications': {}, 'is_active': True,
+        })
+        with self.captureOnCommitCallbacks(execute=True):
+            writer.flush()
+        response = self.get(If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('Primer 4L', self.titles(response))
+
+    def test_product_save_invalidates(self):
+        etag = self.get()['ETag']
+        self.product.title = 'Emulsion 20L'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.save()
+        response = self.get(If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.titles(response), ['Emulsion 20L'])
+
+    def test_no_bump_before_commit(self):
+        etag = self.get()['ETag']
+        self.product.title = 'Emulsion 20L'
+        with self.captureOnCommitCallbacks(execute=False):
+            self.product.save()
+            self.assertEqual(self.get(If_None_Match=etag).status_code, 304)
+
+
+class FastJSONRendererTests(TestCase):
+    """FastJSONRenderer writes exactly what JSONRenderer writes"""
+
+    def assertSameOutput(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_native_and_encoder_types(self):
+        self.assertSameOutput({
+            'title': 'Cement \u2028 bag \u2029 – ₹',
+            'price': Decimal('330.50'),
+            'created_at': datetime.datetime(2026, 10, 18, 10, 0, tzinfo=datetime.timezone.utc),
+            'in_stock': True,
+            'images': [None, 1, 2.5, -0.0, 123456789012345.6],
+        })
+
+    def test_floats_in_exponent_form(self):
+        for value in (1e16, 1e-7, -2.5e300, 5e-324, 1e22):
+            with self.subTest(value=value):
+                self.assertSameOutput({'specifications': {'Weight': value}, 'results': [[value]]})
+
+    def test_non_finite_floats_are_rejected(self):
+        for value in (float('nan'), float('inf'), float('-inf')):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render({'value': value})
+                with self.assertRaises(ValueError):
+                    FastJSONRenderer().render({'specifications': [value]})
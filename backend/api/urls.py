@@ -1,19 +1,33 @@
 from django.urls import path
 # Import legacy views from legacy_views.py
-from .legacy_views import api_root, health_check
+from .legacy_views import api_root, health_check, cache_stats, metrics
 # Import new class-based views from views package
-from .views import CategoryListView, ProductListView, ProductDetailView
+from .views import (
+    CategoryListView, CategoryFacetView, ProductListView, ProductDetailView, ProductBatchDetailView,
+    ProductExportView,
+    AsyncCategoryListView, AsyncProductListView, AsyncProductDetailView,
+)
 
 app_name = 'api'
 
 urlpatterns = [
     path('', api_root, name='api-root'),
     path('health/', health_check, name='health-check'),
+    path('cache/stats/', cache_stats, name='cache-stats'),
+    path('metrics/', metrics, name='metrics'),
     
     # Category APIs
     path('categories/', CategoryListView.as_view(), name='category-list'),
+    path('categories/<int:category_id>/facets/', CategoryFacetView.as_view(), name='category-facets'),
     
     # Product APIs
     path('products/', ProductListView.as_view(), name='product-list'),
+    path('products/export/', ProductExportView.as_view(), name='product-export'),
+    path('products/batch/', ProductBatchDetailView.as_view(), name='product-batch-detail'),
     path('products/<int:product_id>/', ProductDetailView.as_view(), name='product-detail'),
+
+    # Async versions of the read endpoints (concurrent queries under ASGI)
+    path('async/categories/', AsyncCategoryListView.as_view(), name='async-category-list'),
+    path('async/products/', AsyncProductListView.as_view(), name='async-product-list'),
+    path('async/products/<int:product_id>/', AsyncProductDetailView.as_view(), name='async-product-detail'),
 ]
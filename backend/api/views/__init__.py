@@ -1,9 +1,17 @@
 # Import from views package (new class-based views)
-from .category_views import CategoryListView
-from .product_views import ProductListView, ProductDetailView
+from .category_views import CategoryListView, CategoryFacetView
+from .product_views import ProductListView, ProductDetailView, ProductBatchDetailView
+from .export_views import ProductExportView
+from .async_views import AsyncCategoryListView, AsyncProductListView, AsyncProductDetailView
 
 __all__ = [
     'CategoryListView',
+    'CategoryFacetView',
     'ProductListView',
-    'ProductDetailView'
+    'ProductDetailView',
+    'ProductBatchDetailView',
+    'ProductExportView',
+    'AsyncCategoryListView',
+    'AsyncProductListView',
+    'AsyncProductDetailView'
 ]
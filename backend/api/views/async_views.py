@@ -0,0 +1,171 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from api.filters import ProductListParams
+from api.metrics import serializer_timer
+from api.renderers import FastJSONRenderer
+from api.response_cache import cache_response
+from api.services.category_service import CategoryService
+from api.services.product_service import ProductService
+from api.serializers.compiled import CategoryFastSerializer
+from api.serializers.product_serializer import ProductDetailSerializer
+from .product_views import ProductListView
+
+
+_renderer = FastJSONRenderer()
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(
+        _renderer.render(data), status=status_code, content_type='application/json'
+    )
+
+
+def _call_and_release(function, args):
+    # Worker threads never see request_started/request_finished, so do what
+    # those signals do for request threads: close the thread's connections
+    # once they outlive CONN_MAX_AGE or are left broken by an error
+    close_old_connections()
+    try:
+        return function(*args)
+    finally:
+        close_old_connections()
+
+
+async def run_query(function, *args):
+    """
+    Run a blocking ORM call on a worker thread with its own connection.
+
+    Django 4.2's async ORM methods (aget, acount, ...) all run on the
+    request's single sync thread, so gathering them still executes the
+    queries one after another. Calls made through run_query() on separate
+    threads really overlap; `function` must return evaluated results.
+    """
+    return await sync_to_async(_call_and_release, thread_sensitive=False)(function, args)
+
+
+class AsyncCategoryListView(View):
+    """
+    Async version of CategoryListView
+    GET /api/async/categories/
+    """
+
+    @cache_response
+    async def get(self, request):
+        """Get all active categories"""
+        try:
+            categories = await run_query(lambda: list(
+                CategoryService.get_active_categories_with_product_count().values(
+                    *CategoryFastSerializer.value_fields
+                )
+            ))
+            results = CategoryFastSerializer.serialize(categories)
+
+            return json_response({
+                'success': True,
+                'count': len(results),
+                'results': results
+            })
+
+        except Exception as e:
+            return json_response({
+                'success': False,
+                'error': str(e)
+            }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AsyncProductListView(View):
+    """
+    Async version of ProductListView, with the same parameters and responses
+    GET /api/async/products/?category_id=1&page=1&page_size=20
+
+    The category existence check, the page query and the count query are
+    independent, so they run concurrently instead of one after another.
+    """
+
+    @cache_response
+    async def get(self, request):
+        """Get products list with optional category filter"""
+        try:
+            params = ProductListParams.from_query_params(request.GET)
+
+            if params.search:
+                page_query = run_query(ProductListView.search_page, params)
+            elif params.cursor is not None:
+                page_query = run_query(ProductListView.cursor_page, params)
+            else:
+                page_query = asyncio.gather(
+                    run_query(ProductListView.products_page, params),
+                    run_query(ProductListView.total_count, params),
+                )
+
+            if params.category_id:
+                category, page = await asyncio.gather(
+                    run_query(CategoryService.get_category_by_id, params.category_id),
+                    page_query,
+                )
+                if not category:
+                    return json_response({
+                        'success': False,
+                        'error': 'Category not found'
+                    }, status.HTTP_404_NOT_FOUND)
+            else:
+                page = await page_query
+
+            if params.cursor is not None and not params.search:
+                return json_response(ProductListView.cursor_payload(page, params))
+            products, total_count = page
+            return json_response(ProductListView.page_payload(products, total_count, params))
+
+        except ValueError as e:
+            return json_response({
+                'success': False,
+                'error': f'Invalid parameter: {str(e)}'
+            }, status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return json_response({
+                'success': False,
+                'error': str(e)
+            }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AsyncProductDetailView(View):
+    """
+    Async version of ProductDetailView
+    GET /api/async/products/{product_id}/
+    """
+
+    @cache_response
+    async def get(self, request, product_id):
+        """Get product details by ID"""
+        try:
+            data = await run_query(self.serialized_product, product_id)
+
+            if data is None:
+                return json_response({
+                    'success': False,
+                    'error': 'Product not found'
+                }, status.HTTP_404_NOT_FOUND)
+
+            return json_response({
+                'success': True,
+                'result': data
+            })
+
+        except Exception as e:
+            return json_response({
+                'success': False,
+                'error': str(e)
+            }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    def serialized_product(product_id):
+        product = ProductService.get_product_by_id(product_id)
+        if not product:
+            return None
+        with serializer_timer():
+            return ProductDetailSerializer(product).data
@@ -1,8 +1,10 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from api.response_cache import cache_response
 from api.services.category_service import CategoryService
-from api.serializers.category_serializer import CategorySerializer
+from api.services.spec_index import SpecIndex
+from api.serializers.compiled import CategoryFastSerializer
 
 
 class CategoryListView(APIView):
@@ -11,16 +13,19 @@ class CategoryListView(APIView):
     GET /api/categories/
     """
     
+    @cache_response
     def get(self, request):
         """Get all active categories"""
         try:
-            categories = CategoryService.get_active_categories_with_product_count()
-            serializer = CategorySerializer(categories, many=True)
+            categories = CategoryService.get_active_categories_with_product_count().values(
+                *CategoryFastSerializer.value_fields
+            )
+            results = CategoryFastSerializer.serialize(categories)
             
             return Response({
                 'success': True,
-                'count': len(categories),
-                'results': serializer.data
+                'count': len(results),
+                'results': results
             }, status=status.HTTP_200_OK)
         
         except Exception as e:
@@ -29,3 +34,56 @@ class CategoryListView(APIView):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+
+class CategoryFacetView(APIView):
+    """
+    API endpoint for specification facets of a category
+    GET /api/categories/{category_id}/facets/?limit=10&value_limit=20
+    GET /api/categories/{category_id}/facets/?keys=manufacturer,colour&spec=usage:interior
+    
+    Returns value counts per specification key over the category's active
+    products, narrowed by the same `spec=key:value` filters as the product
+    list (except that a key's own filter does not narrow its counts). Without
+    `keys`, the keys found on the most products are returned.
+    """
+    
+    @cache_response
+    def get(self, request, category_id):
+        """Get specification value counts for a category"""
+        try:
+            limit = min(max(int(request.query_params.get('limit', SpecIndex.DEFAULT_FACET_LIMIT)), 1), 50)
+            value_limit = min(max(int(request.query_params.get('value_limit', SpecIndex.DEFAULT_VALUE_LIMIT)), 1), 100)
+            spec_filters = SpecIndex.parse_filters(request.query_params.getlist('spec'))
+            keys = request.query_params.get('keys')
+            if keys is not None:
+                keys = [key for key in keys.split(',') if key.strip()]
+            
+            category = CategoryService.get_category_by_id(category_id)
+            if not category:
+                return Response({
+                    'success': False,
+                    'error': 'Category not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            facets = SpecIndex.facet_counts(
+                category.id, spec_filters, keys=keys, limit=limit, value_limit=value_limit
+            )
+            
+            return Response({
+                'success': True,
+                'category_id': category.id,
+                'count': len(facets),
+                'results': facets
+            }, status=status.HTTP_200_OK)
+        
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': f'Invalid parameter: {str(e)}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from api.services.export_service import ProductExportService
+
+
+class ProductExportView(APIView):
+    """
+    API endpoint to stream the whole active catalog
+    GET /api/products/export/?output=ndjson
+    GET /api/products/export/?output=csv&updated_since=2025-01-31T00:00:00Z
+
+    The response is streamed in chunks with flat memory use, gzipped when
+    the client sends `Accept-Encoding: gzip`. Rows come oldest-updated
+    first; keep the latest `updated_at` seen and pass it as `updated_since`
+    to fetch only what changed on the next pull.
+    """
+
+    def perform_content_negotiation(self, request, force=False):
+        # The body is NDJSON/CSV whatever Accept says; renderers only format errors
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request):
+        """Stream active products as NDJSON or CSV"""
+        export_format = request.query_params.get('output', 'ndjson')
+        if export_format not in ProductExportService.FORMATS:
+            return Response({
+                'success': False,
+                'error': f"Invalid parameter: output must be one of {', '.join(ProductExportService.FORMATS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        updated_since = None
+        if request.query_params.get('updated_since'):
+            updated_since = self.parse_updated_since(request.query_params['updated_since'])
+            if updated_since is None:
+                return Response({
+                    'success': False,
+                    'error': 'Invalid parameter: updated_since must be an ISO 8601 date or datetime'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+        content_type, extension = ProductExportService.FORMATS[export_format]
+        chunks = ProductExportService.stream(export_format, updated_since)
+
+        use_gzip = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if use_gzip:
+            chunks = ProductExportService.gzip(chunks)
+
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="products-{timezone.now():%Y%m%d}.{extension}"'
+        )
+        response['Vary'] = 'Accept-Encoding'
+        if use_gzip:
+            response['Content-Encoding'] = 'gzip'
+        return response
+
+    @staticmethod
+    def parse_updated_since(value):
+        try:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                date = parse_date(value)
+                if date is None:
+                    return None
+                parsed = datetime(date.year, date.month, date.day)
+        except ValueError:
+            return None
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed, timezone.get_default_timezone())
+        return parsed
@@ -1,62 +1,62 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from api.metrics import serializer_timer
+from api.response_cache import cache_response
 from django.core.paginator import Paginator
 from api.services.product_service import ProductService
 from api.services.category_service import CategoryService
-from api.serializers.product_serializer import ProductListSerializer, ProductDetailSerializer
+from api.services.count_cache import ProductCountCache
+from api.filters import ProductListParams
+from api.serializers.product_serializer import ProductDetailSerializer
+from api.serializers.compiled import ProductListFastSerializer
 
 
 class ProductListView(APIView):
     """
     API endpoint to list products filtered by category
     GET /api/products/?category_id=1&page=1&page_size=20
+    GET /api/products/?category_id=1&cursor=<next_cursor>&page_size=20
+    GET /api/products/?search=cement&page=1&page_size=20
+    GET /api/products/?category_id=1&spec=manufacturer:finolex&spec=colour:black
+    GET /api/products/?category_id=1&min_price=100&max_price=500&availability=in_stock&sort=price
+    
+    Passing `cursor` (empty for the first page) switches to keyset pagination:
+    no COUNT query, and the response carries next_cursor/prev_cursor instead
+    of page numbers. `search` results are ranked by relevance and always use
+    page numbers.
+    
+    Each `spec=key:value` keeps products with that specification (matched
+    case-insensitively); values of the same key are alternatives, different
+    keys must all match. `sort` is newest (default), price or -price; cursors
+    only page newest first. Filters and sort cannot be combined with `search`.
     """
     
+    @cache_response
     def get(self, request):
         """Get products list with optional category filter"""
         try:
-            category_id = request.query_params.get('category_id')
-            page = int(request.query_params.get('page', 1))
-            page_size = int(request.query_params.get('page_size', 20))
-            
-            # Validate page_size (max 100)
-            page_size = min(page_size, 100)
+            params = ProductListParams.from_query_params(request.query_params)
             
-            if category_id:
+            if params.category_id:
                 # Verify category exists
-                category = CategoryService.get_category_by_id(category_id)
+                category = CategoryService.get_category_by_id(params.category_id)
                 if not category:
                     return Response({
                         'success': False,
                         'error': 'Category not found'
                     }, status=status.HTTP_404_NOT_FOUND)
-                
-                # Get products by category
-                products = ProductService.get_products_by_category(
-                    category_id, page, page_size
-                )
-                total_count = ProductService.get_product_count_by_category(category_id)
-            else:
-                # Get all products
-                products = ProductService.get_all_active_products(page, page_size)
-                total_count = ProductService.get_total_product_count()
-            
-            serializer = ProductListSerializer(products, many=True)
             
-            # Calculate pagination info
-            total_pages = (total_count + page_size - 1) // page_size
+            if params.search:
+                # Relevance-ranked search
+                products, total_count = self.search_page(params)
+            elif params.cursor is not None:
+                return Response(self.cursor_payload(self.cursor_page(params), params), status=status.HTTP_200_OK)
+            else:
+                products = self.products_page(params)
+                total_count = self.total_count(params)
             
-            return Response({
-                'success': True,
-                'count': total_count,
-                'page': page,
-                'page_size': page_size,
-                'total_pages': total_pages,
-                'has_next': page < total_pages,
-                'has_previous': page > 1,
-                'results': serializer.data
-            }, status=status.HTTP_200_OK)
+            return Response(self.page_payload(products, total_count, params), status=status.HTTP_200_OK)
         
         except ValueError as e:
             return Response({
@@ -68,6 +68,81 @@ class ProductListView(APIView):
                 'success': False,
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    # The queries below are independent of each other, so the async view
+    # (api.views.async_views) runs them concurrently. Each returns evaluated
+    # rows: list rows are values() dicts for the compiled serializer.
+    
+    @staticmethod
+    def search_page(params):
+        """(products, total match count) of a search page"""
+        return ProductService.search_products(
+            params.search, params.page, params.page_size, params.category_id,
+            fields=ProductListFastSerializer.value_fields
+        )
+    
+    @staticmethod
+    def cursor_page(params):
+        """Keyset-paginated products page"""
+        return ProductService.get_products_page_by_cursor(
+            params.cursor, params.page_size, params.category_id,
+            fields=ProductListFastSerializer.value_fields, filters=params.filters
+        )
+    
+    @staticmethod
+    def products_page(params):
+        """One page-numbered page of products, by category or overall"""
+        fields = ProductListFastSerializer.value_fields
+        if params.category_id:
+            products = ProductService.get_products_by_category(
+                params.category_id, params.page, params.page_size,
+                fields=fields, filters=params.filters, sort=params.sort
+            )
+        else:
+            products = ProductService.get_all_active_products(
+                params.page, params.page_size, fields=fields, filters=params.filters, sort=params.sort
+            )
+        return list(products)
+    
+    @staticmethod
+    def total_count(params):
+        """Products matching a page-numbered listing"""
+        if params.filters:
+            # Cached counts exist only per category, not per filter
+            if params.category_id:
+                return ProductService.get_product_count_by_category(params.category_id, params.filters)
+            return ProductService.get_total_product_count(params.filters)
+        if params.category_id:
+            return ProductCountCache.get_for_category(params.category_id)
+        return ProductCountCache.get_total()
+    
+    @staticmethod
+    def page_payload(products, total_count, params):
+        # Calculate pagination info
+        total_pages = (total_count + params.page_size - 1) // params.page_size
+        
+        return {
+            'success': True,
+            'count': total_count,
+            'page': params.page,
+            'page_size': params.page_size,
+            'total_pages': total_pages,
+            'has_next': params.page < total_pages,
+            'has_previous': params.page > 1,
+            'results': ProductListFastSerializer.serialize(products)
+        }
+    
+    @staticmethod
+    def cursor_payload(products_page, params):
+        return {
+            'success': True,
+            'page_size': params.page_size,
+            'next_cursor': products_page.next_cursor,
+            'prev_cursor': products_page.prev_cursor,
+            'has_next': products_page.next_cursor is not None,
+            'has_previous': products_page.prev_cursor is not None,
+            'results': ProductListFastSerializer.serialize(products_page.items)
+        }
 
 
 class ProductDetailView(APIView):
@@ -76,6 +151,7 @@ class ProductDetailView(APIView):
     GET /api/products/{product_id}/
     """
     
+    @cache_response
     def get(self, request, product_id):
         """Get product details by ID"""
         try:
@@ -87,11 +163,12 @@ class ProductDetailView(APIView):
                     'error': 'Product not found'
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            serializer = ProductDetailSerializer(product)
+            with serializer_timer():
+                data = ProductDetailSerializer(product).data
             
             return Response({
                 'success': True,
-                'result': serializer.data
+                'result': data
             }, status=status.HTTP_200_OK)
         
         except Exception as e:
@@ -100,3 +177,64 @@ class ProductDetailView(APIView):
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+
+class ProductBatchDetailView(APIView):
+    """
+    API endpoint to get the details of several products at once
+    GET /api/products/batch/?ids=12,7,31
+    
+    Results follow the order of `ids`, repeated ids answered once; each one
+    is marked `found` and carries the same `result` as the detail endpoint
+    when the product exists.
+    """
+    max_ids = 200
+    
+    @cache_response
+    def get(self, request):
+        """Get product details for a list of IDs"""
+        try:
+            product_ids = self.parse_ids(request.query_params)
+            products = ProductService.get_products_by_ids(product_ids)
+            
+            with serializer_timer():
+                data = {pk: ProductDetailSerializer(product).data for pk, product in products.items()}
+            
+            results = []
+            for pk in product_ids:
+                if pk in data:
+                    results.append({'id': pk, 'found': True, 'result': data[pk]})
+                else:
+                    results.append({'id': pk, 'found': False, 'error': 'Product not found'})
+            
+            return Response({
+                'success': True,
+                'count': len(data),
+                'results': results
+            }, status=status.HTTP_200_OK)
+        
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': f'Invalid parameter: {str(e)}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    @classmethod
+    def parse_ids(cls, query_params):
+        """Comma-separated and/or repeated `ids`, in request order, each once"""
+        product_ids = list(dict.fromkeys(
+            int(value)
+            for param in query_params.getlist('ids')
+            for value in param.split(',')
+            if value.strip()
+        ))
+        if not product_ids:
+            raise ValueError('ids is required')
+        if len(product_ids) > cls.max_ids:
+            raise ValueError(f'at most {cls.max_ids} ids per request')
+        return product_ids
@@ -0,0 +1,149 @@
+"""
+Benchmark the HTML parser backends on saved home-run.co pages.
+
+Every backend (full and restricted parsing where supported) runs the
+scraper's extractors over each fixture. Its output is compared with what
+today's reference, a full `html.parser` parse, extracts. The script exits
+non-zero if any backend extracts something different, so run it before
+changing HTML_PARSER in product.py.
+
+Fixtures are plain HTML files whose name starts with the page kind:
+`home*.html`, `listing*.html` or `product*.html`. Save a fresh set with
+--save (needs network access):
+
+    python bench_parsers.py --save --limit 20
+    python bench_parsers.py --repeat 20
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+from parsers import (
+    DETAIL, HOME, LISTING, available_parsers, get_parser, listing_page_count,
+    parse_categories, parse_listing_cards, parse_product_details,
+)
+
+BASE_URL = "https://home-run.co"
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+SNAPSHOT_JSON = os.path.join(os.path.dirname(__file__), "home_run_catalog_nested.json")
+
+# Fixture file name prefix -> page kind
+PAGE_KINDS = {"home": HOME, "listing": LISTING, "product": DETAIL}
+
+EXTRACTORS = {
+    HOME: lambda soup: parse_categories(soup, BASE_URL),
+    LISTING: lambda soup: (parse_listing_cards(soup, set(), BASE_URL), listing_page_count(soup)),
+    DETAIL: parse_product_details,
+}
+
+
+def load_fixtures(directory):
+    """[(file name, page kind, html)] for every recognised fixture"""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        name = os.path.basename(path)
+        kind = next((kind for prefix, kind in PAGE_KINDS.items() if name.startswith(prefix)), None)
+        if kind is None:
+            continue
+        with open(path, encoding="utf-8") as f:
+            fixtures.append((name, kind, f.read()))
+    return fixtures
+
+
+def save_fixtures(directory, limit):
+    """Fetch the home page, `limit` listing pages and `limit` product pages"""
+    from fetcher import FetchEngine
+
+    os.makedirs(directory, exist_ok=True)
+    urls = {"home.html": BASE_URL}
+    with open(SNAPSHOT_JSON, encoding="utf-8") as f:
+        categories = json.load(f)
+    for category in categories[:limit]:
+        urls[f"listing-{slug(category['category_url'])}.html"] = f"{category['category_url']}?page=1"
+    products = [product for category in categories for product in category.get("products", [])]
+    step = max(1, len(products) // max(1, limit))
+    for product in products[::step][:limit]:
+        urls[f"product-{slug(product['product_url'])}.html"] = product["product_url"]
+
+    with FetchEngine(headers={"User-Agent": "Mozilla/5.0"}) as engine:
+        futures = {name: engine.submit(engine.fetch, url) for name, url in urls.items()}
+        for name, future in futures.items():
+            with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+                f.write(future.result().text)
+    print(f"Saved {len(urls)} fixtures to {directory}")
+
+
+def slug(url):
+    return re.sub(r"[^a-z0-9]+", "-", url.rstrip("/").rsplit("/", 1)[-1].lower()).strip("-")
+
+
+def backends(names):
+    for name in names:
+        parser = get_parser(name, restrict=False)
+        yield parser
+        if name != "selectolax":
+            yield get_parser(name, restrict=True)
+
+
+def run(parser, fixtures, repeat):
+    """(ms per page by kind, mismatching fixture names, extracted output)"""
+    timings = {}
+    outputs = {}
+    for name, kind, html in fixtures:
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            output = EXTRACTORS[kind](parser.parse(html, kind))
+            samples.append((time.perf_counter() - started) * 1000)
+        timings.setdefault(kind, []).append(statistics.median(samples))
+        outputs[name] = output
+    return {kind: statistics.mean(values) for kind, values in timings.items()}, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Directory of saved pages")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed parses per fixture")
+    parser.add_argument(
+        "--backends", nargs="+", default=available_parsers(), choices=available_parsers()
+    )
+    parser.add_argument("--save", action="store_true", help="Fetch and save fixtures first")
+    parser.add_argument("--limit", type=int, default=10, help="Listing and product pages to --save")
+    args = parser.parse_args()
+
+    if args.save:
+        save_fixtures(args.fixtures, args.limit)
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        sys.exit(f"No fixtures in {args.fixtures}; capture some with --save")
+
+    kinds = [kind for kind in (HOME, LISTING, DETAIL) if any(f[1] == kind for f in fixtures)]
+    size = statistics.mean(len(html) for _, _, html in fixtures) / 1024
+    print(f"{len(fixtures)} fixtures (mean {size:.0f} KiB), median of {args.repeat} runs each\n")
+    print(f"{'backend':<26}" + "".join(f"{kind + ' ms':>13}" for kind in kinds) + f"{'speedup':>10}  output")
+
+    reference_timings, reference = run(get_parser("html.parser", restrict=False), fixtures, args.repeat)
+    reference_total = sum(reference_timings.values())
+    mismatched = False
+    for backend in backends(args.backends):
+        timings, outputs = run(backend, fixtures, args.repeat)
+        differing = [name for name, output in outputs.items() if output != reference[name]]
+        mismatched = mismatched or bool(differing)
+        speedup = reference_total / sum(timings.values())
+        print(
+            f"{backend.name:<26}" + "".join(f"{timings[kind]:>13.2f}" for kind in kinds)
+            + f"{speedup:>9.1f}x  " + (f"DIFFERS: {', '.join(differing)}" if differing else "identical")
+        )
+
+    if mismatched:
+        sys.exit("Some backends extract different output from the reference html.parser parse")
+
+
+if __name__ == "__main__":
+    main()
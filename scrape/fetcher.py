@@ -0,0 +1,128 @@
+"""
+Concurrent fetch engine for the home-run.co scraper.
+
+A thread pool schedules page fetches over one pooled keep-alive
+`requests.Session`. Each host gets a concurrency cap and a token-bucket
+rate limiter, so callers can submit as many URLs as they like without
+hammering the origin.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity` banked"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class FetchEngine:
+    """
+    Thread-pool fetch scheduler with per-host concurrency caps and rate limits.
+
+    `fetch()` is blocking and safe to call from any thread; `submit()` runs any
+    callable (typically one that calls `fetch()`) on the pool and returns a Future.
+    With a `cache` (http_cache.ResponseCache, settable after construction),
+    usable cached responses are returned without a request or a rate-limit
+    token, and successful responses are stored.
+    """
+
+    def __init__(self, headers=None, max_workers=16, per_host=6, rate=5.0, burst=10,
+                 retries=3, timeout=30, verify=False, cache=None):
+        self.cache = cache
+        self.retries = retries
+        self.timeout = timeout
+        self.verify = verify
+        self.per_host = per_host
+        self.rate = rate
+        self.burst = burst
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self._hosts = {}
+        self._hosts_lock = threading.Lock()
+
+    def _host_limits(self, url):
+        """Return (semaphore, token bucket) for the URL's host, creating them on first use"""
+        host = urlsplit(url).netloc
+        with self._hosts_lock:
+            limits = self._hosts.get(host)
+            if limits is None:
+                limits = (threading.BoundedSemaphore(self.per_host), TokenBucket(self.rate, self.burst))
+                self._hosts[host] = limits
+            return limits
+
+    def fetch(self, url, retries=None, headers=None):
+        """
+        GET `url` and return the response, retrying with exponential backoff.
+        Extra `headers` (e.g. conditional-request validators) are sent as given;
+        a 304 Not Modified is returned like any other successful response.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(url)  # raises CacheMiss in replay mode
+            if cached is not None:
+                return cached
+
+        retries = retries or self.retries
+        semaphore, bucket = self._host_limits(url)
+        for attempt in range(retries):
+            try:
+                bucket.acquire()
+                with semaphore:
+                    r = self.session.get(url, headers=headers, timeout=self.timeout, verify=self.verify)
+                r.raise_for_status()
+                if self.cache is not None:
+                    self.cache.put(url, r)
+                return r
+            except requests.exceptions.RequestException as e:
+                if attempt < retries - 1:
+                    time.sleep(2 ** attempt)  # Exponential backoff
+                    continue
+                print(f"    ⚠️  Failed to fetch {url} after {retries} attempts: {str(e)[:50]}")
+                raise
+
+    def submit(self, fn, *args, **kwargs):
+        """Schedule `fn(*args, **kwargs)` on the fetch pool"""
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,235 @@
+"""
+Persisted crawl frontier for the home-run.co scraper.
+
+A SQLite file records, per category, the last listing page whose product
+cards were all queued, and every product URL with its state:
+
+- queued: found on a listing page, not yet persisted
+- done: written to the database (checkpointed after each writer flush)
+- failed: dead-lettered after its fetch retries ran out, with the error
+
+URLs are tracked per category, so a product listed in several categories
+is checkpointed and dead-lettered in each of them. Queued and failed URLs
+keep their listing card and done URLs keep their snapshot record
+(zlib-compressed JSON), so an interrupted run can be resumed exactly: done
+products are replayed into the snapshot, unfinished cards are submitted
+again, and the listing continues after the last checkpointed page. A
+category is only marked done once it has no dead letters left.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+QUEUED = "queued"
+DONE = "done"
+FAILED = "failed"
+
+
+def pack(record):
+    return zlib.compress(json.dumps(record, ensure_ascii=False).encode("utf-8"), 6)
+
+
+def unpack(blob):
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class CrawlFrontier:
+    """SQLite-backed crawl state, safe to share between the producer and writer threads"""
+
+    # Bumped when the tables change; a frontier from an older version is discarded
+    VERSION = 2
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS categories (
+            category_url TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            last_page INTEGER NOT NULL DEFAULT 0,
+            listing_complete INTEGER NOT NULL DEFAULT 0,
+            listing_error TEXT,
+            listing_attempts INTEGER NOT NULL DEFAULT 0,
+            done INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS urls (
+            category_url TEXT NOT NULL,
+            url TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            state TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            record BLOB NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (category_url, url)
+        );
+        CREATE INDEX IF NOT EXISTS urls_category_state ON urls (category_url, state);
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != self.VERSION:
+            self._db.executescript("DROP TABLE IF EXISTS urls; DROP TABLE IF EXISTS categories;")
+            self._db.execute(f"PRAGMA user_version = {self.VERSION}")
+        self._db.executescript(self.SCHEMA)
+
+    def reset(self):
+        """Forget all crawl state (a fresh run)"""
+        with self._lock:
+            self._db.execute("DELETE FROM urls")
+            self._db.execute("DELETE FROM categories")
+
+    def _transaction(self, statements):
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for sql, params in statements:
+                    self._db.execute(sql, params)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    # Categories
+
+    def start_category(self, category):
+        """Register a category dict from scrape_categories() and return its state"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO categories (category_url, name, updated_at) VALUES (?, ?, ?)",
+                (category["category_url"], category["category_name"], time.time()),
+            )
+            row = self._db.execute(
+                "SELECT last_page, listing_complete FROM categories WHERE category_url = ?",
+                (category["category_url"],),
+            ).fetchone()
+        return {"last_page": row[0], "listing_complete": bool(row[1])}
+
+    def queue_page(self, category_url, page, cards):
+        """Checkpoint a listing page: queue its new cards and advance last_page"""
+        now = time.time()
+        statements = [
+            (
+                "INSERT OR IGNORE INTO urls (url, category_url, page, state, record, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (card["product_url"], category_url, page, QUEUED, pack(card), now),
+            )
+            for card in cards
+        ]
+        statements.append((
+            "UPDATE categories SET last_page = ?, listing_error = NULL, updated_at = ? WHERE category_url = ?",
+            (page, now, category_url),
+        ))
+        self._transaction(statements)
+
+    def listing_complete(self, category_url):
+        """The listing ran out of cards: no pages are left to walk"""
+        self._transaction([(
+            "UPDATE categories SET listing_complete = 1, listing_error = NULL, updated_at = ? WHERE category_url = ?",
+            (time.time(), category_url),
+        )])
+
+    def listing_failed(self, category_url, page, error):
+        """Dead-letter a listing page; the walk resumes from it on retry"""
+        self._transaction([(
+            "UPDATE categories SET listing_error = ?, listing_attempts = listing_attempts + 1, updated_at = ? "
+            "WHERE category_url = ?",
+            (f"page {page}: {error}", time.time(), category_url),
+        )])
+
+    def done_categories(self):
+        """Names of the categories finished by earlier runs"""
+        with self._lock:
+            rows = self._db.execute("SELECT name FROM categories WHERE done = 1").fetchall()
+        return {name for name, in rows}
+
+    def category_done(self, category_url):
+        self._transaction([(
+            "UPDATE categories SET done = 1, updated_at = ? WHERE category_url = ?",
+            (time.time(), category_url),
+        )])
+
+    # Product URLs
+
+    def known_urls(self, category_url):
+        """Every product URL already queued, done or failed for a category"""
+        with self._lock:
+            rows = self._db.execute("SELECT url FROM urls WHERE category_url = ?", (category_url,)).fetchall()
+        return {url for url, in rows}
+
+    def unfinished(self, category_url):
+        """Listing cards of queued and dead-lettered URLs, in crawl order"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT record FROM urls WHERE category_url = ? AND state IN (?, ?) ORDER BY page, rowid",
+                (category_url, QUEUED, FAILED),
+            ).fetchall()
+        return [unpack(record) for record, in rows]
+
+    def done_records(self, category_url):
+        """Snapshot records of the URLs already done, in crawl order"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT record FROM urls WHERE category_url = ? AND state = ? ORDER BY page, rowid",
+                (category_url, DONE),
+            ).fetchall()
+        return [unpack(record) for record, in rows]
+
+    def checkpoint(self, category_url, records):
+        """Mark a category's URLs done with their snapshot records, in one transaction"""
+        if not records:
+            return
+        now = time.time()
+        self._transaction([
+            (
+                "UPDATE urls SET state = ?, error = NULL, record = ?, updated_at = ? "
+                "WHERE category_url = ? AND url = ?",
+                (DONE, pack(record), now, category_url, record["product_url"]),
+            )
+            for record in records
+        ])
+
+    def fail(self, category_url, url, error):
+        """Move a category's URL to the dead-letter list"""
+        self._transaction([(
+            "UPDATE urls SET state = ?, attempts = attempts + 1, error = ?, updated_at = ? "
+            "WHERE category_url = ? AND url = ?",
+            (FAILED, str(error), time.time(), category_url, url),
+        )])
+
+    def has_failures(self, category_url):
+        """Whether a category has dead-lettered URLs or an unfinished listing walk"""
+        with self._lock:
+            failed = self._db.execute(
+                "SELECT 1 FROM urls WHERE category_url = ? AND state = ? LIMIT 1", (category_url, FAILED)
+            ).fetchone()
+            listing = self._db.execute(
+                "SELECT listing_error FROM categories WHERE category_url = ?", (category_url,)
+            ).fetchone()
+        return bool(failed or (listing and listing[0]))
+
+    def dead_letters(self):
+        """[(url or category, attempts, error)] still failed, listing pages included"""
+        with self._lock:
+            urls = self._db.execute(
+                "SELECT url, attempts, error FROM urls WHERE state = ? ORDER BY category_url, page", (FAILED,)
+            ).fetchall()
+            listings = self._db.execute(
+                "SELECT category_url, listing_attempts, listing_error FROM categories WHERE listing_error IS NOT NULL"
+            ).fetchall()
+        return listings + urls
+
+    def summary(self):
+        with self._lock:
+            categories = self._db.execute("SELECT COUNT(*), COALESCE(SUM(done), 0) FROM categories").fetchone()
+            states = dict(self._db.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall())
+        urls = ", ".join(f"{states.get(state, 0)} {state}" for state in (DONE, QUEUED, FAILED))
+        return f"{categories[1]} of {categories[0]} categories done, URLs: {urls}"
+
+    def close(self):
+        with self._lock:
+            self._db.close()
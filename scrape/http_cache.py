@@ -0,0 +1,162 @@
+"""
+Persistent HTTP response cache for the home-run.co scraper.
+
+Successful GET responses are stored in a SQLite file keyed by URL, with
+the body zlib-compressed. A fresh entry (younger than the TTL) is served
+without touching the network. Stale entries are refetched but kept until
+then, so a replay run can still use them. When the bodies outgrow the size
+budget, the least recently used entries are evicted.
+
+In replay mode the cache is the only source: every URL is served from it
+whatever its age, and a URL that was never cached raises CacheMiss instead
+of going to the network.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class CacheMiss(requests.exceptions.RequestException):
+    """A URL is not cached and the network may not be used (replay mode)"""
+
+
+class CachedResponse:
+    """The parts of a requests.Response the scraper reads, rebuilt from the cache"""
+
+    from_cache = True
+
+    def __init__(self, url, status_code, headers, text, fetched_at):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.text = text
+        self.fetched_at = fetched_at
+
+    @property
+    def content(self):
+        return self.text.encode("utf-8")
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    def raise_for_status(self):
+        pass
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache, safe to share between fetch threads.
+
+    `ttl` is in seconds (None: entries never go stale). `max_bytes` bounds
+    the total size of the stored (compressed) bodies.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            url TEXT PRIMARY KEY,
+            status INTEGER NOT NULL,
+            headers TEXT NOT NULL,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            fetched_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+    """
+
+    # Response headers worth keeping (validators and content metadata)
+    STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+    def __init__(self, path, ttl=24 * 3600, max_bytes=1024 ** 3, replay=False):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.replay = replay
+        self.stats = {"hits": 0, "stale": 0, "misses": 0, "stored": 0, "evicted": 0}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self.SCHEMA)
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url):
+        """
+        The cached response for `url` if it can be used: fresh, or of any age
+        in replay mode. Returns None when the network should be asked instead;
+        raises CacheMiss for an uncached URL in replay mode.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, body, fetched_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+            elif not self.replay and self.ttl is not None and now - row[3] > self.ttl:
+                self.stats["stale"] += 1
+                row = None
+            else:
+                self.stats["hits"] += 1
+                self._db.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+        if row is None:
+            if self.replay:
+                raise CacheMiss(f"{url} is not in the response cache ({self.path})")
+            return None
+        status, headers, body, fetched_at = row
+        return CachedResponse(url, status, json.loads(headers), zlib.decompress(body).decode("utf-8"), fetched_at)
+
+    def put(self, url, response):
+        """Store a successful response and evict old entries beyond max_bytes"""
+        if response.status_code != 200:
+            return
+        headers = {name: response.headers[name] for name in self.STORED_HEADERS if name in response.headers}
+        body = zlib.compress(response.text.encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            previous = self._db.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (url, status, headers, body, size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, response.status_code, json.dumps(headers), body, len(body), now, now),
+            )
+            self._size += len(body) - (previous[0] if previous else 0)
+            self.stats["stored"] += 1
+            if self.max_bytes and self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until 90% of max_bytes is left"""
+        target = self.max_bytes * 0.9
+        while self._size > target:
+            rows = self._db.execute(
+                "SELECT url, size FROM responses ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                self._size = 0
+                return
+            evicted = []
+            for url, size in rows:
+                evicted.append((url,))
+                self._size -= size
+                if self._size <= target:
+                    break
+            self._db.executemany("DELETE FROM responses WHERE url = ?", evicted)
+            self.stats["evicted"] += len(evicted)
+
+    def summary(self):
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        stats = ", ".join(f"{value} {name}" for name, value in self.stats.items())
+        return f"{count} responses, {self._size / 1024 ** 2:.1f} MiB ({stats})"
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,320 @@
+"""
+HTML parsing for the home-run.co scraper.
+
+Pages are parsed by a pluggable backend: BeautifulSoup over the stdlib
+`html.parser` or over `lxml`, or `selectolax` (lexbor) when it is
+installed. The BeautifulSoup backends can restrict parsing to the regions
+the extractors below actually read, so the rest of a large Shopify page
+(header, menus, scripts, recommendations, footer) never becomes a tree.
+
+The extractors only use the small BeautifulSoup API subset every backend
+provides: `select()`, `select_one()`, `get_text()`, `get()` and `[]`.
+Nothing here imports Django, so `bench_parsers.py` can run it on its own.
+"""
+
+import re
+from collections import namedtuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from bs4.filter import ElementFilter
+except ImportError:  # beautifulsoup4 < 4.13
+    ElementFilter = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+
+# ---------------------------------
+# Page regions
+# ---------------------------------
+# Top-level elements each extractor reads from (matched on tag name, a class
+# and/or an attribute value); a restricted parse keeps only these subtrees.
+# Keep them in step with the selectors in the extractors.
+Region = namedtuple("Region", "tag cls attr", defaults=(None, None, None))
+
+HOME = "home"
+LISTING = "listing"
+DETAIL = "detail"
+
+PAGE_REGIONS = {
+    HOME: (
+        Region("a", "mhp-menu-item"),
+    ),
+    LISTING: (
+        Region("div", "product-card-wrapper"),
+        Region("nav", "pagination"),
+        Region(cls="product-count__text"),
+    ),
+    DETAIL: (
+        Region(cls="product__inventory"),
+        Region("input", "product-variant-id"),
+        Region("input", attr=("name", "product-id")),
+        Region("ul", "product__media-list"),
+        Region("div", "product__description"),
+    ),
+}
+
+
+def region_matcher(regions):
+    """match(tag name, raw attributes) -> whether the tag starts a region"""
+    def match(name, attrs):
+        attrs = attrs or {}
+        classes = attrs.get("class") or ()
+        if isinstance(classes, str):
+            classes = classes.split()
+        for region in regions:
+            if region.tag and region.tag != name:
+                continue
+            if region.cls and region.cls not in classes:
+                continue
+            if region.attr and attrs.get(region.attr[0]) != region.attr[1]:
+                continue
+            return True
+        return False
+    return match
+
+
+if ElementFilter is not None:
+    class RegionFilter(ElementFilter):
+        """Keep only the top-level tags a matcher accepts, with their subtrees"""
+
+        def __init__(self, match):
+            super().__init__()
+            self.match = match
+
+        def allow_tag_creation(self, nsprefix, name, attrs):
+            return self.match(name, attrs)
+
+        def allow_string_creation(self, string):
+            return False
+
+
+def region_strainer(regions):
+    """A parse_only filter for BeautifulSoup keeping just `regions`"""
+    match = region_matcher(regions)
+    if ElementFilter is not None:
+        return RegionFilter(match)
+    # Before 4.13 a callable SoupStrainer is called with (name, attrs) while parsing
+    return SoupStrainer(match)
+
+
+# ---------------------------------
+# Backends
+# ---------------------------------
+class SoupParser:
+    """BeautifulSoup over `features` ('html.parser' or 'lxml')"""
+
+    def __init__(self, features="html.parser", restrict=True):
+        self.features = features
+        self.restrict = restrict
+        self.name = f"{features}{'+restricted' if restrict else ''}"
+        self._strainers = {page: region_strainer(regions) for page, regions in PAGE_REGIONS.items()}
+
+    def parse(self, html, page=None):
+        """Parse `html`; with a known `page` kind and restrict on, only its regions"""
+        parse_only = self._strainers.get(page) if self.restrict else None
+        return BeautifulSoup(html, self.features, parse_only=parse_only)
+
+
+class LexborParser:
+    """selectolax's lexbor parser; it always builds the whole (C) tree"""
+
+    name = "selectolax"
+
+    def parse(self, html, page=None):
+        return LexborNode(LexborHTMLParser(html).root)
+
+
+class LexborNode:
+    """The BeautifulSoup Tag subset the extractors use, over a selectolax node"""
+
+    # Strings BeautifulSoup's get_text() leaves out
+    SKIPPED_TAGS = frozenset(("script", "style", "template", "-comment", "!comment"))
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    def select(self, selector):
+        return [LexborNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector):
+        node = self._node.css_first(selector)
+        return LexborNode(node) if node is not None else None
+
+    def get(self, name, default=None):
+        value = self._node.attributes.get(name, default)
+        return "" if value is None and name in self._node.attributes else value
+
+    def __getitem__(self, name):
+        if name not in self._node.attributes:
+            raise KeyError(name)
+        return self.get(name)
+
+    def get_text(self, separator="", strip=False):
+        strings = self._strings(self._node)
+        if strip:
+            strings = (string.strip() for string in strings)
+            strings = (string for string in strings if string)
+        return separator.join(strings)
+
+    def _strings(self, node):
+        for child in node.iter(include_text=True):
+            if child.tag == "-text":
+                yield child.text(deep=False)
+            elif child.tag not in self.SKIPPED_TAGS:
+                yield from self._strings(child)
+
+
+PARSERS = ("html.parser", "lxml", "selectolax")
+
+
+def get_parser(name="lxml", restrict=True):
+    """A parser backend by name (see PARSERS)"""
+    if name == "selectolax":
+        if LexborHTMLParser is None:
+            raise ImportError("The selectolax backend needs `pip install selectolax`")
+        return LexborParser()
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser {name!r}; expected one of {', '.join(PARSERS)}")
+    return SoupParser(name, restrict=restrict)
+
+
+def available_parsers():
+    """Names of the backends importable here"""
+    return [name for name in PARSERS if name != "selectolax" or LexborHTMLParser is not None]
+
+
+# ---------------------------------
+# Page extractors
+# ---------------------------------
+def parse_categories(soup, base_url):
+    """Category dicts from the home page menu, keyed by URL to drop duplicates"""
+    categories_map = {}
+
+    for item in soup.select("a.mhp-menu-item"):
+        url = urljoin(base_url, item.get("href"))
+        name = item.select_one(".mhp-title div")
+        img = item.select_one("img")
+
+        if url and name:
+            categories_map[url] = {
+                "category_name": name.get_text(strip=True),
+                "category_url": url,
+                "image_url": "https:" + img["src"] if img and img["src"].startswith("//") else img["src"],
+                "products": []
+            }
+
+    return list(categories_map.values())
+
+
+def listing_cards(soup):
+    """The product cards of a listing page"""
+    return soup.select("div.card-wrapper.product-card-wrapper")
+
+
+def parse_listing_cards(soup, seen, base_url):
+    """Extract product cards from a listing page, skipping URLs already seen"""
+    entries = {}
+    for card in listing_cards(soup):
+        title_a = card.select_one(".card__heading a")
+        if not title_a:
+            continue
+
+        product_title = title_a.get_text(strip=True)
+        product_url = urljoin(base_url, title_a["href"])
+
+        if product_url in seen or product_url in entries:
+            continue
+
+        img = card.select_one(".card__media img")
+        img_url = img.get("src") if img else None
+        if img_url and img_url.startswith("//"):
+            img_url = "https:" + img_url
+
+        price_tag = card.select_one(".price-item--regular")
+        price = price_tag.get_text(strip=True) if price_tag else None
+
+        entries[product_url] = {
+            "product_title": product_title,
+            "product_url": product_url,
+            "price": price,
+            "image_url": img_url,
+        }
+    return list(entries.values())
+
+
+PAGE_PARAM_RE = re.compile(r"[?&]page=(\d+)")
+PRODUCT_COUNT_RE = re.compile(r"(\d[\d,]*)\s+products?", re.IGNORECASE)
+
+
+def listing_page_count(soup):
+    """
+    Number of listing pages in a category, read from the first page's
+    pagination links or else its product count (None if it has neither)
+    """
+    pages = []
+    for item in soup.select("nav.pagination .pagination__item"):
+        match = PAGE_PARAM_RE.search(item.get("href") or "")
+        text = item.get_text(strip=True)
+        if match:
+            pages.append(int(match.group(1)))
+        elif text.isdigit():
+            pages.append(int(text))
+    if pages:
+        return max(pages)
+
+    count = soup.select_one(".product-count__text")
+    per_page = len(listing_cards(soup))
+    match = PRODUCT_COUNT_RE.search(count.get_text(" ", strip=True)) if count else None
+    if match and per_page:
+        return -(-int(match.group(1).replace(",", "")) // per_page)
+    return None
+
+
+def parse_product_details(soup):
+    """Extract the detail fields from a parsed product page"""
+    availability = soup.select_one(".product__inventory")
+    availability = availability.get_text(strip=True) if availability else None
+
+    variant_id = soup.select_one("input.product-variant-id")
+    variant_id = variant_id["value"] if variant_id else None
+
+    product_id = soup.select_one("input[name='product-id']")
+    product_id = product_id["value"] if product_id else None
+
+    images = []
+    for img in soup.select("ul.product__media-list img"):
+        src = img.get("src")
+        if src:
+            if src.startswith("//"):
+                src = "https:" + src
+            images.append(src)
+    images = list(dict.fromkeys(images))
+
+    desc_div = soup.select_one("div.product__description")
+    description_text = desc_div.get_text("\n", strip=True) if desc_div else None
+
+    specs = {}
+    if desc_div:
+        for li in desc_div.select("li"):
+            strong = li.select_one("strong")
+            if strong:
+                key = strong.get_text(strip=True).replace(":", "")
+                value = li.get_text(strip=True).replace(strong.get_text(strip=True), "").strip()
+                specs[key] = value
+
+    return {
+        "availability": availability,
+        "product_id": product_id,
+        "variant_id": variant_id,
+        "images": images,
+        "description_text": description_text,
+        "specifications": specs
+    }
@@ -0,0 +1,329 @@
+"""
+Fetch -> parse -> persist pipeline for product detail pages.
+
+Three stages connected by bounded queues:
+
+- fetch: conditional GETs on the FetchEngine's I/O threads
+- parse: HTML parsing, content hashing and field normalization in a
+  process pool, fed by one dispatcher thread per worker process
+- persist: the caller's thread, the only one touching the database and
+  the snapshot
+
+A producer (the listing crawl) submits product cards; at most
+`max_in_flight` pages are fetched or waiting to be parsed at once, so
+memory stays bounded however fast the producer or the network is. Each
+stage records throughput and busy time, and queue depths are sampled for
+the end-of-run report.
+
+The parse stage needs only parsers.py and api.catalog_normalizer, neither
+of which touches Django or the database.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from parsers import DETAIL, get_parser, parse_product_details
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "backend"))
+from api.catalog_normalizer import normalize_product  # noqa: E402
+
+
+# Outcomes of a conditional detail fetch
+FETCHED = "fetched"
+NOT_MODIFIED = "not_modified"  # server answered 304
+UNCHANGED = "unchanged"  # 200, but the parsed payload hashes the same as last run
+FAILED = "failed"  # fetch or parse raised; `error` holds the exception
+
+
+def content_fingerprint(details):
+    """SHA-256 of the parsed detail payload"""
+    payload = json.dumps(details, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def conditional_headers(known):
+    """If-None-Match / If-Modified-Since from a stored row's validators"""
+    headers = {}
+    if known:
+        if known.get("source_etag"):
+            headers["If-None-Match"] = known["source_etag"]
+        if known.get("source_last_modified"):
+            headers["If-Modified-Since"] = known["source_last_modified"]
+    return headers
+
+
+# One parser per pool process, built on first use
+_parsers = {}
+
+
+def parse_detail_page(html, product_data, category_id, known_hash, parser_name, restrict):
+    """
+    Parse stage, run in a pool process: extract the details, hash them and,
+    unless the hash matches `known_hash`, normalize the Product fields.
+    Returns (status, details, content hash, fields or None).
+    """
+    parser = _parsers.get((parser_name, restrict))
+    if parser is None:
+        parser = _parsers[(parser_name, restrict)] = get_parser(parser_name, restrict=restrict)
+
+    details = parse_product_details(parser.parse(html, DETAIL))
+    content_hash = content_fingerprint(details)
+    if known_hash == content_hash:
+        return UNCHANGED, None, content_hash, None
+    fields = normalize_product({**product_data, "product_details": details}, category_id)
+    return FETCHED, details, content_hash, fields
+
+
+class DetailResult:
+    """A product card after the fetch and parse stages"""
+
+    __slots__ = ("product_data", "known", "status", "details", "fields", "validators", "error")
+
+    def __init__(self, product_data, known, status, details=None, fields=None, validators=None, error=None):
+        self.product_data = product_data
+        self.known = known
+        self.status = status
+        self.details = details
+        self.fields = fields
+        self.validators = validators
+        self.error = error
+
+
+class StageStats:
+    """Items, errors and busy seconds of one stage, updated from several threads"""
+
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.errors = 0
+        self.busy = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds, error=False):
+        with self._lock:
+            self.items += 1
+            self.errors += error
+            self.busy += seconds
+
+    def report(self, wall):
+        rate = self.items / wall if wall else 0
+        busy = self.busy / (wall * self.workers) * 100 if wall else 0
+        errors = f", {self.errors} errors" if self.errors else ""
+        return (
+            f"{self.name:<8}{self.items:>7} items {rate:>8.1f}/s  "
+            f"{busy:>5.1f}% busy ({self.workers} workers){errors}"
+        )
+
+
+class QueueDepths:
+    """Periodic samples of a set of queue sizes: mean and max per queue"""
+
+    def __init__(self, sources, interval=0.2):
+        self.sources = sources
+        self.interval = interval
+        self.samples = {name: [] for name in sources}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="queue-depths", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for name, size in self.sources.items():
+                self.samples[name].append(size())
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+    def report(self):
+        lines = []
+        for name, values in self.samples.items():
+            if values:
+                lines.append(f"{name:<14} mean {sum(values) / len(values):>6.1f}  max {max(values):>4}")
+        return lines
+
+
+class DetailPipeline:
+    """
+    Bounded fetch -> parse -> persist pipeline over detail pages.
+
+    `run(produce, persist)` calls `produce(submit)` on a producer thread;
+    it calls `submit(product_data, known, category_id)` per product card.
+    Every submitted card comes back, in completion order, as a DetailResult
+    passed to `persist()` on the calling thread. With `parse_workers` of 0
+    or 1, parsing runs on the dispatcher thread instead of a process pool.
+    """
+
+    def __init__(self, engine, parser_name, restrict=True, parse_workers=None,
+                 queue_size=64, max_in_flight=None):
+        self.engine = engine
+        self.parser_name = parser_name
+        self.restrict = restrict
+        self.parse_workers = (os.cpu_count() or 1) if parse_workers is None else parse_workers
+        self.queue_size = queue_size
+        self.max_in_flight = max_in_flight or queue_size * 2
+
+        self._parse_queue = queue.Queue(maxsize=queue_size)
+        self._persist_queue = queue.Queue(maxsize=queue_size)
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._closed = threading.Event()
+
+        self._pool = None
+        if self.parse_workers > 1:
+            # Spawned rather than forked: the parent runs fetch threads and
+            # holds database connections that children must not inherit.
+            # Each child re-imports the main script once at start-up.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        dispatchers = max(1, self.parse_workers)
+        self._dispatchers = [
+            threading.Thread(target=self._dispatch, name=f"parse-{i}", daemon=True)
+            for i in range(dispatchers)
+        ]
+        for thread in self._dispatchers:
+            thread.start()
+
+        self.stats = {
+            "fetch": StageStats("fetch", getattr(engine._executor, "_max_workers", 1)),
+            "parse": StageStats("parse", dispatchers),
+            "persist": StageStats("persist", 1),
+        }
+        self.wall = 0.0
+        self.depths = QueueDepths({
+            "in flight": lambda: self._in_flight,
+            "parse queue": self._parse_queue.qsize,
+            "persist queue": self._persist_queue.qsize,
+        })
+
+    # Fetch stage (engine threads)
+
+    def _put(self, q, item):
+        """Put with backpressure, giving up once the pipeline is closed"""
+        while not self._closed.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def submit(self, product_data, known, category_id):
+        """Queue a product card; blocks while max_in_flight pages are pending"""
+        while not self._slots.acquire(timeout=0.1):
+            if self._closed.is_set():
+                raise RuntimeError("pipeline is closed")
+        with self._in_flight_lock:
+            self._in_flight += 1
+        self.engine.submit(self._fetch, product_data, known, category_id)
+
+    def _fetch(self, product_data, known, category_id):
+        started = time.perf_counter()
+        try:
+            r = self.engine.fetch(product_data["product_url"], headers=conditional_headers(known))
+        except Exception as e:
+            self.stats["fetch"].record(time.perf_counter() - started, error=True)
+            self._finish(DetailResult(product_data, known, FAILED, error=e))
+            return
+        self.stats["fetch"].record(time.perf_counter() - started)
+
+        if r.status_code == 304:
+            self._finish(DetailResult(product_data, known, NOT_MODIFIED))
+            return
+        validators = {
+            "source_etag": r.headers.get("ETag"),
+            "source_last_modified": r.headers.get("Last-Modified"),
+        }
+        self._put(self._parse_queue, (r.text, product_data, known, category_id, validators))
+
+    # Parse stage (dispatcher threads, each driving one pool process)
+
+    def _dispatch(self):
+        while True:
+            html, product_data, known, category_id, validators = self._parse_queue.get()
+            known_hash = known.get("content_hash") if known else None
+            args = (html, product_data, category_id, known_hash, self.parser_name, self.restrict)
+            started = time.perf_counter()
+            try:
+                if self._pool is not None:
+                    status, details, content_hash, fields = self._pool.submit(parse_detail_page, *args).result()
+                else:
+                    status, details, content_hash, fields = parse_detail_page(*args)
+            except Exception as e:
+                self.stats["parse"].record(time.perf_counter() - started, error=True)
+                self._finish(DetailResult(product_data, known, FAILED, error=e))
+                continue
+            self.stats["parse"].record(time.perf_counter() - started)
+            validators["content_hash"] = content_hash
+            self._finish(DetailResult(product_data, known, status, details, fields, validators))
+
+    def _finish(self, result):
+        # The slot is freed once the page leaves fetch/parse; the persist
+        # queue's own bound holds back the earlier stages if writes lag
+        self._put(self._persist_queue, result)
+        with self._in_flight_lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    # Persist stage (calling thread)
+
+    def run(self, produce, persist):
+        """Run produce(submit) and persist() every result until both are done"""
+        outstanding = [0]
+        outstanding_lock = threading.Lock()
+        failure = []
+
+        def submit(product_data, known, category_id):
+            with outstanding_lock:
+                outstanding[0] += 1
+            self.submit(product_data, known, category_id)
+
+        def producer():
+            try:
+                produce(submit)
+            except BaseException as e:
+                failure.append(e)
+
+        started = time.perf_counter()
+        thread = threading.Thread(target=producer, name="producer", daemon=True)
+        thread.start()
+        while True:
+            try:
+                result = self._persist_queue.get(timeout=0.1)
+            except queue.Empty:
+                with outstanding_lock:
+                    if not thread.is_alive() and outstanding[0] == 0:
+                        break
+                continue
+            persist_started = time.perf_counter()
+            try:
+                persist(result)
+            finally:
+                self.stats["persist"].record(time.perf_counter() - persist_started)
+                with outstanding_lock:
+                    outstanding[0] -= 1
+        thread.join()
+        self.wall += time.perf_counter() - started
+        if failure:
+            raise failure[0]
+
+    def report(self):
+        """Per-stage throughput and busy time, then queue depths, as lines"""
+        lines = [stats.report(self.wall) for stats in self.stats.values()]
+        return lines + self.depths.report()
+
+    def close(self):
+        """Stop the stages; pages still in flight (after a failed run) are dropped"""
+        self._closed.set()
+        self.depths.close()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
@@ -1,18 +1,24 @@
 # Install deps
 # !pip install -q requests beautifulsoup4
 
+import argparse
 import os
 import sys
-import django
-import requests
-import json
 import time
-import re
-from decimal import Decimal
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from collections import deque
+import django
 import urllib3
 
+from fetcher import FetchEngine
+from frontier import CrawlFrontier
+from http_cache import ResponseCache
+from parsers import (
+    HOME, LISTING, available_parsers, get_parser, listing_cards, listing_page_count,
+    parse_categories, parse_listing_cards,
+)
+from pipeline import FAILED, FETCHED, NOT_MODIFIED, UNCHANGED, DetailPipeline
+from snapshot import SnapshotWriter
+
 # Disable SSL warnings for development
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -23,53 +29,71 @@ django.setup()
 
 # Import Django models
 from api.models import Category, Product
+from api.services.catalog_writer import CatalogWriter
 
 BASE_URL = "https://home-run.co"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 
-# Helper functions for database operations
-def parse_price(price_str):
-    """Convert price string like 'Rs. 330.00' to Decimal"""
-    if not price_str:
-        return None
-    
-    # Remove common currency symbols and text
-    price_str = str(price_str).strip()
-    
-    # Remove currency symbols (Rs., ₹, $, etc.)
-    price_str = re.sub(r'[Rr][Ss]\.?\s*', '', price_str)
-    price_str = re.sub(r'₹\s*', '', price_str)
-    price_str = re.sub(r'\$\s*', '', price_str)
-    price_str = re.sub(r'[A-Za-z:]+', '', price_str)  # Remove any remaining text
-    
-    # Remove commas and whitespace
-    price_str = price_str.replace(',', '').strip()
-    
-    # Extract numeric value (including decimal)
-    # Match: digits, optional decimal point, optional more digits
-    match = re.search(r'(\d+\.?\d*)', price_str)
-    if match:
-        try:
-            return Decimal(match.group(1))
-        except (ValueError, TypeError):
-            return None
-    
-    return None
-
-def map_availability(availability_str):
-    """Map availability string to model choices"""
-    if not availability_str:
-        return 'in_stock'
-    availability_lower = availability_str.lower()
-    if 'out of stock' in availability_lower or 'unavailable' in availability_lower:
-        return 'out_of_stock'
-    elif 'limited' in availability_lower:
-        return 'limited'
-    else:
-        return 'in_stock'
+# Fetch engine tuning: total worker threads, concurrent connections per host,
+# and the per-host token-bucket rate (requests/second, with a small burst)
+MAX_WORKERS = 16
+PER_HOST_CONCURRENCY = 6
+REQUESTS_PER_SECOND = 5.0
+REQUEST_BURST = 10
+
+# Products are buffered and bulk-upserted once per listing page, or sooner
+# when this many rows are pending
+WRITE_BATCH_SIZE = 200
+
+# Streaming snapshot of every scraped product (NDJSON, gzip per category),
+# flushed to disk every SNAPSHOT_FLUSH_EVERY products
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), "home_run_catalog.ndjson.gz")
+SNAPSHOT_FLUSH_EVERY = 50
+
+# On-disk HTTP response cache: fresh entries are served without a request,
+# and --replay runs the whole scrape from it with no network at all
+HTTP_CACHE_PATH = os.path.join(os.path.dirname(__file__), "http_cache.sqlite3")
+HTTP_CACHE_TTL_HOURS = 24
+HTTP_CACHE_MAX_MB = 1024
+
+# HTML parser backend ("html.parser", "lxml" or "selectolax", the fastest,
+# when installed); restricted parsing builds only the page regions the
+# extractors read. Check a change with bench_parsers.py, which fails if the
+# extracted output differs from a full html.parser parse.
+HTML_PARSER = "selectolax" if "selectolax" in available_parsers() else "lxml"
+RESTRICT_PARSING = True
+PARSER = get_parser(HTML_PARSER, restrict=RESTRICT_PARSING)
+
+# Detail pages run through a fetch -> parse -> persist pipeline: parsing and
+# normalization in PARSE_WORKERS processes (0 or 1: in-process), at most
+# PIPELINE_QUEUE_SIZE pages waiting between stages
+PARSE_WORKERS = os.cpu_count() or 1
+PIPELINE_QUEUE_SIZE = 64
+
+# Crawl frontier (listing-page and product-URL checkpoints) for --resume.
+# Pages that still fail after the fetch retries are dead-lettered and
+# retried after the rest of their category, up to DEAD_LETTER_RETRIES
+# more times, DEAD_LETTER_DELAY seconds apart
+FRONTIER_PATH = os.path.join(os.path.dirname(__file__), "crawl_frontier.sqlite3")
+DEAD_LETTER_RETRIES = 2
+DEAD_LETTER_DELAY = 10
+
+# Listing discovery: all of a category's listing pages are fetched at once
+# when the first page's pagination (or product count) gives the page count;
+# otherwise pages are probed LISTING_PROBE_WINDOW at a time until one is empty
+LISTING_PROBE_WINDOW = 4
+
+ENGINE = FetchEngine(
+    headers=HEADERS,
+    max_workers=MAX_WORKERS,
+    per_host=PER_HOST_CONCURRENCY,
+    rate=REQUESTS_PER_SECOND,
+    burst=REQUEST_BURST,
+)
 
+# Helper functions for database operations
 def get_or_create_category(category_data):
-    """Get or create category in database"""
+    """Get or create category in database, writing only when something changed"""
     category, created = Category.objects.get_or_create(
         name=category_data['category_name'],
         defaults={
@@ -80,163 +104,26 @@ def get_or_create_category(category_data):
     )
     # Update if exists
     if not created:
-        category.url = category_data.get('category_url', category.url)
-        category.image_url = category_data.get('image_url', category.image_url)
-        category.save()
+        changed = []
+        for field, key in (('url', 'category_url'), ('image_url', 'image_url')):
+            value = category_data.get(key, getattr(category, field))
+            if getattr(category, field) != value:
+                setattr(category, field, value)
+                changed.append(field)
+        if changed:
+            category.save(update_fields=changed + ['updated_at'])
     return category
 
-def create_or_update_product(category, product_data):
-    """Create or update product in database"""
-    product_details = product_data.get('product_details', {})
-    product_id = product_details.get('product_id')
-    price = parse_price(product_data.get('price'))
-    
-    if not price:
-        print(f"⚠️  Skipping {product_data.get('product_title')} - No valid price")
-        return None
-    
-    # Clean description text to handle emoji encoding issues
-    description_text = product_details.get('description_text', '')
-    if description_text:
-        try:
-            # Remove emojis and other problematic unicode characters
-            import re
-            # Remove emoji ranges
-            emoji_pattern = re.compile("["
-                u"\U0001F600-\U0001F64F"  # emoticons
-                u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-                u"\U0001F680-\U0001F6FF"  # transport & map symbols
-                u"\U0001F1E0-\U0001F1FF"  # flags
-                u"\U00002702-\U000027B0"
-                u"\U000024C2-\U0001F251"
-                u"\U0001F900-\U0001F9FF"  # supplemental symbols
-                "]+", flags=re.UNICODE)
-            description_text = emoji_pattern.sub(r'', description_text)
-            # Clean up any remaining problematic characters
-            description_text = description_text.encode('utf-8', errors='ignore').decode('utf-8')
-            # Remove extra whitespace
-            description_text = ' '.join(description_text.split())
-        except Exception as e:
-            print(f"    ⚠️  Description cleaning failed: {str(e)[:50]}")
-            description_text = ''
-    
-    defaults = {
-        'title': product_data.get('product_title'),
-        'category': category,
-        'url': product_data.get('product_url'),
-        'image_url': product_data.get('image_url'),
-        'price': price,
-        'price_display': product_data.get('price'),
-        'availability': map_availability(product_details.get('availability')),
-        'variant_id': product_details.get('variant_id'),
-        'description_text': description_text,
-        'images': product_details.get('images', []),
-        'specifications': product_details.get('specifications', {}),
-        'is_active': True
-    }
-    
-    if product_id:
-        product, created = Product.objects.update_or_create(
-            product_id=product_id,
-            defaults=defaults
-        )
-    else:
-        # If no product_id, try to match by title and category
-        product, created = Product.objects.get_or_create(
-            title=product_data.get('product_title'),
-            category=category,
-            defaults=defaults
-        )
-        if not created:
-            # Update existing product
-            for key, value in defaults.items():
-                setattr(product, key, value)
-            product.save()
-    
-    return product
-
-def get_soup(url, retries=3):
-    """Get BeautifulSoup object from URL with retry logic"""
-    for attempt in range(retries):
-        try:
-            r = requests.get(url, headers=HEADERS, timeout=30, verify=False)
-            r.raise_for_status()
-            return BeautifulSoup(r.text, "html.parser")
-        except (requests.exceptions.SSLError, requests.exceptions.RequestException) as e:
-            if attempt < retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
-                continue
-            else:
-                print(f"    ⚠️  Failed to fetch {url} after {retries} attempts: {str(e)[:50]}")
-                raise
-
-# ---------------------------------
-# Product detail scraper
-# ---------------------------------
-def scrape_product_details(product_url):
-    soup = get_soup(product_url)
-
-    availability = soup.select_one(".product__inventory")
-    availability = availability.get_text(strip=True) if availability else None
-
-    variant_id = soup.select_one("input.product-variant-id")
-    variant_id = variant_id["value"] if variant_id else None
-
-    product_id = soup.select_one("input[name='product-id']")
-    product_id = product_id["value"] if product_id else None
-
-    images = []
-    for img in soup.select("ul.product__media-list img"):
-        src = img.get("src")
-        if src:
-            if src.startswith("//"):
-                src = "https:" + src
-            images.append(src)
-    images = list(dict.fromkeys(images))
-
-    desc_div = soup.select_one("div.product__description")
-    description_html = str(desc_div) if desc_div else None
-    description_text = desc_div.get_text("\n", strip=True) if desc_div else None
-
-    specs = {}
-    if desc_div:
-        for li in desc_div.select("li"):
-            strong = li.select_one("strong")
-            if strong:
-                key = strong.get_text(strip=True).replace(":", "")
-                value = li.get_text(strip=True).replace(strong.get_text(strip=True), "").strip()
-                specs[key] = value
-
-    return {
-        "availability": availability,
-        "product_id": product_id,
-        "variant_id": variant_id,
-        "images": images,
-        "description_text": description_text,
-        "specifications": specs
-    }
+def get_soup(url, page=None, retries=3):
+    """Fetch a URL with retry logic and parse it (only the `page` kind's regions)"""
+    r = ENGINE.fetch(url, retries=retries)
+    return PARSER.parse(r.text, page)
 
 # ---------------------------------
 # Step 1: Categories
 # ---------------------------------
-home = get_soup(BASE_URL)
-categories_map = {}
-
-for item in home.select("a.mhp-menu-item"):
-    url = urljoin(BASE_URL, item.get("href"))
-    name = item.select_one(".mhp-title div")
-    img = item.select_one("img")
-
-    if url and name:
-        categories_map[url] = {
-            "category_name": name.get_text(strip=True),
-            "category_url": url,
-            "image_url": "https:" + img["src"] if img and img["src"].startswith("//") else img["src"],
-            "products": []
-        }
-
-categories = list(categories_map.values())
-print("Categories:", len(categories))
+def scrape_categories():
+    return parse_categories(get_soup(BASE_URL, HOME), BASE_URL)
 
 # ---------------------------------
 # Step 2: Products + nested details + Database Save
@@ -244,92 +131,352 @@ print("Categories:", len(categories))
 # Option: Skip categories that already have products (set to True to skip)
 SKIP_CATEGORIES_WITH_PRODUCTS = False
 
-for cat in categories:
-    print(f"🔍 {cat['category_name']}")
-    
-    # Save category to database
-    category_obj = get_or_create_category(cat)
-    
-    # Skip if category already has products and SKIP_CATEGORIES_WITH_PRODUCTS is True
-    if SKIP_CATEGORIES_WITH_PRODUCTS and category_obj.products.exists():
-        print(f"  ⏭️  Skipping {category_obj.name} (already has {category_obj.products.count()} products)")
-        continue
-    
-    print(f"  ✅ Category saved: {category_obj.name}")
-    
-    page = 1
-    seen = {}
-    products_saved = 0
-
-    while True:
-        soup = get_soup(f"{cat['category_url']}?page={page}")
-        cards = soup.select("div.card-wrapper.product-card-wrapper")
-        if not cards:
-            break
+# Pages skipped by conditional requests / content hashes, reported at the end
+DETAIL_STATS = {FETCHED: 0, NOT_MODIFIED: 0, UNCHANGED: 0, FAILED: 0}
 
-        for card in cards:
-            title_a = card.select_one(".card__heading a")
-            if not title_a:
-                continue
+def load_known_products(category_obj):
+    """Stored validators and details of a category's products, keyed by product URL"""
+    return {
+        row["url"]: row
+        for row in Product.objects.filter(category=category_obj).exclude(url=None).values(
+            "id", "url", "title", "price_display", "image_url", "is_active",
+            "source_etag", "source_last_modified", "content_hash",
+            "product_id", "variant_id", "availability", "images",
+            "description_text", "specifications",
+        )
+    }
 
-            product_title = title_a.get_text(strip=True)
-            product_url = urljoin(BASE_URL, title_a["href"])
+def listing_unchanged(known, product_data):
+    """Whether the listing-card fields still match the stored row"""
+    return (
+        known["is_active"]
+        and known["title"] == product_data["product_title"]
+        and known["price_display"] == product_data["price"]
+        and known["image_url"] == product_data["image_url"]
+    )
 
-            if product_url in seen:
-                continue
+def rotated_validators(known, validators):
+    """The ETag / Last-Modified of an unchanged page when they differ from the stored row"""
+    if validators is None:
+        return None
+    rotated = {name: validators[name] for name in ("source_etag", "source_last_modified")}
+    if all(known[name] == value for name, value in rotated.items()):
+        return None
+    return rotated
+
+def stored_details(known):
+    """Rebuild a product_details dict from the stored row for skipped pages"""
+    return {
+        "availability": dict(Product.AVAILABILITY_CHOICES).get(known["availability"]),
+        "product_id": known["product_id"],
+        "variant_id": known["variant_id"],
+        "images": known["images"],
+        "description_text": known["description_text"],
+        "specifications": known["specifications"],
+    }
 
-            img = card.select_one(".card__media img")
-            img_url = img.get("src") if img else None
-            if img_url and img_url.startswith("//"):
-                img_url = "https:" + img_url
-
-            price_tag = card.select_one(".price-item--regular")
-            price = price_tag.get_text(strip=True) if price_tag else None
-
-            # 🔥 Fetch product detail page
-            product_details = scrape_product_details(product_url)
-
-            product_data = {
-                "product_title": product_title,
-                "product_url": product_url,
-                "price": price,
-                "image_url": img_url,
-                "product_details": product_details
-            }
-            
-            seen[product_url] = product_data
-            
-            # Save product to database
+def report_flush(stats):
+    if stats.inserted or stats.updated or stats.unchanged:
+        print(f"    💾 Flushed: {stats}")
+
+def listing_pages(category_url, start=1):
+    """
+    Yield (page, soup) for a category's listing pages from `start` on, in
+    page order, until the first page without cards. The pages are fetched
+    in parallel: every page the first page's pagination announces at once,
+    then (or without pagination) speculative windows of probes. A page
+    that fails is yielded as (page, exception) and ends the walk.
+    """
+    def fetch(page):
+        return ENGINE.submit(get_soup, f"{category_url}?page={page}", LISTING)
+
+    ahead = deque()
+    try:
+        first = fetch(1)
+        try:
+            soup = first.result()
+        except Exception as e:
+            yield 1, e
+            return
+        total = listing_page_count(soup)
+        if total:
+            print(f"  📑 {total} listing pages")
+        if start == 1:
+            if not listing_cards(soup):
+                return
+            yield 1, soup
+        # Past the announced pages only the next one is probed, in case
+        # the pagination undercounts; with no pagination, a whole window
+        window = 1 if total else LISTING_PROBE_WINDOW
+        last_known = total or 0
+        next_page = max(start, 2)
+        while True:
+            while next_page <= last_known or len(ahead) < window:
+                ahead.append((next_page, fetch(next_page)))
+                next_page += 1
+            page, future = ahead.popleft()
             try:
-                product_obj = create_or_update_product(category_obj, product_data)
-                if product_obj:
-                    products_saved += 1
-                    print(f"    ✓ {product_title[:50]}...")
+                soup = future.result()
             except Exception as e:
-                print(f"    ✗ Error saving {product_title[:50]}: {str(e)}")
+                yield page, e
+                return
+            if not listing_cards(soup):
+                return
+            yield page, soup
+    finally:
+        # Probes past the last page are not needed
+        for _, future in ahead:
+            future.cancel()
+
+def crawl_category(cat, category_obj, writer, snapshot, pipeline, frontier):
+    """
+    Crawl every listing page of a category through the detail pipeline.
+    Listing pages are discovered and fetched in parallel on a producer
+    thread while the cards already found are fetched, parsed in the
+    process pool and persisted here, in completion order. Submitting
+    blocks while the pipeline is full, so the crawl never runs far ahead.
+
+    The walk starts from the frontier: products already done are replayed
+    into the snapshot, unfinished cards are submitted first, and listing
+    pages continue after the last checkpointed one. Failed pages are
+    dead-lettered and retried once the rest of the category is done.
+    """
+    category_url = cat["category_url"]
+    state = frontier.start_category(cat)
+    known_products = load_known_products(category_obj)
+    saved = [0]
+    checkpoint = []
+
+    for record in frontier.done_records(category_url):
+        snapshot.write_product(record)
+    if state["last_page"]:
+        print(f"  ↩️  Resuming after listing page {state['last_page']}")
+
+    def produce(submit):
+        def submit_card(product_data):
+            known = known_products.get(product_data["product_url"])
+            if known and not listing_unchanged(known, product_data):
+                known = None
+            submit(product_data, known, category_obj.id)
+
+        seen = frontier.known_urls(category_url)
+        for product_data in frontier.unfinished(category_url):
+            submit_card(product_data)
+
+        state = frontier.start_category(cat)
+        if state["listing_complete"]:
+            return
+        for page, soup in listing_pages(category_url, state["last_page"] + 1):
+            if isinstance(soup, Exception):
+                print(f"    ✗ Listing page {page} dead-lettered ({soup!r:.60})")
+                frontier.listing_failed(category_url, page, soup)
+                return
+
+            # 🔥 Detail pages are fetched conditionally when the listing card
+            # still matches what was stored last run
+            entries = parse_listing_cards(soup, seen, BASE_URL)
+            frontier.queue_page(category_url, page, entries)
+            for product_data in entries:
+                seen.add(product_data["product_url"])
+                submit_card(product_data)
+        frontier.listing_complete(category_url)
+
+    def commit_checkpoint(error=None):
+        # Products are done once their batch is in the database; a failed
+        # batch is dead-lettered and retried with the other failures
+        if error is None:
+            frontier.checkpoint(category_url, checkpoint)
+        else:
+            for product_data in checkpoint:
+                frontier.fail(category_url, product_data["product_url"], error)
+        checkpoint.clear()
+
+    def persist(result):
+        DETAIL_STATS[result.status] += 1
+        product_data = result.product_data
+        product_title = product_data["product_title"]
+
+        if result.status == FAILED:
+            print(f"    ✗ {product_title[:50]}... dead-lettered ({result.error!r:.60})")
+            frontier.fail(category_url, product_data["product_url"], result.error)
+            return
+        if result.status != FETCHED:
+            # Unchanged since last run: skip parsing and the content write,
+            # but keep validators the server rotated for the next run
+            product_data["product_details"] = stored_details(result.known)
+            snapshot.write_product(product_data)
+            checkpoint.append(product_data)
+            print(f"    ⏭️  {product_title[:50]}... ({result.status.replace('_', ' ')})")
+            validators = rotated_validators(result.known, result.validators)
+            if validators:
+                write(writer.refresh_validators, result.known["id"], validators)
+            return
+        product_data["product_details"] = result.details
+        snapshot.write_product(product_data)
+        checkpoint.append(product_data)
+
+        # Buffer product for the next bulk write
+        if result.fields is None:
+            print(f"⚠️  Skipping {product_title} - No valid price")
+            return
+        saved[0] += 1
+        print(f"    ✓ {product_title[:50]}...")
+        write(writer.add, {**result.fields, **result.validators})
+
+    def write(buffer, *args):
+        try:
+            stats = buffer(*args)
+            if stats:
+                report_flush(stats)
+                commit_checkpoint()
+        except Exception as e:
+            print(f"    ✗ Error saving batch: {str(e)}")
+            commit_checkpoint(e)
 
-            time.sleep(0.3)
+    def flush():
+        try:
+            report_flush(writer.flush())
+            commit_checkpoint()
+        except Exception as e:
+            print(f"    ✗ Error saving batch: {str(e)}")
+            commit_checkpoint(e)
 
-        page += 1
+    pipeline.run(produce, persist)
+    flush()
+    for attempt in range(DEAD_LETTER_RETRIES):
+        if not frontier.has_failures(category_url):
+            break
+        print(f"  🔁 Retrying dead letters in {DEAD_LETTER_DELAY}s ({attempt + 1}/{DEAD_LETTER_RETRIES})")
+        time.sleep(DEAD_LETTER_DELAY)
+        pipeline.run(produce, persist)
+        flush()
+
+    print(f"  📊 Saved {saved[0]} products for {cat['category_name']}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape home-run.co into the catalog database")
+    parser.add_argument("--cache", default=HTTP_CACHE_PATH, help="HTTP response cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Always fetch from the network")
+    parser.add_argument(
+        "--cache-ttl", type=float, default=HTTP_CACHE_TTL_HOURS,
+        help="Hours a cached response is served before it is fetched again"
+    )
+    parser.add_argument(
+        "--cache-max-mb", type=float, default=HTTP_CACHE_MAX_MB,
+        help="Size budget of the cache; least recently used responses are evicted beyond it"
+    )
+    parser.add_argument(
+        "--replay", action="store_true",
+        help="Serve every page from the cache whatever its age and never use the network"
+    )
+    parser.add_argument("--frontier", default=FRONTIER_PATH, help="Crawl frontier file")
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Continue the previous run from its frontier instead of starting over"
+    )
+    parser.add_argument(
+        "--parse-workers", type=int, default=PARSE_WORKERS,
+        help="Processes parsing detail pages (0 or 1: parse in this process)"
+    )
+    parser.add_argument(
+        "--queue-size", type=int, default=PIPELINE_QUEUE_SIZE,
+        help="Pages that may wait between pipeline stages"
+    )
+    args = parser.parse_args()
+    if args.replay and args.no_cache:
+        parser.error("--replay needs the cache")
+    return args
+
+def main(parse_workers=PARSE_WORKERS, queue_size=PIPELINE_QUEUE_SIZE,
+         frontier_path=FRONTIER_PATH, resume=False):
+    categories = scrape_categories()
+    print("Categories:", len(categories))
+    frontier = CrawlFrontier(frontier_path)
+    if not resume:
+        frontier.reset()
+    done = frontier.done_categories()
+    writer = CatalogWriter(batch_size=WRITE_BATCH_SIZE)
+    snapshot = SnapshotWriter(
+        SNAPSHOT_PATH, flush_every=SNAPSHOT_FLUSH_EVERY, keep=done if resume else None
+    )
+    pipeline = DetailPipeline(
+        ENGINE, HTML_PARSER, restrict=RESTRICT_PARSING,
+        parse_workers=parse_workers, queue_size=queue_size,
+    )
 
-    cat["products"] = list(seen.values())
-    print(f"  📊 Saved {products_saved} products for {cat['category_name']}")
+    try:
+        for cat in categories:
+            print(f"🔍 {cat['category_name']}")
+            if cat["category_name"] in done:
+                print("  ⏭️  Done in the previous run")
+                continue
 
-# ---------------------------------
-# Save JSON (optional - for backup/reference)
-# ---------------------------------
-json_output_path = os.path.join(os.path.dirname(__file__), "home_run_catalog_nested.json")
-with open(json_output_path, "w", encoding="utf-8") as f:
-    json.dump(categories, f, indent=2, ensure_ascii=False)
+            # Save category to database
+            category_obj = get_or_create_category(cat)
 
-print(f"✅ JSON saved → {json_output_path}")
+            # Skip if category already has products and SKIP_CATEGORIES_WITH_PRODUCTS is True
+            if SKIP_CATEGORIES_WITH_PRODUCTS and category_obj.products.exists():
+                print(f"  ⏭️  Skipping {category_obj.name} (already has {category_obj.products.count()} products)")
+                continue
 
-# ---------------------------------
-# Database Summary
-# ---------------------------------
-total_categories = Category.objects.filter(is_active=True).count()
-total_products = Product.objects.filter(is_active=True).count()
-print(f"\n📊 Database Summary:")
-print(f"   Categories: {total_categories}")
-print(f"   Products: {total_products}")
-print("✅ DONE - All data saved to database!")
+            print(f"  ✅ Category saved: {category_obj.name}")
+            snapshot.start_category(cat)
+            try:
+                crawl_category(cat, category_obj, writer, snapshot, pipeline, frontier)
+            finally:
+                snapshot.end_category()
+            # A category with dead letters left is crawled again on --resume
+            if not frontier.has_failures(cat["category_url"]):
+                frontier.category_done(cat["category_url"])
+    finally:
+        pipeline.close()
+        snapshot.close()
+    print(f"✅ Snapshot saved → {SNAPSHOT_PATH} (index: {SNAPSHOT_PATH}.index.json)")
+
+    # ---------------------------------
+    # Database Summary
+    # ---------------------------------
+    total_categories = Category.objects.filter(is_active=True).count()
+    total_products = Product.objects.filter(is_active=True).count()
+    print(f"\n📊 Database Summary:")
+    print(f"   Categories: {total_categories}")
+    print(f"   Products: {total_products}")
+    print(f"   Writes this run: {writer.totals}")
+    skipped = DETAIL_STATS[NOT_MODIFIED] + DETAIL_STATS[UNCHANGED]
+    print(
+        f"   Detail pages skipped: {skipped} of {skipped + DETAIL_STATS[FETCHED]} "
+        f"({DETAIL_STATS[NOT_MODIFIED]} not modified, {DETAIL_STATS[UNCHANGED]} unchanged content)"
+    )
+    if DETAIL_STATS[FAILED]:
+        print(f"   Failed detail fetches (retries included): {DETAIL_STATS[FAILED]}")
+    print(f"\n⏱️  Pipeline ({pipeline.wall:.1f}s):")
+    for line in pipeline.report():
+        print(f"   {line}")
+    if ENGINE.cache is not None:
+        print(f"   HTTP cache: {ENGINE.cache.summary()}")
+    print(f"   Frontier: {frontier.summary()}")
+    dead_letters = frontier.dead_letters()
+    frontier.close()
+    if dead_letters:
+        print(f"\n💀 Dead letters ({len(dead_letters)}):")
+        for url, attempts, error in dead_letters:
+            print(f"   {url} ({attempts} attempts): {error[:80]}")
+    print("✅ DONE - All data saved to database!")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if not args.no_cache:
+        ENGINE.cache = ResponseCache(
+            args.cache,
+            ttl=args.cache_ttl * 3600,
+            max_bytes=int(args.cache_max_mb * 1024 ** 2),
+            replay=args.replay,
+        )
+    try:
+        main(
+            parse_workers=args.parse_workers, queue_size=args.queue_size,
+            frontier_path=args.frontier, resume=args.resume,
+        )
+    finally:
+        ENGINE.close()
@@ -0,0 +1,174 @@
+"""
+Streaming catalog snapshot for the home-run.co scraper.
+
+Products are appended one JSON object per line as they are scraped, so
+memory stays flat and a crash keeps everything written so far. Each
+category is a contiguous block of lines (one gzip member per category
+when compressed), and a small JSON index next to the snapshot maps every
+category to its byte range, so a consumer can read one category without
+touching the rest of the file.
+"""
+
+import gzip
+import json
+import os
+import time
+import zlib
+
+
+def index_path(path):
+    return f"{path}.index.json"
+
+
+class SnapshotWriter:
+    """
+    Append-only NDJSON snapshot writer, optionally gzip-compressed.
+
+    Call `start_category()`, then `write_product()` for each of its
+    products, then `end_category()`; categories must not interleave.
+    Buffered output is flushed to disk every `flush_every` products or
+    `flush_interval` seconds, and the index is rewritten atomically after
+    every category. Not thread-safe: write from one thread.
+
+    To resume an interrupted run, pass `keep`, the names of the categories
+    that were completed: their blocks are moved to the front of the
+    existing snapshot, every other block (a category that was only partly
+    written or still has dead letters) is dropped, and new categories are
+    appended after them.
+    """
+
+    def __init__(self, path, compress=None, flush_every=50, flush_interval=5.0, keep=None):
+        self.path = path
+        self.compress = path.endswith(".gz") if compress is None else compress
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        if keep is not None and os.path.exists(path) and os.path.exists(index_path(path)):
+            self.index = read_index(path)
+            self.compress = self.index["compressed"]
+            categories = self.index["categories"]
+            self.index["categories"] = {name: categories[name] for name in categories if name in keep}
+            self._raw = open(path, "r+b")
+            end = self._compact(self.index["categories"].values())
+            self._raw.truncate(end)
+            self._raw.seek(end)
+        else:
+            self.index = {"format": "ndjson", "compressed": self.compress, "categories": {}}
+            self._raw = open(path, "wb")
+        self._out = None
+        self._category = None
+        self._category_name = None
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def _compact(self, entries, chunk_size=1 << 20):
+        """Move the kept blocks down over the dropped ones; returns the new end"""
+        end = 0
+        for entry in sorted(entries, key=lambda entry: entry["offset"]):
+            if entry["offset"] != end:
+                for start in range(0, entry["length"], chunk_size):
+                    self._raw.seek(entry["offset"] + start)
+                    data = self._raw.read(min(chunk_size, entry["length"] - start))
+                    self._raw.seek(end + start)
+                    self._raw.write(data)
+                entry["offset"] = end
+            end += entry["length"]
+        return end
+
+    def start_category(self, category):
+        """Begin the block of lines for a category dict from scrape_categories()"""
+        if self._category is not None:
+            self.end_category()
+        name = category["category_name"]
+        self._category = {
+            "category_url": category.get("category_url"),
+            "image_url": category.get("image_url"),
+            "offset": self._raw.tell(),
+            "length": 0,
+            "products": 0,
+        }
+        self.index["categories"][name] = self._category
+        self._category_name = name
+        if self.compress:
+            # A fresh member per category, so its byte range decompresses on its own
+            self._out = gzip.GzipFile(fileobj=self._raw, mode="wb", mtime=0)
+        else:
+            self._out = self._raw
+
+    def write_product(self, product):
+        """Append one product dict as a line, tagged with its category name"""
+        record = {"category_name": self._category_name, **product}
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self._out.write(line.encode("utf-8"))
+        self._category["products"] += 1
+        self._pending += 1
+        if (
+            self._pending >= self.flush_every
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Push buffered lines to disk (a sync flush inside a gzip member)"""
+        if self._out is not None and self._out is not self._raw:
+            self._out.flush()
+        self._raw.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def end_category(self):
+        """Close the current category's block and record its byte range in the index"""
+        if self._category is None:
+            return
+        if self._out is not self._raw:
+            self._out.close()  # writes the member trailer; the file stays open
+        self._out = None
+        self.flush()
+        self._category["length"] = self._raw.tell() - self._category["offset"]
+        self._category = None
+        self._write_index()
+
+    def close(self):
+        self.end_category()
+        self._raw.close()
+        self._write_index()
+
+    def _write_index(self):
+        target = index_path(self.path)
+        with open(target + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2, ensure_ascii=False)
+        os.replace(target + ".tmp", target)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_index(path):
+    with open(index_path(path), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_category(path, category_name):
+    """Yield the product dicts of one category, reading only its byte range"""
+    index = read_index(path)
+    entry = index["categories"][category_name]
+    with open(path, "rb") as f:
+        f.seek(entry["offset"])
+        block = f.read(entry["length"])
+    if index["compressed"]:
+        block = zlib.decompress(block, zlib.MAX_WBITS | 16)
+    for line in block.splitlines():
+        yield json.loads(line)
+
+
+def iter_snapshot(path):
+    """Yield every product dict in the snapshot, streaming the whole file"""
+    with open(path, "rb") as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+    opener = gzip.open if compressed else open
+    with opener(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
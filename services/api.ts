@@ -51,6 +51,17 @@ export interface ApiProduct {
   updated_at?: string;
 }
 
+// One entry of a batch detail response, in the order the ids were requested
+export interface ApiProductBatchItem {
+  id: number;
+  found: boolean;
+  result?: ApiProduct;
+  error?: string;
+}
+
+// Most ids the batch detail endpoint accepts per request
+const PRODUCT_BATCH_SIZE = 200;
+
 export interface ApiResponse<T> {
   success: boolean;
   count?: number;
@@ -62,6 +73,8 @@ export interface ApiResponse<T> {
   total_pages?: number;
   has_next?: boolean;
   has_previous?: boolean;
+  next_cursor?: string | null;
+  prev_cursor?: string | null;
 }
 
 // API Service Class
@@ -118,9 +131,61 @@ class ApiService {
     return this.request<ApiProduct>(`/products/?${params.toString()}`);
   }
 
+  // Keyset pagination: pass the previous response's next_cursor/prev_cursor,
+  // or an empty string for the first page
+  async getProductsByCursor(categoryId?: number, cursor: string = '', pageSize: number = 20): Promise<ApiResponse<ApiProduct>> {
+    const params = new URLSearchParams();
+    if (categoryId) {
+      params.append('category_id', categoryId.toString());
+    }
+    params.append('cursor', cursor);
+    params.append('page_size', pageSize.toString());
+
+    return this.request<ApiProduct>(`/products/?${params.toString()}`);
+  }
+
+  // Relevance-ranked product search
+  async searchProducts(query: string, categoryId?: number, page: number = 1, pageSize: number = 20): Promise<ApiResponse<ApiProduct>> {
+    const params = new URLSearchParams();
+    params.append('search', query);
+    if (categoryId) {
+      params.append('category_id', categoryId.toString());
+    }
+    params.append('page', page.toString());
+    params.append('page_size', pageSize.toString());
+
+    return this.request<ApiProduct>(`/products/?${params.toString()}`);
+  }
+
   async getProductDetail(productId: number): Promise<ApiResponse<ApiProduct>> {
     return this.request<ApiProduct>(`/products/${productId}/`);
   }
+
+  // Details of many products (e.g. a cart or comparison view) in one request
+  // per PRODUCT_BATCH_SIZE ids instead of one per product
+  async getProductsBatch(productIds: number[]): Promise<ApiResponse<ApiProductBatchItem>> {
+    if (productIds.length === 0) {
+      return { success: true, count: 0, results: [] };
+    }
+
+    const chunks: number[][] = [];
+    for (let start = 0; start < productIds.length; start += PRODUCT_BATCH_SIZE) {
+      chunks.push(productIds.slice(start, start + PRODUCT_BATCH_SIZE));
+    }
+    const responses = await Promise.all(
+      chunks.map((ids) => this.request<ApiProductBatchItem>(`/products/batch/?ids=${ids.join(',')}`))
+    );
+
+    const failed = responses.find((response) => !response.success);
+    if (failed) {
+      return failed;
+    }
+    return {
+      success: true,
+      count: responses.reduce((total, response) => total + (response.count ?? 0), 0),
+      results: responses.flatMap((response) => response.results ?? []),
+    };
+  }
 }
 
 export const apiService = new ApiService();